@@ -45,6 +45,4 @@ for i in range(len(colors)):
             tft.raw_bitmap(rain, x * size, y * size, color)
 tft.cs.on()
 print(ticks_ms()-start, 'ms')
-#s3m8  big 637 ms
-#pico  big 1,501 ms
-#esp32 big 1,086
\ No newline at end of file
+# Speed of boards and displays: ili9xxx_benchmark.py
\ No newline at end of file
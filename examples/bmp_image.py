@@ -40,6 +40,4 @@ if file_exists(filename):
 
     print(ticks_ms()-start, 'ms')
 
-#s3m8  big 452 ms
-#esp32 big 536
-#pico  big 302
\ No newline at end of file
+# Speed of boards and displays: ili9xxx_benchmark.py
\ No newline at end of file
@@ -0,0 +1,38 @@
+from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+from ili9xxx_console import CONSOLE
+import resources.LibreBodoni24 as bigFont
+import os
+
+# Set pins here or choose one of the sets
+# tft = ILI9XXX_8B_DIRECT( data_pins [D0,D1,...D7], cs, dc, wr, rd, rst )
+
+controller = ILI9XXX_8B_DIRECT.read_controller_name()
+if controller == 'ESP32':
+    tft = ILI9XXX_8B_DIRECT( [12, 13, 26, 25, 17, 16, 27, 14], 32, 15,  4,  2, 33 )
+elif controller == 'RP2':
+    tft = ILI9XXX_8B_DIRECT( [8, 9, 2, 3, 4, 5, 6, 7], 29, 28, 27, 26, 24 )
+elif controller == 'ESP32-S3':
+    tft = ILI9XXX_8B_DIRECT( [9, 8, 18, 17, 15, 16, 3, 14],  6,  7,  1,  2, 5 )
+else:
+    print("Unknown controller!")
+
+COLOR_BLACK    = tft.rgb( 0, 0, 0 )
+COLOR_BLUE     = tft.rgb( 0, 0, 255 )
+COLOR_WHITE    = tft.rgb( 255, 255, 255 )
+COLOR_PHOSPHOR = tft.rgb( 0x39, 0xFF, 0x14 )
+
+tft.set_rotation(0) # Hardware scroll moves rows of the panel
+tft.set_font(bigFont)
+
+# Fixed title above the console
+tft.fill_rect( 0, 0, tft.width, 30, COLOR_BLUE )
+tft.draw_text( 'Log', 4, 2, COLOR_WHITE )
+
+console = CONSOLE( tft, bigFont, COLOR_PHOSPHOR, COLOR_BLACK, top = 30 )
+
+for i in range(100):
+    console.write( 'Line ' + str(i) + '\n' ) # Only the new line is drawn
+
+# REPL and print() output go to the display too
+os.dupterm( console )
+print( 'Hello from REPL' )
@@ -46,6 +46,4 @@ for y in range(SCREEN_HEIGHT // 8):
 
 print(ticks_ms()-start, 'ms')
 
-#s3m8  big 110 ms
-#pico  big 221
-#esp32 big 156
\ No newline at end of file
+# Speed of boards and displays: ili9xxx_benchmark.py
\ No newline at end of file
@@ -42,6 +42,4 @@ if file_exists(filename):
     tft.draw_raw_image(filename, 0, 0, isize[0], isize[1])
 
     print(ticks_ms()-start, 'ms')
-#s3m8  big 305 ms
-#esp32 big 374
-#pico  big 187
\ No newline at end of file
+# Speed of boards and displays: ili9xxx_benchmark.py
\ No newline at end of file
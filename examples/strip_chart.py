@@ -0,0 +1,33 @@
+from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+from ili9xxx_chart import STRIP_CHART
+from time import ticks_ms, ticks_diff
+import math
+
+# Set pins here or choose one of the sets
+# tft = ILI9XXX_8B_DIRECT( data_pins [D0,D1,...D7], cs, dc, wr, rd, rst )
+
+controller = ILI9XXX_8B_DIRECT.read_controller_name()
+if controller == 'ESP32':
+    tft = ILI9XXX_8B_DIRECT( [12, 13, 26, 25, 17, 16, 27, 14], 32, 15,  4,  2, 33 )
+elif controller == 'RP2':
+    tft = ILI9XXX_8B_DIRECT( [8, 9, 2, 3, 4, 5, 6, 7], 29, 28, 27, 26, 24 )
+elif controller == 'ESP32-S3':
+    tft = ILI9XXX_8B_DIRECT( [9, 8, 18, 17, 15, 16, 3, 14],  6,  7,  1,  2, 5 )
+else:
+    print("Unknown controller!")
+
+tft.set_rotation(1) # Chart scrolls horizontally in landscape only
+
+# Fixed axis band on the left
+tft.fill_rect( 0, 0, 30, tft.height, tft.rgb(0, 0, 128) )
+
+chart = STRIP_CHART( tft, [(255, 255, 0), (0, 255, 255)], -100, 100,
+                     grid = (60, 60, 60), grid_step = 40, left = 30 )
+
+SAMPLES = 1000
+start = ticks_ms()
+for i in range(SAMPLES):
+    # Samples of ADC: chart.add( (adc1.read(), adc2.read()) )
+    chart.add( (int(90 * math.sin(i / 20)), i % 100 - 50) )
+
+print( SAMPLES * 1000 // ticks_diff(ticks_ms(), start), 'samples per second' )
@@ -45,6 +45,4 @@ sunt in culpa qui officia deserunt mollit anim id est laborum."
 tft.draw_text(text, 4, 4, COLOR_YELLOW)
 
 print(ticks_ms()-start, 'ms')
-#s3m8  big 74 ms
-#pico  big 221
-#esp32 big 178
\ No newline at end of file
+# Speed of boards and displays: ili9xxx_benchmark.py
\ No newline at end of file
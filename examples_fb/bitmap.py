@@ -45,8 +45,6 @@ for i in range(len(colors)):
             tft.draw_bitmap(rain, x * size, y * size, colors[i])
 
     tft.show()
-print(ticks_ms()-start, 'ms') # 88
+print(ticks_ms()-start, 'ms')
 
-#s3m8 big 577 ms
-#s3m8 sma 290
-#pico sma 689
\ No newline at end of file
+# Speed of boards and displays: ili9xxx_benchmark.py
\ No newline at end of file
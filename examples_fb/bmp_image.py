@@ -38,8 +38,6 @@ if file_exists(filename):
 
     tft.draw_bmp(filename, 0, 0)
     tft.show()
-    print(ticks_ms()-start, 'ms') # 742
+    print(ticks_ms()-start, 'ms')
 
-#s3m8 big 748 ms
-#s3m8 sma 321
-#pico sma 436
\ No newline at end of file
+# Speed of boards and displays: ili9xxx_benchmark.py
\ No newline at end of file
@@ -0,0 +1,45 @@
+from ili9xxx_8b_fb import ILI9XXX_8B_FB, PIO_BUS
+from ili9xxx_bus import GPIO_BUS
+from time import ticks_us, ticks_diff
+# Speed of show() with every bus backend available on the board, MB/s
+# PIO_BUS (Raspberry Pi Pico) needs contiguous data pins, example: [2, 3, 4, 5, 6, 7, 8, 9]
+
+controller = ILI9XXX_8B_FB.read_controller_name()
+if controller == 'ESP32':
+    tft = ILI9XXX_8B_FB( [12, 13, 26, 25, 17, 16, 27, 14], 32, 15,  4,  2, 33, bus = GPIO_BUS )
+elif controller == 'RP2':
+    tft = ILI9XXX_8B_FB( [8, 9, 2, 3, 4, 5, 6, 7], 29, 28, 27, 26, 24, bus = GPIO_BUS )
+elif controller == 'ESP32-S3':
+    tft = ILI9XXX_8B_FB( [9, 8, 18, 17, 15, 16, 3, 14],  6,  7,  1,  2, 5, bus = GPIO_BUS )
+else:
+    print("Unknown controller!")
+
+print( tft.controller_name, "display:", hex(tft.display_model),  tft.width, "x", tft.height )
+
+FRAMES = 10
+frame_size = tft.width * tft.height * 2
+
+backends = [GPIO_BUS]
+if PIO_BUS is not None:
+    if PIO_BUS.available(tft):
+        backends.append(PIO_BUS)
+    else:
+        print("PIO_BUS: not available (data pins are not contiguous or no rp2.DMA)")
+
+tft.fill( tft.rgb(0, 0, 255) )
+
+for backend in backends:
+    tft.bus.deinit()
+    tft.bus = backend(tft)
+
+    cpu_time = 0
+    start = ticks_us()
+    for i in range(FRAMES):
+        frame_start = ticks_us()
+        tft.show(full = True)
+        cpu_time += ticks_diff(ticks_us(), frame_start) # show() returned, CPU is free
+        tft.wait()
+    total_time = ticks_diff(ticks_us(), start)
+
+    print( backend.NAME, ":", FRAMES * frame_size / total_time, "MB/s,",
+           total_time // FRAMES // 1000, "ms per frame, CPU busy", cpu_time * 100 // total_time, "%" )
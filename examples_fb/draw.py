@@ -48,6 +48,4 @@ tft.show()
 
 print(ticks_ms()-start, 'ms') 
 
-#s3m8 big 69 ms
-#s3m8 sma 36
-#pico sma 74
\ No newline at end of file
+# Speed of boards and displays: ili9xxx_benchmark.py
\ No newline at end of file
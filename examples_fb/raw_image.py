@@ -44,6 +44,4 @@ if file_exists(filename):
     tft.show()
     print(ticks_ms()-start, 'ms')
 
-#s3m8 big 315 ms
-#s3m8 sma 215
-#pico sma 95
\ No newline at end of file
+# Speed of boards and displays: ili9xxx_benchmark.py
\ No newline at end of file
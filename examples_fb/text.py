@@ -45,6 +45,4 @@ tft.draw_text(text, 0, 0, COLOR_YELLOW)
 tft.show() # 48
 print(ticks_ms()-start, 'ms')
 
-#s3m8 big 99 ms
-#s3m8 sma 50
-#pico sma 147
\ No newline at end of file
+# Speed of boards and displays: ili9xxx_benchmark.py
\ No newline at end of file
@@ -1,669 +1,1459 @@
-"""
-ILI9XXX_8B display-shield v 0.3.6
-
-Displays: ILI9341, ILI9486, ILI9488
-Connection: 8-bit Data Bus
-Colors: 16-bit, 18-bit, 24-bit
-Controllers: Esp32, Esp32-S3, Raspberry Pi Pico
-
-Project path: https://github.com/r2d2-arduino/micropython_ili9488_9486_9341_shields
-MIT License
-
-Author: Arthur Derkach
-"""
-from machine import Pin
-from time import sleep_ms
-
-
-class ILI9XXX_8B():
-    
-    def __init__( self, data_pins, cs_pin, dc_pin, wr_pin, rd_pin, rst_pin,
-                  width = 0, height = 0, bpp = 16, display_model = 0 ):
-        """ Constructor
-        Args
-        data_pins (list): List of data bus pin numbers (D0, D1, ..., D7), example: [12, 13, 26, 25, 17, 16, 27, 14]
-        cs_pin  (int): CS pin number (Chip Select)
-        dc_pin  (int): DC pin number (command/parameter mode)
-        wr_pin  (int): WR pin number (Write data signal)
-        rd_pin  (int): RD pin number (Read data signal)
-        rst_pin (int): RST pin number (Reset)
-        width   (int): Screen width in pixels (less)
-        height  (int): Screen height in pixels
-        bpp     (int): Bits per Pixel: 16, 18 or 24
-        controller (string): Controller name: ESP32, ESP32-S3, ESP32-C3, RP2
-        display_model (hex): One of 0x9341, 0x9386 (default), 0x9388 
-        """
-
-        self.data_pins = data_pins
-        self.cs_pin = cs_pin
-        self.dc_pin = dc_pin
-        self.wr_pin = wr_pin
-        self.rst_pin = rst_pin
-        self.rd_pin = rd_pin
-        
-        self.db0 = Pin(data_pins[0], Pin.OUT, value = 0)
-        self.db1 = Pin(data_pins[1], Pin.OUT, value = 0)
-        self.db2 = Pin(data_pins[2], Pin.OUT, value = 0)
-        self.db3 = Pin(data_pins[3], Pin.OUT, value = 0)
-        self.db4 = Pin(data_pins[4], Pin.OUT, value = 0)
-        self.db5 = Pin(data_pins[5], Pin.OUT, value = 0)
-        self.db6 = Pin(data_pins[6], Pin.OUT, value = 0)
-        self.db7 = Pin(data_pins[7], Pin.OUT, value = 0)
-        self.db_pins = [self.db0, self.db1, self.db2, self.db3, self.db4, self.db5, self.db6, self.db7]
-               
-        self.cs = Pin(cs_pin, Pin.OUT, value = 1)
-        self.dc = Pin(dc_pin, Pin.OUT, value = 1)
-        self.wr = Pin(wr_pin, Pin.OUT, value = 0)
-        self.rst= Pin(rst_pin,Pin.OUT, value = 1)
-        self.rd = Pin(rd_pin, Pin.OUT, value = 1)
-            
-        self.reset()
-        
-        self.rotation = 0
-        
-        self.display_model = display_model
-        
-        if display_model == 0:
-            self.display_model = self.read_display_model()
-            #print( 'Display model:', hex(self.display_model) )
-        
-        if bpp == 24:
-            self.pixel_format = 0x77
-        elif bpp == 18:
-            self.pixel_format = 0x66
-        else: # bpp == 16:
-            self.pixel_format = 0x55
-        
-        
-        self.width = 240 # default width
-        self.height = 320 # default height
-        
-        if width > 0:
-            self.width = width
-        else:            
-            if self.display_model in (0x9486, 0x9488): 
-                self.width = 320                
-                
-        if height > 0:
-            self.height = height
-        else:       
-            if self.display_model in (0x9486, 0x9488): 
-                self.height = 480
-
-        if self.display_model == 0x9341:
-            self.init_display_9341()
-        elif self.display_model == 0x9486:
-            self.init_display_9486()
-        elif self.display_model == 0x9488:
-            self.init_display_9488()
-        else:
-            print('Unknown Display Model!', hex(self.display_model))
-            self.init_display_9486()
-
-        self.wr_bit = 1 << wr_pin
-        self.dc_bit = 1 << dc_pin
-
-        self.controller_name = self.read_controller_name()
-
-        if self.controller_name == 'ESP32-D1R32': # fix for ESP32-D1R32
-            self.cs_bit = 1 << (cs_pin - 32)
-        else:
-            self.cs_bit = 1 << cs_pin
-
-        if self.controller_name in ('ESP32-S3', 'ESP32-C3'):
-            self.GPIO_OUT_REG  = 0x60004004 # 00-31 pin-output registers
-            self.GPIO_OUT_SET  = 0x60004008 # + bit
-        elif self.controller_name == 'RP2': #Raspberry Pi Pico
-            self.GPIO_OUT_REG = 0xD0000010
-            self.GPIO_OUT_SET = 0xD0000014
-        else: # ESP32
-            self.GPIO_OUT_REG = 0x3FF44004
-            self.GPIO_OUT_SET = 0x3FF44008
-
-        self.BYTE2GPIO = bytearray(1024)
-        self.gpio_state = 0
-        self.update_byte2gpio()
-
-
-    def reset(self):
-        """ Resets display settings to default. """
-        self.rst.value(0)
-        sleep_ms(10)
-        self.rst.value(1)
-        sleep_ms(120)
-        self.write_command(0x01)  # Software Reset
-        sleep_ms(120)
-
-    def init_display_9341(self):
-
-        self.write_command(0x28)  # Display OFF
-
-        # Power Control A
-        self.write_command(0xCB)
-        self.write_multy_data([0x39, 0x2C, 0x00, 0x34, 0x02])
-
-        # Power Control B
-        self.write_command(0xCF)
-        self.write_multy_data([0x00, 0xC1, 0x30])
-
-        # Driver timing control A
-        self.write_command(0xE8)
-        self.write_multy_data([0x85, 0x00, 0x78])
-
-        # Driver timing control B
-        self.write_command(0xEA)
-        self.write_multy_data([0x00, 0x00])
-
-        # Power on sequence control
-        self.write_command(0xED)
-        self.write_multy_data([0x64, 0x03, 0x12, 0x81])
-
-        # Pump ratio control
-        self.write_command(0xF7)
-        self.write_data(0x20)
-
-        # Power Control 1
-        self.write_command(0xC0)
-        self.write_data(0x23)
-
-        # Power Control 2
-        self.write_command(0xC1)
-        self.write_data(0x10)
-
-        # VCOM Control 1
-        self.write_command(0xC5)
-        self.write_multy_data([0x3E, 0x28])
-
-        # VCOM Control 2
-        self.write_command(0xC7)
-        self.write_data(0x86)
-
-        # Memory Access Control
-        self.write_command(0x36)
-        self.write_data(0x48)  # MADCTL: BGR
-
-        # Pixel Format Set
-        self.write_command(0x3A)
-        self.write_data(self.pixel_format)
-
-        # Frame Rate Control
-        self.write_command(0xB1)
-        self.write_multy_data([0x00, 0x18])
-
-        # Display Function Control
-        self.write_command(0xB6)
-        self.write_multy_data([0x08, 0x82, 0x27])
-
-        # Enable 3G
-        self.write_command(0xF2)
-        self.write_data(0x00)
-
-        # Gamma Set
-        self.write_command(0x26)
-        self.write_data(0x01)
-        #self.write_data(0x02)
-
-        # Positive Gamma Correction
-        self.write_command(0xE0)
-        self.write_multy_data([0x0F, 0x31, 0x2B, 0x0C, 0x0E, 0x08, 0x4E, 0xF1, 0x37, 0x07, 0x10, 0x03, 0x0E, 0x09, 0x00])
-
-        # Negative Gamma Correction
-        self.write_command(0xE1)
-        self.write_multy_data([0x00, 0x0E, 0x14, 0x03, 0x11, 0x07, 0x31, 0xC1, 0x48, 0x08, 0x0F, 0x0C, 0x31, 0x36, 0x0F])
-
-        # Display ON
-        self.write_command(0x11)  # Sleep OUT
-        sleep_ms(120)
-        self.write_command(0x29)  # Display ON
-
-    def init_display_9486(self):
-        """ Initial display settings """
-
-        self.write_command(0xF2) #?
-        self.write_multy_data([0x18, 0xA3, 0x12, 0x02, 0XB2, 0x12, 0xFF, 0x10, 0x00])
-
-        self.write_command(0xF8) #?
-        self.write_multy_data([0x21, 0x04])
-
-        self.write_command(0x13) # Normal Display Mode ON
-
-        self.write_command(0x36) # Memory Access Control, BGR Order
-        self.write_data(0x08)
-
-        self.write_command(0xB4) # Display Inversion Control, 2-dot inversion
-        self.write_data(0x02)
-
-        self.write_command(0xB6) # Display Function Control, AGND, Normal scan
-        self.write_multy_data([0x02, 0x22, 0x3B])
-
-        self.write_command(0xC1) # Power Control 2
-        self.write_data(0x41)
-
-        self.write_command(0xC5) # VCOM Control 1
-        self.write_multy_data([0x00, 0x18])
-
-        self.write_command(0x3A) # Interface Pixel Format, 16bit
-        self.write_data(self.pixel_format)
-        sleep_ms(50)
-
-        self.write_command(0xE0)  # Positive Gamma Correction
-        #self.write_multy_data(bytearray([0x1F, 0x25, 0x22, 0x0B, 0x06, 0x0A, 0x4E, 0xC6, 0x39, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]))
-        #self.write_multy_data(bytearray([0x0F, 0x1F, 0x1C, 0x0C, 0x0F, 0x08, 0x48, 0x98, 0x37, 0x0A, 0x13, 0x04, 0x11, 0x0D, 0x00]))#ucglib
-        self.write_multy_data([ 0x0f, 0x24, 0x1c, 0x0a, 0x0f, 0x08, 0x43, 0x88, 0x32, 0x0f, 0x10, 0x06, 0x0f, 0x07, 0x00 ])
-
-        self.write_command(0xE1)  # Negative Gamma Correction
-        #self.write_multy_data(bytearray([0x1F, 0x3F, 0x3F, 0x0F, 0x1F, 0x0F, 0x46, 0x49, 0x31, 0x05, 0x09, 0x03, 0x1C, 0x1A, 0x00]))
-        #self.write_multy_data(bytearray([0x0F, 0x32, 0x2E, 0x0B, 0x0D, 0x05, 0x47, 0x75, 0x37, 0x06, 0x10, 0x03, 0x24, 0x20, 0x00]))#ucglib
-        self.write_multy_data([ 0x0F, 0x38, 0x30, 0x09, 0x0f, 0x0f, 0x4e, 0x77, 0x3c, 0x07, 0x10, 0x05, 0x23, 0x1b, 0x00 ])
-
-        self.write_command(0x11)  # Sleep OUT
-        sleep_ms(120)
-        self.write_command(0x29)  # Display ON
-
-    def init_display_9488(self):
-        """ Main settings of display """
-
-        self.write_command(0x13) # Normal Display Mode ON
-
-        self.write_command(0xE0)  # Positive Gamma Control
-        self.write_multy_data([0x00, 0x03, 0x09, 0x08, 0x16, 0x0A, 0x3F, 0x78, 0x4C, 0x09, 0x0A, 0x08, 0x16, 0x1A, 0x0F])
-
-        self.write_command(0xE1)  # Negative Gamma Control
-        self.write_multy_data([0x00, 0x16, 0x19, 0x03, 0x0F, 0x05, 0x32, 0x45, 0x46, 0x04, 0x0E, 0x0D, 0x35, 0x37, 0x0F])
-
-        self.write_command(0xC0)  # Power Control 1
-        self.write_multy_data([0x17, 0x15])
-
-        self.write_command(0xC1)  # Power Control 2
-        self.write_data(0x41)
-
-        self.write_command(0xC5)  # VCOM Control
-        self.write_multy_data([0x00, 0x12, 0x80])
-
-
-        self.write_command(0x36)  # Memory Access Control
-        self.write_data(0x48)
-
-        #self.write_command(0xB4) # Display Inversion Control, 2-dot inversion
-        #self.write_data(0x02)
-
-        #self.write_command(0x26)
-        #self.write_data(0x01)  # Gamma curve selected
-
-        self.write_command(0x21) # Invert display - On
-
-        self.write_command(0x3A)  # Pixel Format
-        self.write_data(self.pixel_format)
-
-        self.write_command(0x11)  # Sleep Out
-        sleep_ms(120)
-
-        self.write_command(0x29)  # Display ON
-
-    def read_data(self):
-        """ Reading data from the display. """
-        self.dc.value(1) # Data mode
-        self.wr.value(1) #
-        self.rd.value(0) # Read mode On (LOW)
-        self.cs.value(0) # Selecting a device
-
-        # Switch data pins to input mode
-        for pin in self.db_pins:
-            pin.init(Pin.IN)
-
-        data = 0
-        for i in range(8):
-            data |= self.db_pins[i].value() << i
-
-        self.rd.value(1)  # Deactivate Read mode (HIGH)
-        self.cs.value(1)  # Deselect device
-
-        # Switch data pins back to output mode
-        for pin in self.db_pins:
-            pin.init(Pin.OUT, value=0)
-        return data
-
-    def read_display_model(self):
-        """ Reading display model """
-        self.write_command(0xD3)
-        dummy = self.read_data()
-        version = self.read_data()
-        model1  = self.read_data()
-        model2  = self.read_data()
-
-        model = (model1 << 8) + model2
-
-        return model
-
-    @staticmethod
-    def read_controller_name():
-        from os import uname
-        
-        """ Reading controller name """
-        info = uname()
-        sysname = info.sysname
-
-        controller = 'Undefined'
-        if sysname == 'esp32':
-            if 'ESP32S3' in info.machine:
-                controller = 'ESP32-S3'
-            elif 'ESP32C3' in info.machine:
-                controller = 'ESP32-C3'
-            else:
-                controller = 'ESP32'
-        elif sysname == 'rp2':
-            controller = 'RP2'
-
-        return controller
-
-    def reinit_pins(self):
-        """ Reinit most important pins.
-        Most often used in combination with another devices.
-        """
-        self.cs.init(Pin.OUT,  value = 1)
-        self.dc.init(Pin.OUT,  value = 1)
-        self.wr.init(Pin.OUT,  value = 0)
-        self.rst.init(Pin.OUT, value = 1)
-        self.rd.init(Pin.OUT,  value = 1)
-
-    def write_command(self, cmd):
-        """ Sending a command to the display
-        Args
-        cmd (int): Command number, example: 0x2E
-        """
-        self.cs.value(0)  # Selecting a device
-        self.dc.value(0)  # Command Mode
-        self.set_data_pins(cmd)
-        self.wr.off()
-        self.wr.on()
-        self.cs.value(1)  # Deselect device
-
-    def write_data(self, data):
-        """ Sending data to the display
-        Args
-        data (int): Data byte, example: 0xF8
-        """
-        self.cs.value(0)  # Selecting a device
-        self.dc.value(1)  # Data mode
-        self.set_data_pins(data)
-        self.wr.off()
-        self.wr.on()
-        self.cs.value(1)  # Deselect device
-
-    def write_multy_data(self, multy_data):
-        """ Sending array of data bytes to the display
-        Params
-        multy_data (bytearray): Data array, example: bytearray([0x18, 0xA3, 0x2E])
-        """
-        self.cs.value(0)  # Selecting a device
-        self.dc.value(1)  # Data mode
-        for data in multy_data:
-            self.set_data_pins(data)
-            self.wr.off()
-            self.wr.on()
-        self.cs.value(1)  # Deselect device
-
-    @micropython.viper
-    def set_data_pins(self, value : int):
-        self.db0.value( value & 1 )
-        self.db1.value((value >> 1) & 1)
-        self.db2.value((value >> 2) & 1)
-        self.db3.value((value >> 3) & 1)
-        self.db4.value((value >> 4) & 1)
-        self.db5.value((value >> 5) & 1)
-        self.db6.value((value >> 6) & 1)
-        self.db7.value((value >> 7) & 1)
-
-
-    @micropython.viper
-    def update_byte2gpio(self):
-        """ Generate to memory all 256 states of data gpio
-        Return (bytearray): All 256 x 32-bit states """
-
-        # Base setting before making register snapshot
-        self.cs.value(0)
-        self.dc.value(1)
-        self.wr.value(0)
-        self.set_data_pins(0)
-
-        # Getting current state of gpio registers (snapshot)
-        gpio_out_ptr = ptr32(int(self.GPIO_OUT_REG))
-        empty_mask = gpio_out_ptr[0]
-        
-        #print(empty_mask, int(self.gpio_state))
-        if empty_mask == int(self.gpio_state):
-            return
-        #print('update')
-        self.gpio_state = empty_mask
-        
-        self.cs.value(1) # Deselect device
-
-        # Data pins cashing
-        dpins = self.data_pins
-        p0 = int(dpins[0])
-        p1 = int(dpins[1])
-        p2 = int(dpins[2])
-        p3 = int(dpins[3])
-        p4 = int(dpins[4])
-        p5 = int(dpins[5])
-        p6 = int(dpins[6])
-        p7 = int(dpins[7])
-
-        # Getting 32-bit access to gpio bytearray
-        buffer = ptr32(self.BYTE2GPIO)
-
-        # Generating of all 256 states
-        for byte in range(256):
-            # Convert byte to gpio setting
-            bit_gpio  = ((byte & 1) << p0)
-            bit_gpio |= (((byte >> 1) & 1) << p1)
-            bit_gpio |= (((byte >> 2) & 1) << p2)
-            bit_gpio |= (((byte >> 3) & 1) << p3)
-            bit_gpio |= (((byte >> 4) & 1) << p4)
-            bit_gpio |= (((byte >> 5) & 1) << p5)
-            bit_gpio |= (((byte >> 6) & 1) << p6)
-            bit_gpio |= (((byte >> 7) & 1) << p7)
-
-            # Saving state in memory
-            buffer[ byte ] = bit_gpio | empty_mask
-
-    def memory_access_control(self, my = 0, mx = 0, mv = 0, ml = 0, bgr = 0, mh = 0):
-        """ MADCTL. This command defines read/write scanning direction of frame memory. """
-        self.write_command(0x36)
-        data =  0
-        data += mh << 2 # Horizontal order
-        data += bgr<< 3 # RGB-BGR Order: 0 - RGB, 1 - BGR
-        data += ml << 4 # Vertical refresh order
-        data += mv << 5 # Row/Column exchange
-        data += mx << 6 # Column address order
-        data += my << 7 # Row address order
-        #print(data)
-        self.write_data(data)
-
-    def set_rotation(self, rotation = 0):
-        """ Set orientation of display
-        Params
-        rotation (int):  0 = 0 degree, 1 = 90 degrees, 2 = 180 degrees, 3 = 270 degrees
-        """
-        if rotation > 3 or rotation < 0:
-            print("Incorrect rotation value")
-            return False
-
-        old_rotation = self.rotation
-        self.rotation = rotation
-
-        if self.display_model == 0x9486:
-            if self.rotation == 0: # 0 deg
-                self.memory_access_control(0, 0, 0, 0, 1, 0)
-            elif self.rotation == 1: # 90 deg
-                self.memory_access_control(0, 1, 1, 0, 1, 0)
-            elif self.rotation == 2: # 180 deg
-                self.memory_access_control(1, 1, 0, 0, 1, 0)
-            elif self.rotation == 3: # 270 deg
-                self.memory_access_control(1, 0, 1, 0, 1, 0)
-        else:
-            if self.rotation == 0: # 0 deg
-                self.memory_access_control(0, 1, 0, 0, 1, 0)
-            elif self.rotation == 1: # 90 deg
-                self.memory_access_control(0, 0, 1, 0, 1, 0)
-            elif self.rotation == 2: # 180 deg
-                self.memory_access_control(1, 0, 0, 0, 1, 0)
-            elif self.rotation == 3: # 270 deg
-                self.memory_access_control(1, 1, 1, 0, 1, 0)
-
-        # Change height <-> width for 90 and 270 degrees
-        if (( rotation & 1) and not (old_rotation & 1)
-            or not ( rotation & 1) and (old_rotation & 1) ):
-            
-            self.swap_dimensions()
-
-    def invert_display(self, on = True):
-        """ Enables or disables color inversion on the display.
-        Args
-        on (bool): True = Enable inversion, False = Disable inversion
-        """
-        if on:
-            self.write_command(0x21)
-        else:
-            self.write_command(0x20)
-
-    def tearing_effect(self, on = True):
-        """ Activate "Tearing effect"
-        Args
-        on (bool): True = Enable effect, False = Disable effect
-        """
-        if bool(on):
-            self.write_command(0x35)
-        else:
-            self.write_command(0x34)
-
-    def idle_mode(self, on = True):
-        """ Enables or disables idle mode on the display.
-        Args
-        on (bool): True = Enable idle mode, False = Disable idle mode
-        """
-        if on:
-            self.write_command(0x39)
-        else:
-            self.write_command(0x38)
-
-    def set_adaptive_brightness(self, mode = 0):
-        """ Set adaptive brightness
-        Args
-        mode (int):
-            0 - CABC OFF
-            1 - User Interface Image
-            2 - Still Picture
-            3 - Moving Image
-        """
-        if 0 <= mode < 4:
-            self.write_command(0x55)
-            self.write_data(mode)
-
-        else:
-            print('Error mode in def set_adaptive_brightness')
-            print(mode)
-
-    def vert_scroll(self, top_fix: int, scroll_height: int, bot_fix: int):
-        """ Vertical scroll settings
-        Args
-        top_fix (int): Top fixed rows
-        scroll_height (int): Scrolling height rows
-        bot_fix (int): Bottom fixed rows
-
-        top_fix + bot_fix + scroll_height - must be  equal height of screen
-        """
-        screen_height = self.height
-        if self.rotation & 1:
-            screen_height = self.width
-
-        total_height = top_fix + bot_fix + scroll_height
-
-        if total_height == screen_height:
-            self.write_command(0x33)
-            #Top fixed rows
-            self.write_data((top_fix >> 8) & 0xFF)
-            self.write_data(top_fix & 0xFF)
-            #Scrolling height rows
-            self.write_data((scroll_height >> 8) & 0xFF)
-            self.write_data(scroll_height & 0xFF)
-            #Bottom fixed rows
-            self.write_data((bot_fix >> 8) & 0xFF)
-            self.write_data(bot_fix & 0xFF)
-
-        else:
-            print('Incorrect sum in vertical scroll ', sum, ' <> ', screen_height)
-
-    def vert_scroll_start_address(self, start = 0):
-        """ Set vertical scroll start address, and run scrolling
-        Args
-        start (int): start row
-        """
-        self.write_command(0x37)
-        self.write_data((start >> 8) & 0xFF)
-        self.write_data(start & 0xFF)
-
-    def scroll(self, delay = 5):
-        """ Scrolling on the screen at a given speed.
-        Args
-        delay (int): Delay between scrolling actions
-        """
-        height = self.height
-        if self.rotation & 1:
-            height = self.width
-
-        for y in range(height):
-            self.vert_scroll_start_address(y + 1)
-            sleep_ms(delay)
-
-    @micropython.viper
-    def set_window(self, x0:int, y0:int, x1:int, y1:int):
-        """ Sets the starting position and the area of drawing on the display
-        Args
-        x0 (int): Start X position  ________
-        y0 (int): Start Y position  |s---> |
-        x1 (int): End X position    ||     |
-        y1 (int): End Y position    |v____e|
-        """
-        dc_bit = int(self.dc_bit)
-        wr_bit = int(self.wr_bit)
-
-        byte2gpio = ptr32(self.BYTE2GPIO)
-
-        #Getting pointers to registers
-        GPIO_OUT   = ptr32(self.GPIO_OUT_REG)  # 0 - 31  pins
-        GPIO_OUT_S = ptr32(self.GPIO_OUT_SET) # + bit
-
-        # Column address sending
-        GPIO_OUT[0] = byte2gpio[0x2A] - dc_bit
-        GPIO_OUT_S[0] = wr_bit
-
-        # Sending Start and End X coordinates
-        GPIO_OUT[0] = byte2gpio[(x0 >> 8) & 0xFF] # x hi
-        GPIO_OUT_S[0] = wr_bit
-        GPIO_OUT[0] = byte2gpio[x0 & 0xFF] # x low
-        GPIO_OUT_S[0] = wr_bit
-
-        GPIO_OUT[0] = byte2gpio[(x1 >> 8) & 0xFF] # x end hi
-        GPIO_OUT_S[0] = wr_bit
-        GPIO_OUT[0] = byte2gpio[x1 & 0xFF] # x end low
-        GPIO_OUT_S[0] = wr_bit
-
-        # Page address sending
-        GPIO_OUT[0] = byte2gpio[0x2B] - dc_bit
-        GPIO_OUT_S[0] = wr_bit
-
-        # Sending Start and End Y coordinates
-        GPIO_OUT[0] = byte2gpio[(y0 >> 8) & 0xFF] # y hi
-        GPIO_OUT_S[0] = wr_bit
-        GPIO_OUT[0] = byte2gpio[y0 & 0xFF] # y low
-        GPIO_OUT_S[0] = wr_bit
-
-        GPIO_OUT[0] = byte2gpio[(y1 >> 8) & 0xFF] # y end hi
-        GPIO_OUT_S[0] = wr_bit
-        GPIO_OUT[0] = byte2gpio[y1 & 0xFF] # y end low
-        GPIO_OUT_S[0] = wr_bit
-
-        # Memory write for addresses
-        GPIO_OUT[0] = byte2gpio[0x2C] - dc_bit
-        GPIO_OUT_S[0] = wr_bit
+"""
+ILI9XXX_8B display-shield v 0.4.8
+
+Displays: ILI9341, ILI9486, ILI9488
+Connection: 8-bit Data Bus
+Colors: 16-bit, 18-bit, 24-bit
+Controllers: Esp32, Esp32-S3, Raspberry Pi Pico
+
+Project path: https://github.com/r2d2-arduino/micropython_ili9488_9486_9341_shields
+MIT License
+
+Author: Arthur Derkach
+"""
+from machine import Pin
+from time import sleep_ms, ticks_ms, ticks_us, ticks_diff
+import json
+from ili9xxx_bus import GPIO_BUS
+
+PROBE_CACHE_VERSION = const(3) # Format of probe cache, see save_probe_cache()
+
+# Init sequences. Each record: command, count of params (+ 0x80 if delay follows), params, delay in ms
+
+INIT_9341 = bytes((
+    0x28, 0,                                # Display OFF
+    0xCB, 5, 0x39, 0x2C, 0x00, 0x34, 0x02,  # Power Control A
+    0xCF, 3, 0x00, 0xC1, 0x30,              # Power Control B
+    0xE8, 3, 0x85, 0x00, 0x78,              # Driver timing control A
+    0xEA, 2, 0x00, 0x00,                    # Driver timing control B
+    0xED, 4, 0x64, 0x03, 0x12, 0x81,        # Power on sequence control
+    0xF7, 1, 0x20,                          # Pump ratio control
+    0xC0, 1, 0x23,                          # Power Control 1
+    0xC1, 1, 0x10,                          # Power Control 2
+    0xC5, 2, 0x3E, 0x28,                    # VCOM Control 1
+    0xC7, 1, 0x86,                          # VCOM Control 2
+    0x36, 1, 0x48,                          # Memory Access Control, MADCTL: BGR
+    0x3A, 1, 0x55,                          # Pixel Format Set (replaced by bpp)
+    0xB1, 2, 0x00, 0x18,                    # Frame Rate Control
+    0xB6, 3, 0x08, 0x82, 0x27,              # Display Function Control
+    0xF2, 1, 0x00,                          # Enable 3G
+    0x26, 1, 0x01,                          # Gamma Set
+    0xE0, 15, 0x0F, 0x31, 0x2B, 0x0C, 0x0E, 0x08, 0x4E, 0xF1, 0x37, 0x07, 0x10, 0x03, 0x0E, 0x09, 0x00, # Positive Gamma Correction
+    0xE1, 15, 0x00, 0x0E, 0x14, 0x03, 0x11, 0x07, 0x31, 0xC1, 0x48, 0x08, 0x0F, 0x0C, 0x31, 0x36, 0x0F, # Negative Gamma Correction
+    0x11, 0x80, 120,                        # Sleep OUT
+    0x29, 0,                                # Display ON
+))
+
+INIT_9486 = bytes((
+    0xF2, 9, 0x18, 0xA3, 0x12, 0x02, 0xB2, 0x12, 0xFF, 0x10, 0x00, #?
+    0xF8, 2, 0x21, 0x04,                    #?
+    0x13, 0,                                # Normal Display Mode ON
+    0x36, 1, 0x08,                          # Memory Access Control, BGR Order
+    0xB4, 1, 0x02,                          # Display Inversion Control, 2-dot inversion
+    0xB6, 3, 0x02, 0x22, 0x3B,              # Display Function Control, AGND, Normal scan
+    0xC1, 1, 0x41,                          # Power Control 2
+    0xC5, 2, 0x00, 0x18,                    # VCOM Control 1
+    0x3A, 0x81, 0x55, 50,                   # Interface Pixel Format (replaced by bpp)
+    0xE0, 15, 0x0F, 0x24, 0x1C, 0x0A, 0x0F, 0x08, 0x43, 0x88, 0x32, 0x0F, 0x10, 0x06, 0x0F, 0x07, 0x00, # Positive Gamma Correction
+    0xE1, 15, 0x0F, 0x38, 0x30, 0x09, 0x0F, 0x0F, 0x4E, 0x77, 0x3C, 0x07, 0x10, 0x05, 0x23, 0x1B, 0x00, # Negative Gamma Correction
+    0x11, 0x80, 120,                        # Sleep OUT
+    0x29, 0,                                # Display ON
+))
+# Other gamma sets for ILI9486:
+# 0xE0: 0x1F, 0x25, 0x22, 0x0B, 0x06, 0x0A, 0x4E, 0xC6, 0x39, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00
+# 0xE1: 0x1F, 0x3F, 0x3F, 0x0F, 0x1F, 0x0F, 0x46, 0x49, 0x31, 0x05, 0x09, 0x03, 0x1C, 0x1A, 0x00
+# 0xE0: 0x0F, 0x1F, 0x1C, 0x0C, 0x0F, 0x08, 0x48, 0x98, 0x37, 0x0A, 0x13, 0x04, 0x11, 0x0D, 0x00 #ucglib
+# 0xE1: 0x0F, 0x32, 0x2E, 0x0B, 0x0D, 0x05, 0x47, 0x75, 0x37, 0x06, 0x10, 0x03, 0x24, 0x20, 0x00 #ucglib
+
+INIT_9488 = bytes((
+    0x13, 0,                                # Normal Display Mode ON
+    0xE0, 15, 0x00, 0x03, 0x09, 0x08, 0x16, 0x0A, 0x3F, 0x78, 0x4C, 0x09, 0x0A, 0x08, 0x16, 0x1A, 0x0F, # Positive Gamma Control
+    0xE1, 15, 0x00, 0x16, 0x19, 0x03, 0x0F, 0x05, 0x32, 0x45, 0x46, 0x04, 0x0E, 0x0D, 0x35, 0x37, 0x0F, # Negative Gamma Control
+    0xC0, 2, 0x17, 0x15,                    # Power Control 1
+    0xC1, 1, 0x41,                          # Power Control 2
+    0xC5, 3, 0x00, 0x12, 0x80,              # VCOM Control
+    0x36, 1, 0x48,                          # Memory Access Control
+    #0xB4, 1, 0x02,                         # Display Inversion Control, 2-dot inversion
+    #0x26, 1, 0x01,                         # Gamma curve selected
+    0x21, 0,                                # Invert display - On
+    0x3A, 1, 0x55,                          # Pixel Format (replaced by bpp)
+    0x11, 0x80, 120,                        # Sleep Out
+    0x29, 0,                                # Display ON
+))
+
+
+class ILI9XXX_8B():
+
+    INIT_TABLES = { 0x9341: INIT_9341, 0x9486: INIT_9486, 0x9488: INIT_9488 }
+    INIT_DELAY_SCALE = {} # Delays of reset and init in percents by display model, default 100
+
+    # MADCTL of rotations 0, 90, 180, 270 degrees
+    MADCTL_9486 = (0x08, 0x68, 0xC8, 0xA8)
+    MADCTL      = (0x48, 0x28, 0x88, 0xE8)
+
+    CONTROLLER_NAME = None # Result of read_controller_name(), once per boot
+
+    # Bus backends in order of preference, the first available is used (see ili9xxx_bus.py)
+    BUS_BACKENDS = [GPIO_BUS]
+    
+    def __init__( self, data_pins, cs_pin, dc_pin, wr_pin, rd_pin, rst_pin,
+                  width = 0, height = 0, bpp = 16, display_model = 0, warm_start = False,
+                  probe_cache = None, safe_bus = False, bus = None, te_pin = None ):
+        """ Constructor
+        Args
+        data_pins (list): List of data bus pin numbers (D0, D1, ..., D7), example: [12, 13, 26, 25, 17, 16, 27, 14]
+        cs_pin  (int): CS pin number (Chip Select)
+        dc_pin  (int): DC pin number (command/parameter mode)
+        wr_pin  (int): WR pin number (Write data signal)
+        rd_pin  (int): RD pin number (Read data signal)
+        rst_pin (int): RST pin number (Reset)
+        width   (int): Screen width in pixels (less)
+        height  (int): Screen height in pixels
+        bpp     (int): Bits per Pixel: 16, 18 or 24
+        controller (string): Controller name: ESP32, ESP32-S3, ESP32-C3, RP2
+        display_model (hex): One of 0x9341, 0x9386 (default), 0x9388 
+        warm_start (bool): Skip reset and init if display is already configured (after soft reboot or deep sleep)
+        probe_cache (dict or str): Dictionary or json-file name, keeps detected controller and display model for next starts
+        safe_bus (bool): Write only display pins through set/clear registers, other pins of the port are not touched
+        bus (class or function): Bus backend, called with the display, example: lambda display: RECORDING_BUS(display, target = GPIO_BUS). None - fastest of BUS_BACKENDS
+        te_pin (int): TE pin number (Tearing effect output of the display, if it is wired), enables wait_vsync()
+        """
+
+        self.data_pins = data_pins
+        self.cs_pin = cs_pin
+        self.dc_pin = dc_pin
+        self.wr_pin = wr_pin
+        self.rst_pin = rst_pin
+        self.rd_pin = rd_pin
+        
+        self.db0 = Pin(data_pins[0], Pin.OUT, value = 0)
+        self.db1 = Pin(data_pins[1], Pin.OUT, value = 0)
+        self.db2 = Pin(data_pins[2], Pin.OUT, value = 0)
+        self.db3 = Pin(data_pins[3], Pin.OUT, value = 0)
+        self.db4 = Pin(data_pins[4], Pin.OUT, value = 0)
+        self.db5 = Pin(data_pins[5], Pin.OUT, value = 0)
+        self.db6 = Pin(data_pins[6], Pin.OUT, value = 0)
+        self.db7 = Pin(data_pins[7], Pin.OUT, value = 0)
+        self.db_pins = [self.db0, self.db1, self.db2, self.db3, self.db4, self.db5, self.db6, self.db7]
+               
+        self.cs = Pin(cs_pin, Pin.OUT, value = 1)
+        self.dc = Pin(dc_pin, Pin.OUT, value = 1)
+        self.wr = Pin(wr_pin, Pin.OUT, value = 0)
+        self.rst= Pin(rst_pin,Pin.OUT, value = 1)
+        self.rd = Pin(rd_pin, Pin.OUT, value = 1)
+
+        self.rotation = 0
+
+        self.display_model = display_model
+
+        # Bits in the output register of pin's bank: GPIO0-31 or GPIO32-48
+        self.wr_bit = 1 << (wr_pin & 31)
+        self.dc_bit = 1 << (dc_pin & 31)
+        self.cs_bit = 1 << (cs_pin & 31)
+
+        pins = list(data_pins) + [cs_pin, dc_pin, wr_pin, rd_pin, rst_pin]
+        cache = None
+        if probe_cache is not None:
+            cache = self.load_probe_cache(probe_cache)
+            if not self.check_probe_cache(cache, pins):
+                cache = None
+
+        if cache:
+            self.controller_name = cache['controller']
+        else:
+            self.controller_name = self.read_controller_name()
+
+        # Output registers of GPIO0-31: value, + bit, - bit
+        if cache:
+            self.gpio_regs = tuple(cache['gpio_regs'])
+        elif self.controller_name in ('ESP32-S3', 'ESP32-C3'):
+            self.gpio_regs = (0x60004004, 0x60004008, 0x6000400C)
+        elif self.controller_name == 'RP2': #Raspberry Pi Pico
+            self.gpio_regs = (0xD0000010, 0xD0000014, 0xD0000018)
+        else: # ESP32
+            self.gpio_regs = (0x3FF44004, 0x3FF44008, 0x3FF4400C)
+
+        self.GPIO_OUT_REG, self.GPIO_OUT_SET, self.GPIO_OUT_CLR = self.gpio_regs
+
+        # GPIO32-48 (ESP32, ESP32-S3): OUT1 registers follow OUT registers
+        self.GPIO_OUT1_REG = self.GPIO_OUT_REG + 0x0C
+        self.GPIO_OUT1_SET = self.GPIO_OUT_SET + 0x0C
+        self.GPIO_OUT1_CLR = self.GPIO_OUT_CLR + 0x0C
+
+        bus_pins = list(data_pins) + [dc_pin, wr_pin]
+        high_pins = [pin for pin in bus_pins if pin > 31]
+
+        # Data, DC and WR pins are split between GPIO0-31 and GPIO32-48
+        self.dual_bank = 0 < len(high_pins) < len(bus_pins)
+
+        if len(high_pins) == len(bus_pins):
+            # The whole bus is on GPIO32-48: same fast path with OUT1 registers
+            self.GPIO_OUT_REG = self.GPIO_OUT1_REG
+            self.GPIO_OUT_SET = self.GPIO_OUT1_SET
+            self.GPIO_OUT_CLR = self.GPIO_OUT1_CLR
+
+        self.BYTE2GPIO = bytearray(1024)
+        self.gpio_state = 0
+        self.data_byte = bytearray(1) # Parameter of write_data()
+        self.rows_buffer = None       # Rows of image loaders, see take_rows()
+        self.BYTE2GPIO1 = None # States of GPIO32-48 for dual bank bus
+        self.gpio_state1 = 0
+        if self.dual_bank:
+            self.BYTE2GPIO1 = bytearray(1024)
+            self.data_pin_numbers = bytes(data_pins)
+            # Register of WR rising edge, DC bits of both banks for commands
+            self.GPIO_WR_SET = self.GPIO_OUT1_SET if wr_pin > 31 else self.GPIO_OUT_SET
+            self.dc_bit0 = 0 if dc_pin > 31 else self.dc_bit
+            self.dc_bit1 = self.dc_bit if dc_pin > 31 else 0
+
+        # D0-D7 on consecutive GPIOs in order: byte is shifted into the register value
+        self.data_shift = self.contiguous_shift(data_pins)
+
+        # Reading of GRAM (read_pixels): input register of D0-D7 and RD strobe registers
+        self.GPIO_IN_REG = None # D0-D7 are split between GPIO0-31 and GPIO32-48: reading through Pin
+        if all(pin > 31 for pin in data_pins) or all(pin < 32 for pin in data_pins):
+            if self.controller_name == 'RP2':
+                self.GPIO_IN_REG = self.gpio_regs[0] - 0x0C # SIO GPIO_IN
+            else: # GPIO_IN_REG or GPIO_IN1_REG
+                self.GPIO_IN_REG = self.gpio_regs[0] + (0x3C if data_pins[0] > 31 else 0x38)
+        self.rd_bit = 1 << (rd_pin & 31)
+        self.GPIO_RD_SET = self.gpio_regs[1] + (0x0C if rd_pin > 31 else 0)
+        self.GPIO_RD_CLR = self.gpio_regs[2] + (0x0C if rd_pin > 31 else 0)
+        self.GPIO2BYTE = None # Reverse table of BYTE2GPIO, made by first reading
+        self.read_delay = 8   # Reads of the input register while RD is low: access time of GRAM (340 ns)
+        self.pixel_buffer = bytearray(2) # Pixel of read_pixel()
+
+        if safe_bus and self.dual_bank:
+            print('Safe bus needs data, DC and WR pins in one bank: GPIO0-31 or GPIO32-48')
+            safe_bus = False
+
+        # Set and clear masks of all 256 bytes, they depend only on pins
+        self.safe_bus = safe_bus
+        self.BYTE2SET = None
+        self.BYTE2CLR = None
+        if safe_bus:
+            self.BYTE2SET = bytearray(1024)
+            self.BYTE2CLR = bytearray(1024)
+            self.update_byte2set_clr()
+
+        if bus is None:
+            self.bus = self.select_bus()
+        else:
+            self.bus = bus(self)
+
+        if bpp == 24:
+            self.pixel_format = 0x77
+        elif bpp == 18:
+            self.pixel_format = 0x66
+        else: # bpp == 16:
+            self.pixel_format = 0x55
+
+        # Cached model is known before reset, its delays are trimmed too (see set_init_delay_scale)
+        if display_model == 0 and cache:
+            self.display_model = cache['display_model']
+
+        if not warm_start:
+            self.reset()
+
+        if self.display_model == 0:
+            self.display_model = self.read_display_model()
+            #print( 'Display model:', hex(self.display_model) )
+
+        if probe_cache is not None and not cache:
+            self.save_probe_cache(probe_cache, pins)
+
+        # Rotation of already configured display, or -1
+        warm_rotation = -1
+        if warm_start:
+            warm_rotation = self.read_warm_rotation()
+        self.warm_started = warm_rotation >= 0
+
+        self.width = 240 # default width
+        self.height = 320 # default height
+
+        if width > 0:
+            self.width = width
+        else:
+            if self.display_model in (0x9486, 0x9488):
+                self.width = 320
+
+        if height > 0:
+            self.height = height
+        else:
+            if self.display_model in (0x9486, 0x9488):
+                self.height = 480
+
+        if self.warm_started:
+            # Display keeps its settings and picture
+            self.rotation = warm_rotation
+            if warm_rotation & 1:
+                self.width, self.height = self.height, self.width
+        else:
+            if warm_start:
+                self.reset()
+            self.init_display()
+
+        self.te = None
+        self.vsync_count = 0 # TE pulses
+        self.vsync_ticks = 0 # ticks_us() of the last TE pulse
+        self.frame_us = 0    # Refresh period of the display, measured by TE pulses
+        if te_pin is not None:
+            self.init_vsync(te_pin)
+
+        self.profile_stats = None # Counters of profiler() by operation, None - profiler is off
+        self.profile_saved = None # Wrapped methods of profiler()
+        self.profile_bytes = 0    # Pixel bytes of opened windows
+        self.profile_windows = 0  # Opened windows
+
+    @staticmethod
+    def register_init_table(display_model, table, delay_scale = 100):
+        """ Registers init sequence for a display model (for clones and own settings)
+        Args
+        display_model (hex): Model, as returned by read_display_model(), example: 0x9488
+        table (bytes): Init sequence, see INIT_9341
+        delay_scale (int): Delays of the sequence in percents
+        """
+        ILI9XXX_8B.INIT_TABLES[display_model] = bytes(table)
+        ILI9XXX_8B.INIT_DELAY_SCALE[display_model] = delay_scale
+
+    @staticmethod
+    def set_init_delay_scale(display_model, delay_scale = 100):
+        """ Trims delays of reset and init sequence of a display model.
+        Delays of reset are trimmed, if the model is given to the constructor or kept in probe_cache,
+        a model detected by ID is read after reset with full delays.
+        Args
+        display_model (hex): Model, example: 0x9341
+        delay_scale (int): Delays in percents, example: 50 - two times shorter
+        """
+        ILI9XXX_8B.INIT_DELAY_SCALE[display_model] = delay_scale
+
+    def init_delay(self, ms):
+        """ Delay of reset and init sequence, trimmed for the display model """
+        sleep_ms(ms * self.INIT_DELAY_SCALE.get(self.display_model, 100) // 100)
+
+    def reset(self):
+        """ Resets display settings to default. """
+        self.rst.value(0)
+        self.init_delay(10)
+        self.rst.value(1)
+        self.init_delay(120)
+        self.write_command(0x01)  # Software Reset
+        self.init_delay(120)
+
+    def init_display(self):
+        """ Initial display settings from the init table of the display model """
+        table = self.INIT_TABLES.get(self.display_model)
+        if table is None:
+            print('Unknown Display Model!', hex(self.display_model))
+            table = self.INIT_TABLES[0x9486]
+
+        self.bus.init_table(table, self.INIT_DELAY_SCALE.get(self.display_model, 100))
+
+    def init_display_9341(self):
+        self.bus.init_table(INIT_9341, self.INIT_DELAY_SCALE.get(0x9341, 100))
+
+    def init_display_9486(self):
+        self.bus.init_table(INIT_9486, self.INIT_DELAY_SCALE.get(0x9486, 100))
+
+    def init_display_9488(self):
+        self.bus.init_table(INIT_9488, self.INIT_DELAY_SCALE.get(0x9488, 100))
+
+    def select_bus(self):
+        """ Selects the first available backend of BUS_BACKENDS
+        Return (ILI9XXX_BUS): Bus backend
+        """
+        for backend in self.BUS_BACKENDS:
+            if backend.available(self):
+                return backend(self)
+        return GPIO_BUS(self)
+
+    @staticmethod
+    def register_bus(backend):
+        """ Adds a bus backend with the highest preference, before creating the display
+        Args
+        backend (class): Subclass of ILI9XXX_BUS
+        """
+        if backend not in ILI9XXX_8B.BUS_BACKENDS:
+            ILI9XXX_8B.BUS_BACKENDS.insert(0, backend)
+
+    @micropython.viper
+    def run_init_table(self, table, delay_scale:int):
+        """ Sends init sequence to the display through the fast GPIO path
+        Args
+        table (bytes): Records of: command, count of params (+ 0x80 if delay follows), params, delay in ms
+        delay_scale (int): Delays in percents
+        """
+        dc_bit = int(self.dc_bit)
+        wr_bit = int(self.wr_bit)
+        pixel_format = int(self.pixel_format)
+
+        data = ptr8(table)
+        size = int(len(table))
+
+        safe = bool(self.safe_bus)
+        dual = bool(self.dual_bank)
+
+        byte2gpio  = ptr32(self.BYTE2GPIO)
+        byte2set   = byte2gpio
+        byte2clr   = byte2gpio
+        byte2gpio1 = byte2gpio
+        if safe:
+            byte2set = ptr32(self.BYTE2SET)
+            byte2clr = ptr32(self.BYTE2CLR)
+        GPIO_OUT   = ptr32(self.GPIO_OUT_REG)
+        GPIO_OUT_S = ptr32(self.GPIO_OUT_SET)
+        GPIO_OUT_C = ptr32(self.GPIO_OUT_CLR)
+        GPIO_OUT1  = GPIO_OUT
+        dc_bit0 = dc_bit
+        dc_bit1 = 0
+        if dual:
+            byte2gpio1 = ptr32(self.BYTE2GPIO1)
+            GPIO_OUT1  = ptr32(self.GPIO_OUT1_REG)
+            GPIO_OUT_S = ptr32(self.GPIO_WR_SET)
+            dc_bit0 = int(self.dc_bit0)
+            dc_bit1 = int(self.dc_bit1)
+
+        self.cs.value(0)
+
+        pos = 0
+        while pos < size:
+            cmd   = data[pos]
+            count = data[pos + 1]
+            pos += 2
+
+            if safe:
+                GPIO_OUT_C[0] = byte2clr[cmd] | dc_bit
+                GPIO_OUT_S[0] = byte2set[cmd]
+                GPIO_OUT_S[0] = wr_bit
+                GPIO_OUT_S[0] = dc_bit
+            elif dual:
+                GPIO_OUT[0] = byte2gpio[cmd] - dc_bit0
+                GPIO_OUT1[0] = byte2gpio1[cmd] - dc_bit1
+                GPIO_OUT_S[0] = wr_bit
+            else:
+                GPIO_OUT[0] = byte2gpio[cmd] - dc_bit
+                GPIO_OUT_S[0] = wr_bit
+
+            end = pos + (count & 0x7F)
+            while pos < end:
+                value = data[pos]
+                if cmd == 0x3A: # Pixel format is set by bpp
+                    value = pixel_format
+                if safe:
+                    GPIO_OUT_C[0] = byte2clr[value]
+                    GPIO_OUT_S[0] = byte2set[value]
+                elif dual:
+                    GPIO_OUT[0] = byte2gpio[value]
+                    GPIO_OUT1[0] = byte2gpio1[value]
+                else:
+                    GPIO_OUT[0] = byte2gpio[value]
+                GPIO_OUT_S[0] = wr_bit
+                pos += 1
+
+            if count & 0x80:
+                delay = data[pos] * delay_scale // 100
+                pos += 1
+                if delay > 0:
+                    sleep_ms(delay)
+
+        self.cs.value(1)
+
+    def read_bytes(self, count):
+        """ Reading of several data bytes, data pins are switched to input only once
+        Args
+        count (int): Number of bytes
+        Return (bytearray): Data bytes
+        """
+        db_pins = self.db_pins
+        data = bytearray(count)
+
+        self.dc.value(1) # Data mode
+        self.wr.value(1) #
+        self.cs.value(0) # Selecting a device
+
+        # Switch data pins to input mode
+        for pin in db_pins:
+            pin.init(Pin.IN)
+
+        for n in range(count):
+            self.rd.value(0) # Read mode On (LOW)
+            value = 0
+            for i in range(8):
+                value |= db_pins[i].value() << i
+            data[n] = value
+            self.rd.value(1) # Next byte
+
+        self.cs.value(1)  # Deselect device
+
+        # Switch data pins back to output mode
+        for pin in db_pins:
+            pin.init(Pin.OUT, value=0)
+        return data
+
+    def read_data(self):
+        """ Reading data from the display. """
+        self.dc.value(1) # Data mode
+        self.wr.value(1) #
+        self.rd.value(0) # Read mode On (LOW)
+        self.cs.value(0) # Selecting a device
+
+        # Switch data pins to input mode
+        for pin in self.db_pins:
+            pin.init(Pin.IN)
+
+        data = 0
+        for i in range(8):
+            data |= self.db_pins[i].value() << i
+
+        self.rd.value(1)  # Deactivate Read mode (HIGH)
+        self.cs.value(1)  # Deselect device
+
+        # Switch data pins back to output mode
+        for pin in self.db_pins:
+            pin.init(Pin.OUT, value=0)
+        return data
+
+    def read_pixels(self, buffer, count):
+        """ Reading of pixels after Memory Read (0x2E) command: dummy byte, then R, G, B bytes of every pixel
+        (the display sends 3 bytes for any pixel format). Data pins are switched to input only once
+        Args
+        buffer (bytearray): RGB565 pixels, high byte first
+        count (int): Number of pixels
+        """
+        if self.GPIO_IN_REG is None: # Slow path: every byte through Pin
+            data = self.read_bytes(count * 3 + 1)
+            for n in range(count):
+                i = n * 3 + 1
+                buffer[n * 2] = (data[i] & 0xF8) | (data[i + 1] >> 5)
+                buffer[n * 2 + 1] = ((data[i + 1] << 3) & 0xE0) | (data[i + 2] >> 3)
+            return
+
+        if self.GPIO2BYTE is None:
+            self.update_gpio2byte()
+
+        self.dc.value(1) # Data mode
+        self.wr.value(1) #
+        self.cs.value(0) # Selecting a device
+
+        # Switch data pins to input mode
+        for pin in self.db_pins:
+            pin.init(Pin.IN)
+
+        self.read_gram(buffer, count)
+
+        self.cs.value(1)  # Deselect device
+
+        # Switch data pins back to output mode
+        for pin in self.db_pins:
+            pin.init(Pin.OUT, value=0)
+
+    @micropython.viper
+    def read_gram(self, buffer, count:int):
+        """ Reads pixels through GPIO registers: RD strobes by set/clear registers, bytes are decoded
+        from the input register by shift (contiguous pins) or by GPIO2BYTE
+        Args
+        buffer (bytearray): RGB565 pixels, high byte first
+        count (int): Number of pixels
+        """
+        GPIO_IN     = ptr32(self.GPIO_IN_REG)
+        GPIO_RD_S   = ptr32(self.GPIO_RD_SET)
+        GPIO_RD_C   = ptr32(self.GPIO_RD_CLR)
+        gpio2byte   = ptr8(self.GPIO2BYTE)
+        buffer_ptr  = ptr8(buffer)
+        rd_bit      = int(self.rd_bit)
+        shift       = int(self.data_shift)
+        delay       = int(self.read_delay)
+
+        total = count * 3 + 1
+        channel = -1 # Dummy byte
+        red = 0
+        green = 0
+        pos = 0
+        n = 0
+        while n < total:
+            GPIO_RD_C[0] = rd_bit # Display drives D0-D7
+            value = 0
+            i = 0
+            while i < delay:
+                value = GPIO_IN[0]
+                i += 1
+            value = GPIO_IN[0]
+            GPIO_RD_S[0] = rd_bit # Next byte
+
+            if shift >= 0:
+                byte = (value >> shift) & 0xFF
+            else:
+                byte = ( gpio2byte[value & 0xFF] | gpio2byte[256 + ((value >> 8) & 0xFF)]
+                       | gpio2byte[512 + ((value >> 16) & 0xFF)] | gpio2byte[768 + ((value >> 24) & 0xFF)] )
+
+            if channel == 0:
+                red = byte
+            elif channel == 1:
+                green = byte
+            elif channel == 2: # R, G, B (6 bits each, left aligned) -> RGB565
+                buffer_ptr[pos] = (red & 0xF8) | (green >> 5)
+                buffer_ptr[pos + 1] = ((green << 3) & 0xE0) | (byte >> 3)
+                pos += 2
+                channel = -1
+            channel += 1
+            n += 1
+
+    def update_gpio2byte(self):
+        """ Reverse table of BYTE2GPIO: bits of D0-D7 for every byte of the input register (4 x 256) """
+        table = bytearray(1024)
+        for i in range(8):
+            pin = self.data_pins[i] & 31
+            offset = (pin >> 3) * 256
+            bit = 1 << (pin & 7)
+            for value in range(256):
+                if value & bit:
+                    table[offset + value] |= 1 << i
+        self.GPIO2BYTE = table
+
+    def read_rect(self, x, y, width, height, buffer = None):
+        """ Reading of a screen area from the display memory (screen capture, save-under)
+        Args
+        x, y (int): Start position
+        width, height (int): Size of the area
+        buffer (bytearray): Pixels, 2 bytes per pixel. None - new buffer
+        Return (bytearray): RGB565 pixels, high byte first (as in draw_raw_image)
+        """
+        size = width * height * 2
+        if buffer is None:
+            buffer = bytearray(size)
+        elif len(buffer) < size:
+            raise ValueError('Buffer is smaller than {} bytes'.format(size))
+
+        bus = self.bus
+        bus.begin()
+        bus.read_rect(x, y, x + width - 1, y + height - 1, buffer)
+        bus.end()
+        return buffer
+
+    def read_pixel(self, x, y):
+        """ Reading of one pixel from the display memory
+        Args
+        x, y (int): Position
+        Return (int): Color RGB565
+        """
+        pixel = self.read_rect(x, y, 1, 1, self.pixel_buffer)
+        return (pixel[0] << 8) | pixel[1]
+
+    def read_display_model(self):
+        """ Reading display model """
+        version, model1, model2 = self.bus.read(0xD3, 3)
+
+        model = (model1 << 8) + model2
+
+        return model
+
+    def read_register(self, cmd, count = 1):
+        """ Reading of display register
+        Args
+        cmd (int): Read command, example: 0x0A
+        count (int): Number of bytes after dummy byte
+        Return (bytearray): Register bytes
+        """
+        return self.bus.read(cmd, count)
+
+    def read_warm_rotation(self):
+        """ Checks display status (0x09), power mode (0x0A) and pixel format (0x0C),
+        whether the display is still configured by a previous run.
+        Return (int): Rotation 0..3 of configured display, -1 if display needs reset and init
+        """
+        status = self.read_register(0x09, 4)
+        power  = self.read_register(0x0A)[0]
+        colmod = self.read_register(0x0C)[0]
+
+        if power == 0xFF: # No answer
+            return -1
+        if not (power & 0x10) or not (power & 0x04): # Sleep In or Display Off
+            return -1
+        if (colmod & 0x07) != (self.pixel_format & 0x07):
+            return -1
+        if ((status[1] >> 4) & 0x07) != (self.pixel_format & 0x07):
+            return -1
+
+        madctl = (status[0] << 1) & 0xFC # D30..D25 of status: MY MX MV ML BGR MH
+        for rotation in range(4):
+            if self.rotation_madctl(rotation) == madctl:
+                return rotation
+        return -1
+
+    @staticmethod
+    def contiguous_shift(data_pins):
+        """ Checks if D0-D7 are on consecutive GPIOs of one bank (example: 2-9 on RP2)
+        Args
+        data_pins (list): Data pins D0, D1, ..., D7
+        Return (int): Bit position of D0 in the output register, -1 if pins are not contiguous
+        """
+        first = data_pins[0]
+        if (first & 31) > 24:
+            return -1
+        for i in range(8):
+            if data_pins[i] != first + i:
+                return -1
+        return first & 31
+
+    @staticmethod
+    def read_controller_name():
+        """ Reading controller name """
+        if ILI9XXX_8B.CONTROLLER_NAME is not None:
+            return ILI9XXX_8B.CONTROLLER_NAME
+
+        from os import uname
+        info = uname()
+        sysname = info.sysname
+
+        controller = 'Undefined'
+        if sysname == 'esp32':
+            if 'ESP32S3' in info.machine:
+                controller = 'ESP32-S3'
+            elif 'ESP32C3' in info.machine:
+                controller = 'ESP32-C3'
+            else:
+                controller = 'ESP32'
+        elif sysname == 'rp2':
+            controller = 'RP2'
+
+        ILI9XXX_8B.CONTROLLER_NAME = controller
+        return controller
+
+    @staticmethod
+    def load_probe_cache(probe_cache):
+        """ Loading of probe results, saved on previous start
+        Args
+        probe_cache (dict or str): Dictionary or json-file name
+        Return (dict): Saved values, empty if nothing saved
+        """
+        if isinstance(probe_cache, dict):
+            return probe_cache
+        try:
+            with open(probe_cache) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def check_probe_cache(cache, pins):
+        """ Cheap validation of saved probe results, without bus access
+        Args
+        cache (dict): Values of load_probe_cache()
+        pins (list): Data pins, CS, DC, WR, RD, RST
+        Return (bool): True if values belong to this board and wiring
+        """
+        from os import uname
+        try:
+            return ( cache['version'] == PROBE_CACHE_VERSION
+                     and cache['machine'] == uname().machine
+                     and cache['pins'] == pins
+                     and cache['display_model'] in ILI9XXX_8B.INIT_TABLES )
+        except (KeyError, TypeError):
+            return False
+
+    def save_probe_cache(self, probe_cache, pins):
+        """ Saving of detected controller, registers and display model.
+        Unknown display model is not saved, it will be detected again on next start.
+        Args
+        probe_cache (dict or str): Dictionary or json-file name
+        pins (list): Data pins, CS, DC, WR, RD, RST
+        """
+        if self.display_model not in self.INIT_TABLES:
+            return
+        from os import uname
+        values = { 'version': PROBE_CACHE_VERSION,
+                   'machine': uname().machine,
+                   'pins': pins,
+                   'controller': self.controller_name,
+                   'gpio_regs': list(self.gpio_regs),
+                   'display_model': self.display_model }
+        if isinstance(probe_cache, dict):
+            probe_cache.clear()
+            probe_cache.update(values)
+            return
+        try:
+            with open(probe_cache, 'w') as f:
+                json.dump(values, f)
+        except OSError:
+            print("Probe cache is not saved:", probe_cache)
+
+    def reinit_pins(self):
+        """ Reinit most important pins.
+        Most often used in combination with another devices.
+        """
+        self.cs.init(Pin.OUT,  value = 1)
+        self.dc.init(Pin.OUT,  value = 1)
+        self.wr.init(Pin.OUT,  value = 0)
+        self.rst.init(Pin.OUT, value = 1)
+        self.rd.init(Pin.OUT,  value = 1)
+
+    def write_command(self, cmd):
+        """ Sending a command to the display
+        Args
+        cmd (int): Command number, example: 0x2E
+        """
+        self.bus.command(cmd)
+
+    def write_data(self, data):
+        """ Sending data to the display
+        Args
+        data (int): Data byte, example: 0xF8
+        """
+        self.data_byte[0] = data
+        self.bus.params(self.data_byte)
+
+    def write_multy_data(self, multy_data):
+        """ Sending array of data bytes to the display
+        Params
+        multy_data (bytearray): Data array, example: bytearray([0x18, 0xA3, 0x2E])
+        """
+        self.bus.params(multy_data)
+
+    def take_rows(self, size):
+        """ Buffer of image loaders, given back by give_rows() and used by next images.
+        While it is taken (async blit of another task), a new buffer is made
+        Args
+        size (int): Bytes needed
+        Return (bytearray): Buffer of size bytes or more
+        """
+        buffer = self.rows_buffer
+        self.rows_buffer = None
+        if buffer is None or len(buffer) < size:
+            buffer = None # Old buffer can be collected before the new one is made
+            buffer = bytearray(size)
+        return buffer
+
+    def give_rows(self, buffer):
+        """ Keeps the buffer of take_rows() for next images, the larger one of two """
+        if self.rows_buffer is None or len(self.rows_buffer) < len(buffer):
+            self.rows_buffer = buffer
+
+    @micropython.viper
+    def set_data_pins(self, value : int):
+        self.db0.value( value & 1 )
+        self.db1.value((value >> 1) & 1)
+        self.db2.value((value >> 2) & 1)
+        self.db3.value((value >> 3) & 1)
+        self.db4.value((value >> 4) & 1)
+        self.db5.value((value >> 5) & 1)
+        self.db6.value((value >> 6) & 1)
+        self.db7.value((value >> 7) & 1)
+
+
+    @micropython.viper
+    def update_byte2gpio(self):
+        """ Generate to memory all 256 states of data gpio
+        Return (bytearray): All 256 x 32-bit states """
+
+        # Base setting before making register snapshot
+        self.cs.value(0)
+        self.dc.value(1)
+        self.wr.value(0)
+        self.set_data_pins(0)
+
+        if self.dual_bank:
+            self.update_byte2gpio_dual()
+            return
+
+        # Getting current state of gpio registers (snapshot)
+        gpio_out_ptr = ptr32(int(self.GPIO_OUT_REG))
+        empty_mask = gpio_out_ptr[0]
+        
+        #print(empty_mask, int(self.gpio_state))
+        if empty_mask == int(self.gpio_state):
+            return
+        #print('update')
+        self.gpio_state = empty_mask
+        
+        self.cs.value(1) # Deselect device
+
+        # Data pins cashing
+        dpins = self.data_pins
+        p0 = int(dpins[0]) & 31
+        p1 = int(dpins[1]) & 31
+        p2 = int(dpins[2]) & 31
+        p3 = int(dpins[3]) & 31
+        p4 = int(dpins[4]) & 31
+        p5 = int(dpins[5]) & 31
+        p6 = int(dpins[6]) & 31
+        p7 = int(dpins[7]) & 31
+
+        # Getting 32-bit access to gpio bytearray
+        buffer = ptr32(self.BYTE2GPIO)
+
+        # Generating of all 256 states
+        for byte in range(256):
+            # Convert byte to gpio setting
+            bit_gpio  = ((byte & 1) << p0)
+            bit_gpio |= (((byte >> 1) & 1) << p1)
+            bit_gpio |= (((byte >> 2) & 1) << p2)
+            bit_gpio |= (((byte >> 3) & 1) << p3)
+            bit_gpio |= (((byte >> 4) & 1) << p4)
+            bit_gpio |= (((byte >> 5) & 1) << p5)
+            bit_gpio |= (((byte >> 6) & 1) << p6)
+            bit_gpio |= (((byte >> 7) & 1) << p7)
+
+            # Saving state in memory
+            buffer[ byte ] = bit_gpio | empty_mask
+
+        self.cs.value(0) # Select again: CS in other bank is not in the snapshot
+
+    @micropython.viper
+    def update_byte2gpio_dual(self):
+        """ Generate all 256 states of data gpio for the bus split between banks:
+        BYTE2GPIO for GPIO0-31, BYTE2GPIO1 for GPIO32-48.
+        CS, DC, WR and data pins must be set before (see update_byte2gpio).
+        """
+        empty_mask  = ptr32(int(self.GPIO_OUT_REG))[0]
+        empty_mask1 = ptr32(int(self.GPIO_OUT1_REG))[0]
+
+        if empty_mask == int(self.gpio_state) and empty_mask1 == int(self.gpio_state1):
+            return
+        self.gpio_state = empty_mask
+        self.gpio_state1 = empty_mask1
+
+        pins    = ptr8(self.data_pin_numbers)
+        buffer  = ptr32(self.BYTE2GPIO)
+        buffer1 = ptr32(self.BYTE2GPIO1)
+
+        for byte in range(256):
+            bit_gpio  = 0
+            bit_gpio1 = 0
+            for i in range(8):
+                if (byte >> i) & 1:
+                    pin = pins[i]
+                    if pin > 31:
+                        bit_gpio1 |= 1 << (pin - 32)
+                    else:
+                        bit_gpio |= 1 << pin
+
+            buffer[ byte ]  = bit_gpio | empty_mask
+            buffer1[ byte ] = bit_gpio1 | empty_mask1
+
+    @micropython.viper
+    def update_byte2set_clr(self):
+        """ Generate set and clear masks of all 256 bytes for the safe bus.
+        Clear mask includes WR bit: data zeros and WR low are written together.
+        """
+        dpins = self.data_pins
+        set_buffer = ptr32(self.BYTE2SET)
+        clr_buffer = ptr32(self.BYTE2CLR)
+
+        data_mask = 0
+        for i in range(8):
+            data_mask |= 1 << (int(dpins[i]) & 31)
+        wr_bit = int(self.wr_bit)
+
+        for byte in range(256):
+            bit_gpio = 0
+            for i in range(8):
+                bit_gpio |= ((byte >> i) & 1) << (int(dpins[i]) & 31)
+
+            set_buffer[ byte ] = bit_gpio
+            clr_buffer[ byte ] = (data_mask ^ bit_gpio) | wr_bit
+
+    def bus_begin(self):
+        """ Prepares the bus for fast writing: selects the display in data mode.
+        Safe bus needs no register snapshot, otherwise BYTE2GPIO is updated.
+        """
+        if self.safe_bus:
+            self.cs.value(0)
+            self.dc.value(1)
+        else:
+            self.update_byte2gpio()
+
+    def memory_access_control(self, my = 0, mx = 0, mv = 0, ml = 0, bgr = 0, mh = 0):
+        """ MADCTL. This command defines read/write scanning direction of frame memory. """
+        self.write_command(0x36)
+        data =  0
+        data += mh << 2 # Horizontal order
+        data += bgr<< 3 # RGB-BGR Order: 0 - RGB, 1 - BGR
+        data += ml << 4 # Vertical refresh order
+        data += mv << 5 # Row/Column exchange
+        data += mx << 6 # Column address order
+        data += my << 7 # Row address order
+        #print(data)
+        self.write_data(data)
+
+    def rotation_madctl(self, rotation):
+        """ MADCTL value of rotation for the display model
+        Args
+        rotation (int): 0..3
+        Return (int): MY MX MV ML BGR MH bits
+        """
+        if self.display_model == 0x9486:
+            return self.MADCTL_9486[rotation]
+        return self.MADCTL[rotation]
+
+    def set_rotation(self, rotation = 0):
+        """ Set orientation of display
+        Params
+        rotation (int):  0 = 0 degree, 1 = 90 degrees, 2 = 180 degrees, 3 = 270 degrees
+        """
+        if rotation > 3 or rotation < 0:
+            print("Incorrect rotation value")
+            return False
+
+        old_rotation = self.rotation
+        self.rotation = rotation
+
+        self.write_command(0x36)
+        self.write_data(self.rotation_madctl(rotation))
+
+        # Change height <-> width for 90 and 270 degrees
+        if (( rotation & 1) and not (old_rotation & 1)
+            or not ( rotation & 1) and (old_rotation & 1) ):
+            
+            self.swap_dimensions()
+
+    def invert_display(self, on = True):
+        """ Enables or disables color inversion on the display.
+        Args
+        on (bool): True = Enable inversion, False = Disable inversion
+        """
+        if on:
+            self.write_command(0x21)
+        else:
+            self.write_command(0x20)
+
+    def tearing_effect(self, on = True):
+        """ Activate "Tearing effect"
+        Args
+        on (bool): True = Enable effect, False = Disable effect
+        """
+        if bool(on):
+            self.write_command(0x35)
+            self.write_data(0x00) # TE pulse on vertical blanking only
+        else:
+            self.write_command(0x34)
+
+    def init_vsync(self, te_pin):
+        """ Turns on TE output and counts its pulses (IRQ), see wait_vsync() and scanline()
+        Args
+        te_pin (int): TE pin number
+        """
+        self.te = Pin(te_pin, Pin.IN)
+        self.tearing_effect(True)
+        self.te.irq(self.on_vsync, Pin.IRQ_RISING)
+
+    def on_vsync(self, pin):
+        """ IRQ of TE pin: the display starts vertical blanking """
+        now = ticks_us()
+        if self.vsync_count:
+            self.frame_us = ticks_diff(now, self.vsync_ticks)
+        self.vsync_ticks = now
+        self.vsync_count = (self.vsync_count + 1) & 0x3FFFFFFF # Small int, no allocation in IRQ
+
+    def wait_vsync(self, timeout_ms = 100):
+        """ Waits for the next TE pulse: refresh of the display starts from the first row
+        Args
+        timeout_ms (int): Longest wait
+        Return (bool): True - pulse came, False - no TE pin or timeout
+        """
+        if self.te is None:
+            return False
+        count = self.vsync_count
+        start = ticks_ms()
+        while self.vsync_count == count:
+            if ticks_diff(ticks_ms(), start) > timeout_ms:
+                return False
+        return True
+
+    def scanline(self):
+        """ Row of the display refreshed now, estimated by time since the last TE pulse
+        Return (int): Row of the panel (in refresh order, see native_rows()), -1 - unknown
+        """
+        if not self.frame_us:
+            return -1
+        rows = max(self.width, self.height)
+        return ticks_diff(ticks_us(), self.vsync_ticks) * rows // self.frame_us % rows
+
+    def native_rows(self, x0, y0, x1, y1):
+        """ Rows of the panel (in refresh order) covered by a rectangle of the screen
+        Args
+        x0, y0 (int): Start position
+        x1, y1 (int): End position (included)
+        Return (tuple): First and last row
+        """
+        madctl = self.rotation_madctl(self.rotation)
+        if madctl & 0x20: # MV: columns of the screen are rows of the panel
+            y0, y1 = x0, x1
+        if madctl & 0x80: # MY: bottom-up
+            rows = max(self.width, self.height)
+            return rows - 1 - y1, rows - 1 - y0
+        return y0, y1
+
+    def set_frame_rate(self, fps):
+        """ Refresh rate of the panel, Frame Rate Control (0xB1) of ILI9341.
+        Refresh not faster than push of a frame keeps the push ahead of the scanline (no tearing)
+        Args
+        fps (int): Frames per second, 8-119
+        Return (int): Set refresh rate, 0 - not supported by the display model
+        """
+        if self.display_model != 0x9341:
+            print('Frame rate control is supported by ILI9341 only')
+            return 0
+
+        # Frame rate = 615 kHz / (RTNA clocks per line * 324 lines * DIVA)
+        lines = 324
+        diva = 0
+        rtna = (615000 + lines * fps // 2) // (lines * fps)
+        while rtna > 31 and diva < 3:
+            diva += 1
+            rtna = ((615000 >> diva) + lines * fps // 2) // (lines * fps)
+        rtna = min(max(rtna, 16), 31)
+
+        self.write_command(0xB1)
+        self.write_data(diva)
+        self.write_data(rtna)
+        return (615000 >> diva) // (lines * rtna)
+
+    def idle_mode(self, on = True):
+        """ Enables or disables idle mode on the display.
+        Args
+        on (bool): True = Enable idle mode, False = Disable idle mode
+        """
+        if on:
+            self.write_command(0x39)
+        else:
+            self.write_command(0x38)
+
+    def set_adaptive_brightness(self, mode = 0):
+        """ Set adaptive brightness
+        Args
+        mode (int):
+            0 - CABC OFF
+            1 - User Interface Image
+            2 - Still Picture
+            3 - Moving Image
+        """
+        if 0 <= mode < 4:
+            self.write_command(0x55)
+            self.write_data(mode)
+
+        else:
+            print('Error mode in def set_adaptive_brightness')
+            print(mode)
+
+    def vert_scroll(self, top_fix: int, scroll_height: int, bot_fix: int):
+        """ Vertical scroll settings
+        Args
+        top_fix (int): Top fixed rows
+        scroll_height (int): Scrolling height rows
+        bot_fix (int): Bottom fixed rows
+
+        top_fix + bot_fix + scroll_height - must be  equal height of screen
+        """
+        screen_height = self.height
+        if self.rotation & 1:
+            screen_height = self.width
+
+        total_height = top_fix + bot_fix + scroll_height
+
+        if total_height == screen_height:
+            self.write_command(0x33)
+            #Top fixed rows
+            self.write_data((top_fix >> 8) & 0xFF)
+            self.write_data(top_fix & 0xFF)
+            #Scrolling height rows
+            self.write_data((scroll_height >> 8) & 0xFF)
+            self.write_data(scroll_height & 0xFF)
+            #Bottom fixed rows
+            self.write_data((bot_fix >> 8) & 0xFF)
+            self.write_data(bot_fix & 0xFF)
+
+        else:
+            print('Incorrect sum in vertical scroll ', sum, ' <> ', screen_height)
+
+    def vert_scroll_start_address(self, start = 0):
+        """ Set vertical scroll start address, and run scrolling
+        Args
+        start (int): start row
+        """
+        self.write_command(0x37)
+        self.write_data((start >> 8) & 0xFF)
+        self.write_data(start & 0xFF)
+
+    def scroll(self, delay = 5):
+        """ Scrolling on the screen at a given speed.
+        Args
+        delay (int): Delay between scrolling actions
+        """
+        height = self.height
+        if self.rotation & 1:
+            height = self.width
+
+        for y in range(height):
+            self.vert_scroll_start_address(y + 1)
+            sleep_ms(delay)
+
+    PROFILE_OPS = ('set_window', 'show', 'fill', 'fill_rect', 'draw_text', 'draw_bitmap',
+                   'draw_raw_image', 'draw_bmp', 'update_byte2gpio')
+
+    def profiler(self, on = True, ops = PROFILE_OPS):
+        """ Counts calls, time and pixel bytes of drawing operations, see dump().
+        Methods are wrapped on the display object only while the profiler is on,
+        off - wrappers are removed, methods wrapped before (TRACE) get their previous wrappers back.
+        Args
+        on (bool): True = Start counting (counters are cleared), False = Stop
+        ops (tuple): Method names, missing methods are skipped
+        """
+        if self.profile_stats is not None:
+            for target, name, previous in self.profile_saved:
+                delattr(target, name)
+                if getattr(target, name) != previous: # Wrapper on the object, not the class method
+                    setattr(target, name, previous)
+            self.profile_saved = None
+            self.profile_stats = None
+        if not on:
+            return
+
+        self.profile_stats = {}
+        self.profile_saved = [] # Wrapped object (display or its bus at the start), name, previous method
+        self.profile_bytes = 0
+        self.profile_windows = 0
+        self.profile_counted = True # Bytes of the window of the bus are counted by set_window()
+        self.profile_pixel = 3 if self.pixel_format in (0x66, 0x77) else 2
+        for name in ops:
+            method = getattr(self, name, None)
+            if method is not None:
+                self.profile_stats[name] = [0, 0, 0, 0, 0] # Calls, total us, max us, bytes, last us
+                self.profile_saved.append((self, name, method))
+                setattr(self, name, self.profile_wrap(name, method))
+
+        # Backends without set_window() of the display (PIO) open windows of show() by commands
+        bus = self.bus
+        window = bus.window
+        def bus_window(x0, y0, x1, y1):
+            self.profile_counted = False
+            window(x0, y0, x1, y1)
+            if not self.profile_counted:
+                self.profile_bytes += (x1 - x0 + 1) * (y1 - y0 + 1) * self.profile_pixel
+                self.profile_windows += 1
+                self.profile_counted = True
+        self.profile_saved.append((bus, 'window', window))
+        bus.window = bus_window
+
+    def profile_wrap(self, name, method):
+        """ Wrapper of a method for profiler()
+        Return (function): Method with counting
+        """
+        stat = self.profile_stats[name]
+        is_window = name == 'set_window'
+        def wrapper(*args, **kwargs):
+            start_bytes = self.profile_bytes
+            if is_window:
+                self.profile_bytes += (args[2] - args[0] + 1) * (args[3] - args[1] + 1) * self.profile_pixel
+                self.profile_windows += 1
+                self.profile_counted = True
+            start = ticks_us()
+            result = method(*args, **kwargs)
+            time_us = ticks_diff(ticks_us(), start)
+            stat[0] += 1
+            stat[1] += time_us
+            if time_us > stat[2]:
+                stat[2] = time_us
+            stat[3] += self.profile_bytes - start_bytes
+            stat[4] = time_us
+            return result
+        return wrapper
+
+    def dump(self):
+        """ Prints counters of profiler(), the longest total time first.
+        Time and bytes of an operation include nested calls (fill -> fill_rect -> set_window),
+        bytes are pixel bytes of opened windows """
+        if not self.profile_stats:
+            print('Profiler is off, call profiler(True)')
+            return
+        print('Operation           calls   total ms  avg us   max us      bytes')
+        for name, stat in sorted(self.profile_stats.items(), key = lambda item: -item[1][1]):
+            calls, total, longest, size = stat[:4]
+            if calls:
+                print('{:18} {:6} {:10} {:7} {:8} {:10}'.format(name, calls, total // 1000, total // calls, longest, size))
+
+    @micropython.viper
+    def set_window(self, x0:int, y0:int, x1:int, y1:int):
+        """ Sets the starting position and the area of drawing on the display
+        Args
+        x0 (int): Start X position  ________
+        y0 (int): Start Y position  |s---> |
+        x1 (int): End X position    ||     |
+        y1 (int): End Y position    |v____e|
+        """
+        if self.safe_bus:
+            self.set_window_safe(x0, y0, x1, y1)
+            return
+        if self.dual_bank:
+            self.set_window_dual(x0, y0, x1, y1)
+            return
+        if int(self.data_shift) >= 0:
+            self.set_window_shift(x0, y0, x1, y1)
+            return
+
+        dc_bit = int(self.dc_bit)
+        wr_bit = int(self.wr_bit)
+
+        byte2gpio = ptr32(self.BYTE2GPIO)
+
+        #Getting pointers to registers
+        GPIO_OUT   = ptr32(self.GPIO_OUT_REG)  # 0 - 31  pins
+        GPIO_OUT_S = ptr32(self.GPIO_OUT_SET) # + bit
+
+        # Column address sending
+        GPIO_OUT[0] = byte2gpio[0x2A] - dc_bit
+        GPIO_OUT_S[0] = wr_bit
+
+        # Sending Start and End X coordinates
+        GPIO_OUT[0] = byte2gpio[(x0 >> 8) & 0xFF] # x hi
+        GPIO_OUT_S[0] = wr_bit
+        GPIO_OUT[0] = byte2gpio[x0 & 0xFF] # x low
+        GPIO_OUT_S[0] = wr_bit
+
+        GPIO_OUT[0] = byte2gpio[(x1 >> 8) & 0xFF] # x end hi
+        GPIO_OUT_S[0] = wr_bit
+        GPIO_OUT[0] = byte2gpio[x1 & 0xFF] # x end low
+        GPIO_OUT_S[0] = wr_bit
+
+        # Page address sending
+        GPIO_OUT[0] = byte2gpio[0x2B] - dc_bit
+        GPIO_OUT_S[0] = wr_bit
+
+        # Sending Start and End Y coordinates
+        GPIO_OUT[0] = byte2gpio[(y0 >> 8) & 0xFF] # y hi
+        GPIO_OUT_S[0] = wr_bit
+        GPIO_OUT[0] = byte2gpio[y0 & 0xFF] # y low
+        GPIO_OUT_S[0] = wr_bit
+
+        GPIO_OUT[0] = byte2gpio[(y1 >> 8) & 0xFF] # y end hi
+        GPIO_OUT_S[0] = wr_bit
+        GPIO_OUT[0] = byte2gpio[y1 & 0xFF] # y end low
+        GPIO_OUT_S[0] = wr_bit
+
+        # Memory write for addresses
+        GPIO_OUT[0] = byte2gpio[0x2C] - dc_bit
+        GPIO_OUT_S[0] = wr_bit
+
+    @micropython.viper
+    def set_window_safe(self, x0:int, y0:int, x1:int, y1:int):
+        """ set_window() for the safe bus, only display pins are changed
+        Args
+        x0, y0 (int): Start position
+        x1, y1 (int): End position
+        """
+        dc_bit = int(self.dc_bit)
+        wr_bit = int(self.wr_bit)
+
+        byte2set = ptr32(self.BYTE2SET)
+        byte2clr = ptr32(self.BYTE2CLR)
+
+        GPIO_OUT_S = ptr32(self.GPIO_OUT_SET) # + bit
+        GPIO_OUT_C = ptr32(self.GPIO_OUT_CLR) # - bit
+
+        start = x0
+        end = x1
+        cmd = 0x2A # Column address, then Page address and Memory write
+        while True:
+            GPIO_OUT_C[0] = byte2clr[cmd] | dc_bit # Command mode
+            GPIO_OUT_S[0] = byte2set[cmd]
+            GPIO_OUT_S[0] = wr_bit
+            GPIO_OUT_S[0] = dc_bit
+            if cmd == 0x2C:
+                break
+
+            # Start and End coordinates: hi, low
+            i = 0
+            while i < 4:
+                value = start if i < 2 else end
+                if not (i & 1):
+                    value >>= 8
+                value &= 0xFF
+                GPIO_OUT_C[0] = byte2clr[value]
+                GPIO_OUT_S[0] = byte2set[value]
+                GPIO_OUT_S[0] = wr_bit
+                i += 1
+
+            start = y0
+            end = y1
+            cmd += 1
+
+    @micropython.viper
+    def set_window_dual(self, x0:int, y0:int, x1:int, y1:int):
+        """ set_window() for the bus split between GPIO0-31 and GPIO32-48
+        Args
+        x0, y0 (int): Start position
+        x1, y1 (int): End position
+        """
+        dc_bit0 = int(self.dc_bit0)
+        dc_bit1 = int(self.dc_bit1)
+        wr_bit = int(self.wr_bit)
+
+        byte2gpio  = ptr32(self.BYTE2GPIO)
+        byte2gpio1 = ptr32(self.BYTE2GPIO1)
+
+        GPIO_OUT  = ptr32(self.GPIO_OUT_REG)  # 0 - 31 pins
+        GPIO_OUT1 = ptr32(self.GPIO_OUT1_REG) # 32 - 48 pins
+        GPIO_WR_S = ptr32(self.GPIO_WR_SET)   # + WR bit
+
+        start = x0
+        end = x1
+        cmd = 0x2A # Column address, then Page address and Memory write
+        while True:
+            GPIO_OUT[0] = byte2gpio[cmd] - dc_bit0 # Command mode
+            GPIO_OUT1[0] = byte2gpio1[cmd] - dc_bit1
+            GPIO_WR_S[0] = wr_bit
+            if cmd == 0x2C:
+                break
+
+            # Start and End coordinates: hi, low
+            i = 0
+            while i < 4:
+                value = start if i < 2 else end
+                if not (i & 1):
+                    value >>= 8
+                value &= 0xFF
+                GPIO_OUT[0] = byte2gpio[value]
+                GPIO_OUT1[0] = byte2gpio1[value]
+                GPIO_WR_S[0] = wr_bit
+                i += 1
+
+            start = y0
+            end = y1
+            cmd += 1
+
+    @micropython.viper
+    def set_window_shift(self, x0:int, y0:int, x1:int, y1:int):
+        """ set_window() for contiguous data pins, without BYTE2GPIO lookup
+        Args
+        x0, y0 (int): Start position
+        x1, y1 (int): End position
+        """
+        dc_bit = int(self.dc_bit)
+        wr_bit = int(self.wr_bit)
+        shift  = int(self.data_shift)
+        base   = ptr32(self.BYTE2GPIO)[0] # Register snapshot with data pins low
+
+        GPIO_OUT   = ptr32(self.GPIO_OUT_REG)  # 0 - 31  pins
+        GPIO_OUT_S = ptr32(self.GPIO_OUT_SET) # + bit
+
+        start = x0
+        end = x1
+        cmd = 0x2A # Column address, then Page address and Memory write
+        while True:
+            GPIO_OUT[0] = (base | (cmd << shift)) - dc_bit # Command mode
+            GPIO_OUT_S[0] = wr_bit
+            if cmd == 0x2C:
+                break
+
+            # Start and End coordinates: hi, low
+            GPIO_OUT[0] = base | (((start >> 8) & 0xFF) << shift)
+            GPIO_OUT_S[0] = wr_bit
+            GPIO_OUT[0] = base | ((start & 0xFF) << shift)
+            GPIO_OUT_S[0] = wr_bit
+            GPIO_OUT[0] = base | (((end >> 8) & 0xFF) << shift)
+            GPIO_OUT_S[0] = wr_bit
+            GPIO_OUT[0] = base | ((end & 0xFF) << shift)
+            GPIO_OUT_S[0] = wr_bit
+
+            start = y0
+            end = y1
+            cmd += 1
@@ -1,5 +1,5 @@
 """
-ILI9XXX_8B_DIRECT display-shield v 0.2.2
+ILI9XXX_8B_DIRECT display-shield v 0.2.10
 
 Displays: ILI9341, ILI9486, ILI9488
 Connection: 8-bit Data Bus
@@ -17,11 +17,44 @@ from tft_draw.draw_8b_c16 import DRAW_8B_C16 as DRAW_8B
 #from tft_draw.draw_8b_c18 import DRAW_8B_C18 as DRAW_8B
 #from tft_draw.draw_8b_c24 import DRAW_8B_C24 as DRAW_8B
 from time import sleep_ms
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+@micropython.viper
+def bgr_to_rgb565(src, dst, start:int, count:int):
+    """ count pixels of BMP row (B, G, R) to RGB565 bytes (high byte first) from pixel start of dst """
+    s = ptr8(src)
+    d = ptr8(dst)
+    i = 0
+    while i < count:
+        b = s[i * 3]
+        g = s[i * 3 + 1]
+        r = s[i * 3 + 2]
+        pos = (start + i) << 1
+        d[pos] = (r & 0xF8) | (g >> 5)
+        d[pos + 1] = ((g << 3) & 0xE0) | (b >> 3)
+        i += 1
+
+@micropython.viper
+def bgr_to_rgb888(src, dst, start:int, count:int):
+    """ count pixels of BMP row (B, G, R) to R, G, B bytes from pixel start of dst """
+    s = ptr8(src)
+    d = ptr8(dst)
+    i = 0
+    while i < count:
+        pos = (start + i) * 3
+        d[pos] = s[i * 3 + 2]
+        d[pos + 1] = s[i * 3 + 1]
+        d[pos + 2] = s[i * 3]
+        i += 1
 
 class ILI9XXX_8B_DIRECT( ILI9XXX_8B, DRAW_8B ):
     
     def __init__( self, data_pins, cs_pin, dc_pin, wr_pin, rd_pin, rst_pin,
-                  width = 0, height = 0, display_model = 0 ):
+                  width = 0, height = 0, display_model = 0, warm_start = False,
+                  probe_cache = None, safe_bus = False, bus = None, te_pin = None ):
         """ Constructor
         Args
         data_pins (list): List of data bus pin numbers (D0, D1, ..., D7), example: [12, 13, 26, 25, 17, 16, 27, 14]
@@ -33,10 +66,96 @@ class ILI9XXX_8B_DIRECT( ILI9XXX_8B, DRAW_8B ):
         width   (int): Screen width in pixels (less)
         height  (int): Screen height in pixels
         display_model (hex): 0x9341, 0x9486 or 0x9488
+        warm_start (bool): Keep settings and picture of already configured display
+        probe_cache (dict or str): Dictionary or json-file name for detected controller and display model
+        safe_bus (bool): Display settings and windows don't touch other pins of the port
+        bus (class): Bus backend (see ili9xxx_bus.py), None - fastest available
+        te_pin (int): TE pin number (Tearing effect output of the display), enables wait_vsync()
         """
         
         super().__init__( data_pins, cs_pin, dc_pin, wr_pin, rd_pin, rst_pin,
-                         width, height, DRAW_8B.BITS_PER_PIXEL, display_model )
+                         width, height, DRAW_8B.BITS_PER_PIXEL, display_model, warm_start,
+                         probe_cache, safe_bus, bus, te_pin )
 
         DRAW_8B.__init__( self, self.width, self.height )
+
+        if self.dual_bank:
+            print('Direct drawing needs data, DC and WR pins in one bank: GPIO0-31 or GPIO32-48')
         
+
+    # Blits for asyncio: the image is sent by slices of rows, other tasks run between them
+
+    async def draw_raw_image_async(self, filename, x, y, width, height, rows_per_slice = 16):
+        """ Draws raw image (pixels as they are sent to the display: 2 bytes for 16-bit colors, 3 bytes for 18/24-bit)
+        Args
+        filename (string): File name
+        x, y (int): Position
+        width, height (int): Size of the image
+        rows_per_slice (int): Rows sent between awaits: more - faster, less - shorter pauses of other tasks
+        """
+        row_size = width * (2 if DRAW_8B.BITS_PER_PIXEL == 16 else 3)
+        slice_size = row_size * rows_per_slice
+        buffer = self.take_rows(slice_size)
+        data = memoryview(buffer)[:slice_size]
+        bus = self.bus
+
+        with open(filename, 'rb') as f:
+            for top in range(0, height, rows_per_slice):
+                rows = min(rows_per_slice, height - top)
+                f.readinto(data if rows == rows_per_slice else data[:rows * row_size])
+
+                # Own window for every slice: other tasks can use the display between slices
+                bus.begin()
+                bus.window(x, y + top, x + width - 1, y + top + rows - 1)
+                bus.push(buffer, 0, rows * row_size)
+                bus.end()
+                await asyncio.sleep(0)
+        self.give_rows(buffer)
+
+    async def draw_bmp_async(self, filename, x, y, rows_per_slice = 16):
+        """ Draws 24-bit BMP image
+        Args
+        filename (string): File name
+        x, y (int): Position
+        rows_per_slice (int): Rows sent between awaits: more - faster, less - shorter pauses of other tasks
+        """
+        with open(filename, 'rb') as f:
+            header = f.read(54)
+            if header[0:2] != b'BM' or header[28] != 24 or header[30] != 0:
+                print("Only uncompressed 24-bit BMP is supported")
+                return
+            offset = int.from_bytes(header[10:14], 'little')
+            width = int.from_bytes(header[18:22], 'little')
+            height = int.from_bytes(header[22:26], 'little')
+            bottom_up = height < 0x80000000
+            if not bottom_up:
+                height = 0x100000000 - height
+
+            stride = (width * 3 + 3) & ~3 # Rows are aligned to 4 bytes
+            if DRAW_8B.BITS_PER_PIXEL == 16:
+                convert = bgr_to_rgb565
+                row_size = width * 2
+            else:
+                convert = bgr_to_rgb888
+                row_size = width * 3
+            # Line of the file and converted rows in one buffer, kept for next images
+            rows_buffer = self.take_rows(stride + row_size * rows_per_slice)
+            data = memoryview(rows_buffer)
+            line = data[:stride]
+            buffer = data[stride:]
+            bus = self.bus
+
+            for top in range(0, height, rows_per_slice):
+                rows = min(rows_per_slice, height - top)
+                for i in range(rows):
+                    row = top + i
+                    f.seek(offset + (height - 1 - row if bottom_up else row) * stride)
+                    f.readinto(line)
+                    convert(line, buffer, i * width, width)
+
+                bus.begin()
+                bus.window(x, y + top, x + width - 1, y + top + rows - 1)
+                bus.push(buffer, 0, rows * row_size)
+                bus.end()
+                await asyncio.sleep(0)
+            self.give_rows(rows_buffer)
@@ -1,25 +1,49 @@
 """
-ILI9XXX_8B_FB display-shield v 0.2.2
+ILI9XXX_8B_FB display-shield v 0.3.11
 
 Displays: ILI9341, ILI9486, ILI9488
 Connection: 8-bit Data Bus
 Colors: 16-bit, 18-bit, 24-bit
+Buffer: RGB565, 256 or 16 colors palette, whole screen or strip (banded mode), double buffer
 Controllers: Esp32, Esp32-S3, Raspberry Pi Pico
 DRAW: Framebuffer
 
 Project path: https://github.com/r2d2-arduino/micropython_ili9488_9486_9341_shields
 MIT License
 
-Author: Arthur Derkach 
+Author: Arthur Derkach
 """
 from ili9xxx_8b import ILI9XXX_8B
 from tft_draw.draw_fb_c16 import DRAW_FB_C16 as DRAW_FB
-from time import sleep_ms
+from time import sleep_ms, sleep_us, ticks_us, ticks_diff, ticks_add
+import framebuf
+import struct
+try:
+    from ili9xxx_bus_rp2 import PIO_BUS # Raspberry Pi Pico only
+except ImportError:
+    PIO_BUS = None
+try:
+    import _thread
+except ImportError:
+    _thread = None
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
 
 class ILI9XXX_8B_FB( ILI9XXX_8B, DRAW_FB ):
-    
+
+    MAX_DIRTY_RECTS = const(8) # More damaged regions are merged into one
+
+    # Default palette of 4-bit buffer: 16 colors of VGA
+    PALETTE16 = ( (0, 0, 0), (0, 0, 128), (0, 128, 0), (0, 128, 128), (128, 0, 0), (128, 0, 128),
+                  (128, 128, 0), (192, 192, 192), (128, 128, 128), (0, 0, 255), (0, 255, 0),
+                  (0, 255, 255), (255, 0, 0), (255, 0, 255), (255, 255, 0), (255, 255, 255) )
+
     def __init__( self, data_pins, cs_pin, dc_pin, wr_pin, rd_pin, rst_pin,
-                  width = 0, height = 0, display_model = 0 ):
+                  width = 0, height = 0, display_model = 0, warm_start = False,
+                  probe_cache = None, safe_bus = False, bus = None, buffer_bits = 16, band_height = 0,
+                  double_buffer = False, te_pin = None ):
         """ Constructor
         Args
         data_pins (list): List of data bus pin numbers (D0, D1, ..., D7), example: [12, 13, 26, 25, 17, 16, 27, 14]
@@ -30,38 +54,738 @@ class ILI9XXX_8B_FB( ILI9XXX_8B, DRAW_FB ):
         rst_pin (int): RST pin number (Reset)
         width   (int): Screen width in pixels (less)
         height  (int): Screen height in pixels
-        display_model (hex): 0x9341, 0x9486 or 0x9488     
+        display_model (hex): 0x9341, 0x9486 or 0x9488
+        warm_start (bool): Keep settings and picture of already configured display
+        probe_cache (dict or str): Dictionary or json-file name for detected controller and display model
+        safe_bus (bool): Other pins of the port are not touched by show()
+        bus (class): Bus backend (see ili9xxx_bus.py), None - fastest available (PIO_BUS on RP2)
+        buffer_bits (int): Bits per pixel of the buffer: 16 - RGB565, 8 - 256 colors palette, 4 - 16 colors palette
+        band_height (int): Rows of strip buffer for banded mode, example: 32. 0 - buffer of the whole screen
+        double_buffer (bool): show() passes the buffer to push thread and drawing goes on in the second buffer
+        te_pin (int): TE pin number (Tearing effect output of the display), enables show(vsync = True)
         """
+        if buffer_bits not in (16, 8, 4):
+            raise ValueError("buffer_bits must be 16, 8 or 4")
+        if double_buffer and (band_height or _thread is None):
+            raise ValueError("double_buffer needs _thread and buffer of the whole screen")
 
         super().__init__( data_pins, cs_pin, dc_pin, wr_pin, rd_pin, rst_pin,
-                         width, height, DRAW_FB.BITS_PER_PIXEL, display_model )
-
-        DRAW_FB.__init__( self, self.width, self.height )
-   
-    @micropython.viper
-    def show(self):
-        ''' Displays the contents of the buffer on the screen '''
-        self.update_byte2gpio()
-        
-        self.set_window(0, 0, int(self.width) - 1, int(self.height) - 1)
-        
-        wr_bit     = int(self.wr_bit)
-
-        buffsize   = int(self.buffsize)
-        buffer     = ptr8(self.buffer) 
-        byte2gpio  = ptr32(self.BYTE2GPIO)   
-        GPIO_OUT   = ptr32(self.GPIO_OUT_REG)
-        GPIO_OUT_S = ptr32(self.GPIO_OUT_SET)
-        
-        buffsize = buffsize // 2
-        
-        pos = 0
-        while pos < buffsize:
-            GPIO_OUT[0] = byte2gpio[ buffer[ pos * 2  ] ]
-            GPIO_OUT_S[0] = wr_bit
-            
-            GPIO_OUT[0] = byte2gpio[ buffer[ pos * 2 + 1 ] ]
-            GPIO_OUT_S[0] = wr_bit
-            pos += 1             
-        
-        self.cs.value(1)
\ No newline at end of file
+                         width, height, DRAW_FB.BITS_PER_PIXEL, display_model, warm_start,
+                         probe_cache, safe_bus, bus, te_pin )
+
+        self._text_font = None
+        self._text_widths = bytearray(96) # Widths of ASCII characters of the font, 0 - not known yet
+        self.dirty_rects = [] # Damaged regions [x0, y0, x1, y1], waiting for show()
+        self.rect_pool = []   # Regions of previous frames, used again by mark_dirty()
+        self.band_rects = []  # Regions of drawing calls replayed into a strip, they are not kept
+        self.spare_rects = [] # Takes new regions while show_async() sends the others
+        self.buffer_bits = buffer_bits
+        self.band_height = band_height
+        self.palette = None # RGB565 colors of indexes, 2 bytes each (as in RGB565 buffer)
+        self.display_list = None # Recorded drawing calls of banded mode
+        self.back_buffer = None  # Buffer sent by push thread in double buffer mode
+        self.sending = False     # show() can still send the buffer in background (PIO_BUS), next drawing waits once
+        self.buffer_format = None # Set if the buffer is made by init_buffer()
+        self.pixel_ns = 0 # Push time of a pixel, measured by show(vsync = True)
+        if buffer_bits == 16 and not band_height and not double_buffer:
+            DRAW_FB.__init__( self, self.width, self.height )
+        else:
+            self.init_buffer( buffer_bits, band_height )
+        if double_buffer:
+            self.init_double_buffer()
+
+        if self.warm_started:
+            self.dirty_rects.clear() # Picture on the display is kept
+        else:
+            self.mark_dirty(0, 0, self.width, self.height)
+
+    def init_buffer(self, bits, band_height):
+        """ Buffer of palette indexes: 8 bits (GS8) or 4 bits (GS4_HMSB) per pixel, and/or strip buffer of banded mode.
+        Default palette: RGB332 for 8 bits, VGA colors (PALETTE16) for 4 bits
+        Args
+        bits (int): 16, 8 or 4
+        band_height (int): Rows of strip buffer, 0 - whole screen
+        """
+        self.buffer_format = framebuf.RGB565 if bits == 16 else framebuf.GS8 if bits == 8 else framebuf.GS4_HMSB
+        if band_height:
+            # Strip fits both orientations
+            self.buffer_height = band_height
+            self.buffsize = max(self.width, self.height) * band_height * bits // 8
+            self.display_list = []
+        else:
+            self.buffer_height = self.height
+            self.buffsize = self.width * self.height * bits // 8
+        self.buffer = bytearray(self.buffsize)
+        framebuf.FrameBuffer.__init__( self, self.buffer, self.width, self.buffer_height, self.buffer_format )
+
+        if bits == 16:
+            return
+        self.palette = bytearray(2 << bits)
+        if bits == 8:
+            for index in range(256):
+                self.set_palette(index, (index >> 5) * 255 // 7, ((index >> 2) & 7) * 255 // 7, (index & 3) * 85)
+        else:
+            self.load_palette(self.PALETTE16)
+
+    def init_double_buffer(self):
+        """ Second buffer and push thread (started by first show()) """
+        self.back_buffer = bytearray(self.buffsize)
+        self.push_buffer = None
+        self.push_rects = []
+        self.push_start = _thread.allocate_lock() # Released by show(): frame is ready
+        self.push_start.acquire()
+        self.push_done = _thread.allocate_lock()  # Locked while the frame is sent
+        self.push_thread = False
+
+    def push_worker(self):
+        """ Push thread: sends every frame given by show() """
+        while True:
+            self.push_start.acquire()
+            buffer = self.push_buffer
+            bus = self.bus
+            bus.begin()
+            for x0, y0, x1, y1 in self.push_rects:
+                if self.palette is None:
+                    bus.push_rect(buffer, self.width, x0, y0, x1, y1)
+                else:
+                    bus.push_indexed(buffer, self.width, self.buffer_bits, self.palette, x0, y0, x1, y1)
+            bus.end()
+            bus.wait()
+            self.push_done.release()
+
+    def fence(self):
+        """ Waits until the previous frame of double buffer mode is sent.
+        Use it before commands to the display (scrolling, rotation, ...) after show()
+        """
+        if self.back_buffer is not None:
+            self.push_done.acquire()
+            self.push_done.release()
+
+    def show_swap(self):
+        """ Double buffer mode: damaged regions of the buffer are given to push thread, buffers are swapped """
+        self.fence() # Previous frame is sent, its buffer is free
+
+        front = self.buffer
+        rects = self.dirty_rects
+        self.dirty_rects = self.push_rects
+        self.free_rects(self.dirty_rects)
+        self.push_rects = rects
+        self.push_buffer = front
+
+        self.push_done.acquire()
+        if not self.push_thread:
+            self.push_thread = True
+            _thread.start_new_thread(self.push_worker, ())
+        self.push_start.release()
+
+        # Drawing goes on in the other buffer, it gets changes of the sent frame
+        self.buffer = self.back_buffer
+        self.back_buffer = front
+        framebuf.FrameBuffer.__init__( self, self.buffer, self.width, self.buffer_height, self.buffer_format )
+        row_size = self.width * self.buffer_bits // 8
+        source = memoryview(front)
+        target = memoryview(self.buffer)
+        for x0, y0, x1, y1 in rects:
+            target[y0 * row_size:(y1 + 1) * row_size] = source[y0 * row_size:(y1 + 1) * row_size]
+
+    def set_palette(self, index, r, g, b):
+        """ Changes color of palette index, the whole screen is recolored by next show()
+        Args
+        index (int): Palette index 0-255 (0-15 for 4-bit buffer)
+        r, g, b (int): Color components 0-255
+        """
+        color = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+        self.palette[index * 2] = color >> 8
+        self.palette[index * 2 + 1] = color & 0xFF
+        self.mark_dirty(0, 0, self.width, self.height)
+
+    def load_palette(self, colors, start = 0):
+        """ Changes several colors of the palette
+        Args
+        colors (list): Colors (r, g, b)
+        start (int): First palette index
+        """
+        for i in range(len(colors)):
+            r, g, b = colors[i]
+            self.set_palette(start + i, r, g, b)
+
+    def rgb(self, r, g, b):
+        """ Color for drawing functions. For indexed buffer it is the nearest color of the palette
+        Args
+        r, g, b (int): Color components 0-255
+        Return (int): RGB565 color or palette index
+        """
+        palette = self.palette
+        if palette is None:
+            return DRAW_FB.rgb(self, r, g, b)
+
+        best = 0
+        best_distance = 0x7FFFFFFF
+        for index in range(len(palette) >> 1):
+            color = (palette[index * 2] << 8) | palette[index * 2 + 1]
+            dr = ((color >> 8) & 0xF8) - r
+            dg = ((color >> 3) & 0xFC) - g
+            db = ((color << 3) & 0xF8) - b
+            distance = dr * dr + dg * dg + db * db
+            if distance < best_distance:
+                best = index
+                best_distance = distance
+        return best
+
+    def swap_dimensions(self):
+        if self.buffer_format is None:
+            return DRAW_FB.swap_dimensions(self)
+        self.width, self.height = self.height, self.width
+        if not self.band_height:
+            self.buffer_height = self.height
+        framebuf.FrameBuffer.__init__( self, self.buffer, self.width, self.buffer_height, self.buffer_format )
+
+    def select_bus(self):
+        """ PIO_BUS sends the buffer in background, it is used by the framebuffer only """
+        if PIO_BUS is not None and PIO_BUS.available(self):
+            return PIO_BUS(self)
+        return super().select_bus()
+
+    def busy(self):
+        """ Return (bool): True while show() is sending the buffer in background (PIO_BUS, double buffer) """
+        if self.back_buffer is not None and self.push_done.locked():
+            return True
+        return self.bus.busy()
+
+    def wait(self):
+        """ Waits until show() has sent the buffer.
+        Drawing functions wait by themselves, call it before writing to self.buffer directly.
+        """
+        self.fence()
+        self.bus.wait()
+        self.sending = False
+
+    def mark_dirty(self, x, y, w, h):
+        """ Adds a damaged region, that will be sent to the display by show().
+        Overlapping or adjacent regions are merged.
+        Use it after writing to self.buffer directly.
+        Args
+        x, y (int): Top left corner
+        w, h (int): Width and height
+        """
+        if self.sending: # The buffer is changed after it, once per frame
+            self.bus.wait()
+            self.sending = False
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width) - 1
+        y1 = min(y + h, self.height) - 1
+        if x1 < x0 or y1 < y0:
+            return
+
+        rects = self.dirty_rects
+
+        # Most often the region is already inside of the last one (nested drawing calls)
+        if rects:
+            last = rects[-1]
+            if last[0] <= x0 and last[1] <= y0 and x1 <= last[2] and y1 <= last[3]:
+                return
+
+        i = 0
+        while i < len(rects):
+            rx0, ry0, rx1, ry1 = rects[i]
+            if rx0 <= x1 + 1 and x0 <= rx1 + 1 and ry0 <= y1 + 1 and y0 <= ry1 + 1:
+                # Overlapping or adjacent: merge and check all again
+                x0 = min(x0, rx0)
+                y0 = min(y0, ry0)
+                x1 = max(x1, rx1)
+                y1 = max(y1, ry1)
+                self.rect_pool.append(rects.pop(i))
+                i = 0
+            else:
+                i += 1
+
+        if len(rects) >= self.MAX_DIRTY_RECTS:
+            # Too many windows: one bounding region is faster
+            for rx0, ry0, rx1, ry1 in rects:
+                x0 = min(x0, rx0)
+                y0 = min(y0, ry0)
+                x1 = max(x1, rx1)
+                y1 = max(y1, ry1)
+            self.free_rects(rects)
+
+        pool = self.rect_pool
+        if pool: # Lists of regions are used again, no allocation per frame
+            rect = pool.pop()
+            rect[0] = x0
+            rect[1] = y0
+            rect[2] = x1
+            rect[3] = y1
+        else:
+            rect = [x0, y0, x1, y1]
+        rects.append(rect)
+
+    def free_rects(self, rects):
+        """ Empties a list of regions, its lists go to the pool of mark_dirty()
+        Args
+        rects (list): Regions [x0, y0, x1, y1]
+        """
+        pool = self.rect_pool
+        while rects:
+            pool.append(rects.pop())
+
+    def show(self, full = False, vsync = False):
+        ''' Displays damaged regions of the buffer on the screen.
+        With PIO_BUS or double buffer it returns before the end of sending, see busy() and wait()
+        Args
+        full (bool): Display the whole buffer
+        vsync (bool): Start on TE pulse, every region at the scanline where it does not tear (needs te_pin)
+        '''
+        if full:
+            self.free_rects(self.dirty_rects)
+            self.mark_dirty(0, 0, self.width, self.height)
+
+        rects = self.dirty_rects
+        if not rects:
+            return
+
+        if vsync:
+            self.fence()
+            vsync = self.wait_vsync()
+
+        if self.back_buffer is not None:
+            return self.show_swap()
+
+        bus = self.bus
+        bus.begin()
+
+        if vsync:
+            self.show_vsync(rects)
+        elif self.display_list is None:
+            for x0, y0, x1, y1 in rects:
+                self.push_rect(x0, y0, x1, y1)
+        else:
+            self.show_bands(rects)
+
+        self.free_rects(rects)
+        bus.end()
+        self.sending = True
+
+    def show_vsync(self, rects):
+        ''' Sends regions right after TE pulse, every one at the scanline where it does not tear:
+        push faster than refresh of its rows goes ahead of the scanline, slower one - behind it.
+        Push time of a pixel is measured for next frames
+        Args
+        rects (list): Regions [x0, y0, x1, y1]
+        '''
+        rows = max(self.width, self.height)
+        for rect in rects:
+            x0, y0, x1, y1 = rect
+            first, last = self.native_rows(x0, y0, x1, y1)
+            pixels = (x1 - x0 + 1) * (y1 - y0 + 1)
+
+            ahead = self.pixel_ns * pixels <= (last - first + 1) * self.frame_us * 1000 // rows
+            start = ticks_us()
+            line = self.scanline()
+            # Ahead: scanline must not be inside of the region. Behind: it has to pass the first row.
+            # Not longer than a frame, the region can take all rows
+            while (first < line <= last if ahead else 0 <= line < first) and ticks_diff(ticks_us(), start) < self.frame_us:
+                line = self.scanline()
+
+            start = ticks_us()
+            if self.display_list is None:
+                self.push_rect(x0, y0, x1, y1)
+            else:
+                self.show_bands([rect])
+            self.bus.wait()
+            self.pixel_ns = ticks_diff(ticks_us(), start) * 1000 // pixels
+
+    async def show_async(self, rows_per_slice = 16, full = False):
+        ''' show() for asyncio: damaged regions are sent by slices of rows, other tasks run between them.
+        Every slice has own window, drawing during sending goes to the next show.
+        Args
+        rows_per_slice (int): Rows sent between awaits: more - faster, less - shorter pauses of other tasks
+        full (bool): Display the whole buffer
+        '''
+        if full:
+            self.free_rects(self.dirty_rects)
+            self.mark_dirty(0, 0, self.width, self.height)
+
+        rects = self.dirty_rects
+        if not rects:
+            return
+
+        if self.back_buffer is not None: # Push thread does not block
+            return self.show_swap()
+
+        self.dirty_rects = self.spare_rects
+        bus = self.bus
+        for x0, y0, x1, y1 in rects:
+            for top in range(y0, y1 + 1, rows_per_slice):
+                bottom = min(top + rows_per_slice - 1, y1)
+                bus.begin()
+                if self.display_list is None:
+                    self.push_rect(x0, top, x1, bottom)
+                else:
+                    self.show_bands([[x0, top, x1, bottom]])
+                bus.end()
+                self.sending = True # Drawing of other tasks waits for the slice
+                await asyncio.sleep(0)
+                while bus.busy(): # PIO_BUS sends the slice in background
+                    await asyncio.sleep(0)
+        self.free_rects(rects)
+        self.spare_rects = rects
+
+    def show_region(self, x, y, w, h):
+        ''' Displays a region of the buffer on the screen.
+        Damaged regions are not changed.
+        Args
+        x, y (int): Top left corner
+        w, h (int): Width and height
+        '''
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width) - 1
+        y1 = min(y + h, self.height) - 1
+        if x1 < x0 or y1 < y0:
+            return
+
+        self.fence()
+        self.bus.begin()
+        if self.display_list is None:
+            self.push_rect(x0, y0, x1, y1)
+        else:
+            self.show_bands([[x0, y0, x1, y1]])
+        self.bus.end()
+        self.sending = True
+
+    def push_rect(self, x0, y0, x1, y1, top = 0):
+        ''' Sends a rectangle of the buffer to the display through the bus (display stays selected)
+        Args
+        x0, y0 (int): Start position
+        x1, y1 (int): End position (included)
+        top (int): Screen row of the first row of the buffer (banded mode)
+        '''
+        if self.palette is None:
+            self.bus.push_rect(self.buffer, self.width, x0, y0, x1, y1, top)
+        else: # Indexes are expanded to RGB565 on the way to the display
+            self.bus.push_indexed(self.buffer, self.width, self.buffer_bits, self.palette, x0, y0, x1, y1, top)
+
+    # Banded mode: drawing calls are recorded and replayed into the strip buffer by show()
+
+    def draw(self, func, y_args, args, kwargs = None):
+        ''' Runs a drawing function on the buffer, in banded mode it is recorded into the display list
+        Args
+        func (function): Drawing function, called with self, args and kwargs
+        y_args (int): Bit mask of y coordinates in args, they are moved to the strip by replay
+        args (tuple): Arguments
+        kwargs (dict): Keyword arguments or None
+        '''
+        if self.display_list is None:
+            if kwargs:
+                return func(self, *args, **kwargs)
+            return func(self, *args)
+        self.display_list.append((func, y_args, args, kwargs))
+
+    def clear_display_list(self):
+        ''' Forgets recorded drawing calls (banded mode), fill() does it too '''
+        if self.display_list is not None:
+            self.display_list.clear()
+            if self._text_font is not None: # Current font is kept for next draw_text
+                self.display_list.append((DRAW_FB.set_font, 0, (self._text_font,), None))
+
+    def show_bands(self, rects):
+        ''' Renders every strip with damaged regions from the display list and sends parts of the regions in it
+        Args
+        rects (list): Regions [x0, y0, x1, y1]
+        '''
+        band_height = self.band_height
+        for top in range(0, self.height, band_height):
+            bottom = min(top + band_height, self.height) - 1
+            rendered = False
+            for x0, y0, x1, y1 in rects:
+                if y0 > bottom or y1 < top:
+                    continue
+                if not rendered:
+                    self.render_band(top)
+                    rendered = True
+                self.push_rect(x0, max(y0, top), x1, min(y1, bottom), top)
+
+    def render_band(self, top):
+        ''' Replays the display list into the strip buffer
+        Args
+        top (int): Screen row of the first row of the strip
+        '''
+        self.bus.wait() # Previous strip can be sent in background
+
+        display_list = self.display_list
+        dirty_rects = self.dirty_rects
+        self.display_list = None            # Nested drawing calls go to the strip,
+        self.dirty_rects = self.band_rects  # their regions are not kept
+
+        framebuf.FrameBuffer.fill(self, 0)
+        for func, y_args, args, kwargs in display_list:
+            if y_args:
+                args = [args[i] - top if (y_args >> i) & 1 else args[i] for i in range(len(args))]
+            if kwargs:
+                func(self, *args, **kwargs)
+            else:
+                func(self, *args)
+
+        self.free_rects(self.band_rects)
+        self.display_list = display_list
+        self.dirty_rects = dirty_rects
+
+    def replay_raw_image(self, filename, x, y, width, height):
+        ''' Reads rows of RGB565 raw image, that are inside of the strip
+        Args
+        filename (string): File of the image
+        x, y (int): Position in the strip
+        width, height (int): Size of the image
+        '''
+        x0 = max(x, 0)
+        x1 = min(x + width, self.width)
+        row0 = max(0, -y)
+        row1 = min(height, self.buffer_height - y)
+        if x1 <= x0 or row1 <= row0:
+            return
+
+        buffer = memoryview(self.buffer)
+        size = (x1 - x0) * 2
+        with open(filename, 'rb') as f:
+            for row in range(row0, row1):
+                f.seek((row * width + x0 - x) * 2)
+                pos = ((y + row) * self.width + x0) * 2
+                f.readinto(buffer[pos:pos + size])
+
+
+    def set_rotation(self, rotation = 0):
+        """ Set orientation of display, the whole buffer must be shown again
+        Params
+        rotation (int):  0 = 0 degree, 1 = 90 degrees, 2 = 180 degrees, 3 = 270 degrees
+        """
+        self.fence()
+        if super().set_rotation(rotation) is False:
+            return False
+        self.free_rects(self.dirty_rects)
+        self.mark_dirty(0, 0, self.width, self.height)
+
+    # Drawing functions with tracking of damaged regions.
+    # y_args of draw(): 0b10 - (x, y, ...), 0b100 - (object, x, y, ...), 0b1010 - (x0, y0, x1, y1, ...)
+    # Buffer of the whole screen (no display list) is drawn directly: no tuple of arguments per call
+    # draw_text() and draw_bitmap() take no keyword arguments: MicroPython makes a dict of them per call
+
+    def fill(self, color):
+        self.free_rects(self.dirty_rects)
+        self.mark_dirty(0, 0, self.width, self.height)
+        if self.display_list is None:
+            return DRAW_FB.fill(self, color)
+        self.clear_display_list() # Nothing under it is visible
+        self.draw(DRAW_FB.fill, 0, (color,))
+
+    def pixel(self, x, y, color = None):
+        if color is None:
+            return DRAW_FB.pixel(self, x, y)
+        self.mark_dirty(x, y, 1, 1)
+        if self.display_list is None:
+            return DRAW_FB.pixel(self, x, y, color)
+        self.draw(DRAW_FB.pixel, 0b10, (x, y, color))
+
+    def hline(self, x, y, w, color):
+        self.mark_dirty(x, y, w, 1)
+        if self.display_list is None:
+            return DRAW_FB.hline(self, x, y, w, color)
+        self.draw(DRAW_FB.hline, 0b10, (x, y, w, color))
+
+    def vline(self, x, y, h, color):
+        self.mark_dirty(x, y, 1, h)
+        if self.display_list is None:
+            return DRAW_FB.vline(self, x, y, h, color)
+        self.draw(DRAW_FB.vline, 0b10, (x, y, h, color))
+
+    def line(self, x0, y0, x1, y1, color):
+        self.mark_dirty(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1)
+        if self.display_list is None:
+            return DRAW_FB.line(self, x0, y0, x1, y1, color)
+        self.draw(DRAW_FB.line, 0b1010, (x0, y0, x1, y1, color))
+
+    def rect(self, x, y, w, h, color, fill = False):
+        self.mark_dirty(x, y, w, h)
+        if self.display_list is None:
+            return DRAW_FB.rect(self, x, y, w, h, color, fill)
+        self.draw(DRAW_FB.rect, 0b10, (x, y, w, h, color, fill))
+
+    def fill_rect(self, x, y, w, h, color):
+        self.mark_dirty(x, y, w, h)
+        if self.display_list is None:
+            return DRAW_FB.fill_rect(self, x, y, w, h, color)
+        self.draw(DRAW_FB.fill_rect, 0b10, (x, y, w, h, color))
+
+    def ellipse(self, x, y, xr, yr, color, fill = False, mask = 0x0F):
+        self.mark_dirty(x - xr, y - yr, 2 * xr + 1, 2 * yr + 1)
+        self.draw(DRAW_FB.ellipse, 0b10, (x, y, xr, yr, color, fill, mask))
+
+    def poly(self, x, y, coords, color, fill = False):
+        if len(coords) > 1:
+            x0 = x1 = coords[0]
+            y0 = y1 = coords[1]
+            for i in range(2, len(coords) - 1, 2):
+                x0 = min(x0, coords[i])
+                x1 = max(x1, coords[i])
+                y0 = min(y0, coords[i + 1])
+                y1 = max(y1, coords[i + 1])
+            self.mark_dirty(x + x0, y + y0, x1 - x0 + 1, y1 - y0 + 1)
+        self.draw(DRAW_FB.poly, 0b10, (x, y, coords, color, fill))
+
+    def text(self, text, x, y, color = 1):
+        self.mark_dirty(x, y, len(text) * 8, 8)
+        if self.display_list is None:
+            return DRAW_FB.text(self, text, x, y, color)
+        self.draw(DRAW_FB.text, 0b100, (text, x, y, color))
+
+    def scroll_buffer(self, xstep, ystep):
+        """ framebuf.scroll() of the buffer, the whole screen is shown again.
+        scroll( delay ) of ILI9XXX_8B (hardware scroll) is kept
+        Args
+        xstep, ystep (int): Shift of the picture in pixels
+        """
+        if self.display_list is not None:
+            print("scroll_buffer() needs buffer of the whole screen")
+            return
+        self.mark_dirty(0, 0, self.width, self.height)
+        DRAW_FB.scroll(self, xstep, ystep)
+
+    def blit(self, fbuf, x, y, *args):
+        if isinstance(fbuf, tuple): # (buffer, width, height, format)
+            self.mark_dirty(x, y, fbuf[1], fbuf[2])
+        else:
+            self.mark_dirty(0, 0, self.width, self.height)
+        self.draw(DRAW_FB.blit, 0b100, (fbuf, x, y) + args)
+
+    def set_font(self, font):
+        if font is not self._text_font:
+            self._text_font = font
+            self._text_widths[:] = bytes(96) # Widths of the new font are measured again
+        self.draw(DRAW_FB.set_font, 0, (font,)) # Font is used by replay of draw_text
+
+    def draw_text(self, text, x, y, color, *args):
+        font = self._text_font
+        if font is not None and '\n' not in text:
+            # Widths of ASCII characters are kept: get_ch() makes a tuple per call
+            widths = self._text_widths
+            text_width = 0
+            for ch in text:
+                code = ord(ch) - 32
+                if 0 <= code < 96:
+                    if not widths[code]:
+                        widths[code] = font.get_ch(ch)[2]
+                    text_width += widths[code]
+                else:
+                    text_width += font.get_ch(ch)[2]
+
+            if x + text_width <= self.width: # One line of text
+                self.mark_dirty(x, y, text_width, font.height())
+            else: # Text can be wrapped to next lines
+                self.mark_dirty(0, y, self.width, self.height - y)
+        else:
+            self.mark_dirty(0, y, self.width, self.height - y)
+
+        if self.display_list is None:
+            if args:
+                return DRAW_FB.draw_text(self, text, x, y, color, *args)
+            return DRAW_FB.draw_text(self, text, x, y, color) # Call with *args allocates them
+        return self.draw(DRAW_FB.draw_text, 0b100, (text, x, y, color) + args)
+
+    def draw_bitmap(self, bitmap, x, y, color, *args):
+        self.mark_dirty(x, y, bitmap[2], bitmap[1]) # bitmap: (data, height, width)
+        if self.display_list is None:
+            if args:
+                return DRAW_FB.draw_bitmap(self, bitmap, x, y, color, *args)
+            return DRAW_FB.draw_bitmap(self, bitmap, x, y, color)
+        return self.draw(DRAW_FB.draw_bitmap, 0b100, (bitmap, x, y, color) + args)
+
+    def draw_bmp(self, filename, x, y, *args, **kwargs):
+        if self.palette is not None or self.display_list is not None:
+            print("BMP images need buffer_bits = 16 and buffer of the whole screen")
+            return
+        with open(filename, 'rb') as f:
+            header = f.read(26)
+        width, height = struct.unpack('<ii', header[18:26])
+        self.mark_dirty(x, y, width, abs(height)) # Height < 0: rows from the top
+        return DRAW_FB.draw_bmp(self, filename, x, y, *args, **kwargs)
+
+    def draw_raw_image(self, filename, x, y, width, height, *args, **kwargs):
+        if self.palette is not None:
+            print("RGB565 images need buffer_bits = 16")
+            return
+        self.mark_dirty(x, y, width, height)
+        if self.display_list is not None: # Only rows of the strip are read by replay
+            return self.draw(ILI9XXX_8B_FB.replay_raw_image, 0b100, (filename, x, y, width, height))
+        return DRAW_FB.draw_raw_image(self, filename, x, y, width, height, *args, **kwargs)
+
+
+class FRAME_PACER:
+    """ Animation at target frame rate: show() waits for the time of the frame and starts on TE pulse.
+    Frames shown after their time are counted as missed deadlines.
+
+    pacer = FRAME_PACER(tft, 25)
+    while True:
+        draw_gauges()
+        pacer.show()
+    """
+
+    def __init__(self, display, fps = 30):
+        """ Constructor
+        Args
+        display (ILI9XXX_8B_FB): Display, with te_pin for tear-free pushes
+        fps (int): Target frames per second
+        """
+        self.display = display
+        self.fps = fps
+        self.period_us = 1000000 // fps
+        self.deadline = 0  # ticks_us() of the start of next frame
+        self.frames = 0
+        self.missed = 0    # Frames shown after their time
+        self.push_us = 0   # Time of the last push
+
+    def show(self, full = False):
+        """ Waits for the time of the frame and shows damaged regions of the display.
+        Nothing is sent if nothing was drawn
+        Args
+        full (bool): Display the whole buffer
+        Return (bool): True - frame is shown in time, False - deadline is missed
+        """
+        display = self.display
+        if not self.frames:
+            self.deadline = ticks_us()
+
+        # Sleep until the last refresh before the frame, its TE pulse starts the push
+        wait = ticks_diff(self.deadline, ticks_us()) - display.frame_us
+        if wait > 0:
+            sleep_us(wait)
+
+        start = ticks_us()
+        display.show(full, vsync = True)
+        display.wait()
+        end = ticks_us()
+        self.push_us = ticks_diff(end, start)
+        self.frames += 1
+
+        self.deadline = ticks_add(self.deadline, self.period_us)
+        if ticks_diff(end, self.deadline) > 0: # Frame has taken the time of the next one
+            self.missed += 1
+            self.deadline = end # No burst of frames to catch up
+            return False
+        return True
+
+    def match_refresh(self):
+        """ ILI9341: refresh rate of the panel is set to measured push speed of the whole screen,
+        but not less than target fps. Call it after some frames
+        Return (int): Set refresh rate, 0 - not supported or not measured yet
+        """
+        display = self.display
+        push_us = display.pixel_ns * display.width * display.height // 1000
+        if not push_us:
+            return 0
+        return display.set_frame_rate(max(1000000 // push_us, self.fps))
+
+    def report(self):
+        """ Prints count of frames, missed deadlines, last push time and refresh rate of the display """
+        display = self.display
+        refresh = 1000000 // display.frame_us if display.frame_us else 0
+        print('Frames:', self.frames, 'missed:', self.missed, 'push:', self.push_us, 'us, refresh:', refresh, 'Hz')
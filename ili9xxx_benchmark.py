@@ -0,0 +1,271 @@
+"""
+ILI9XXX_BENCHMARK standard workload for 8-bit display-shield v 0.1.5
+
+Runs the same tests on ILI9XXX_8B_DIRECT and ILI9XXX_8B_FB and reports ms, pixels/s and bytes/s of the bus.
+Results are saved to JSON with controller, display model and bpp, files of runs and boards are compared by compare().
+FB tests include show(), the time is from the call to the picture on the display.
+
+Run on the board: mpremote run ili9xxx_benchmark.py (pins are the same as in the examples)
+Or for own display: ili9xxx_benchmark.run(tft, 'bench.json')
+Zero allocation test of drawing frames: ili9xxx_benchmark.alloc_test(tft, touch)
+
+Project path: https://github.com/r2d2-arduino/micropython_ili9488_9486_9341_shields
+MIT License
+
+Author: Arthur Derkach
+"""
+from time import ticks_us, ticks_diff
+import json
+import gc
+import os
+
+PARAGRAPH = ("Lorem ipsum dolor sit amet,\n consectetur adipiscing elit, sed do eiusmod tempor incididunt "
+             "ut labore et dolore magna aliqua.\n Ut enim ad minim veniam, quis nostrud exercitation ullamco "
+             "laboris nisi ut aliquip ex ea commodo consequat.")
+
+RECTS = const(200) # Rectangles of rect storm
+
+def finish(tft):
+    """ Sends the buffer of ILI9XXX_8B_FB to the display """
+    if hasattr(tft, 'show'):
+        tft.show()
+        tft.wait()
+
+def image_file(tft, extension):
+    """ Image of resources/ of the size of the screen """
+    if tft.width * tft.height >= 320 * 480:
+        return ('resources/road320x480.bmp' if extension == 'bmp' else 'resources/rock320x480.raw'), 320, 480
+    return ('resources/grass240x320.bmp' if extension == 'bmp' else 'resources/road240x320.raw'), 240, 320
+
+def bench_fill(tft):
+    tft.fill(tft.rgb(0, 0, 255))
+    finish(tft)
+    return tft.width * tft.height
+
+def bench_rects(tft):
+    seed = 12345
+    pixels = 0
+    for i in range(RECTS):
+        seed = (seed * 1103515245 + 12345) & 0x7FFFFFFF # Same rectangles on every board
+        w = 8 + seed % 57
+        h = 8 + (seed >> 8) % 57
+        x = (seed >> 4) % (tft.width - w)
+        y = (seed >> 12) % (tft.height - h)
+        tft.fill_rect(x, y, w, h, seed & 0xFFFF)
+        pixels += w * h
+    finish(tft)
+    return pixels
+
+def bench_text(tft):
+    import resources.LibreBodoni24 as font
+    tft.set_font(font)
+    pixels = 0
+    for ch in PARAGRAPH:
+        if ch != '\n':
+            glyph = font.get_ch(ch)
+            pixels += glyph[1] * glyph[2]
+    tft.draw_text(PARAGRAPH, 4, 4, tft.rgb(255, 255, 0))
+    finish(tft)
+    return pixels
+
+def bench_bitmap(tft):
+    from resources.bitmaps import rain
+    size = rain[1]
+    color = tft.rgb(255, 255, 255)
+    pixels = 0
+    for y in range(0, tft.height - size + 1, size):
+        for x in range(0, tft.width - size + 1, size):
+            tft.draw_bitmap(rain, x, y, color)
+            pixels += size * size
+    finish(tft)
+    return pixels
+
+def bench_bmp(tft):
+    filename, width, height = image_file(tft, 'bmp')
+    tft.draw_bmp(filename, 0, 0)
+    finish(tft)
+    return width * height
+
+def bench_raw(tft):
+    filename, width, height = image_file(tft, 'raw')
+    tft.draw_raw_image(filename, 0, 0, width, height)
+    finish(tft)
+    return width * height
+
+def bench_show(tft):
+    if not hasattr(tft, 'show'):
+        return 0
+    tft.show(full = True)
+    tft.wait()
+    return tft.width * tft.height
+
+TESTS = (('fill', bench_fill), ('rects', bench_rects), ('text', bench_text), ('bitmap', bench_bitmap),
+         ('bmp', bench_bmp), ('raw', bench_raw), ('show', bench_show))
+
+# Test name: (method of tft_draw, extension of the image file or None)
+REQUIRES = { 'text': ('draw_text', None), 'bitmap': ('draw_bitmap', None),
+             'bmp': ('draw_bmp', 'bmp'), 'raw': ('draw_raw_image', 'raw') }
+
+def missing(tft, name):
+    """ Checks what a test needs before it runs: errors of the test itself are not hidden
+    Return (string): Missing method or file, None - test can run
+    """
+    if name not in REQUIRES:
+        return None
+    method, extension = REQUIRES[name]
+    if not hasattr(tft, method):
+        return method + '() of tft_draw'
+    if extension:
+        filename = image_file(tft, extension)[0]
+        try:
+            os.stat(filename)
+        except OSError:
+            return filename
+    return None
+
+def run(tft, filename = None, tests = TESTS):
+    """ Runs tests on the display, prints and saves results
+    Args
+    tft (ILI9XXX_8B_DIRECT or ILI9XXX_8B_FB): Display in rotation 0
+    filename (string): JSON file of results, None - not saved
+    tests (tuple): Tests (name, function), function returns count of drawn pixels (0 - not supported),
+                   tests of REQUIRES are skipped without their method or image file
+    Return (dict): Results
+    """
+    bytes_per_pixel = 3 if tft.pixel_format in (0x66, 0x77) else 2
+    results = {}
+    print('Test        ms     pixels/s    bytes/s')
+    for name, test in tests:
+        reason = missing(tft, name)
+        if reason:
+            print(name, 'skipped, missing', reason)
+            continue
+        gc.collect()
+        start = ticks_us()
+        pixels = test(tft)
+        time_us = max(ticks_diff(ticks_us(), start), 1)
+        if not pixels:
+            continue
+        result = { 'ms': time_us // 1000, 'pixels': pixels,
+                   'pixels_per_s': pixels * 1000 // time_us * 1000,
+                   'bytes_per_s': pixels * bytes_per_pixel * 1000 // time_us * 1000 }
+        results[name] = result
+        print('{:8} {:6} {:11} {:10}'.format(name, result['ms'], result['pixels_per_s'], result['bytes_per_s']))
+
+    report = { 'class': type(tft).__name__, 'controller': tft.controller_name,
+               'display_model': hex(tft.display_model), 'bpp': (16, 18, 24)[(0x55, 0x66, 0x77).index(tft.pixel_format)],
+               'width': tft.width, 'height': tft.height, 'bus': tft.bus.NAME, 'results': results }
+    if filename:
+        with open(filename, 'w') as f:
+            json.dump(report, f)
+    return report
+
+def compare(filename_a, filename_b):
+    """ Prints times of two saved runs (boards, versions) and their ratio
+    Args
+    filename_a, filename_b (string): JSON files of run()
+    """
+    with open(filename_a) as f:
+        a = json.load(f)
+    with open(filename_b) as f:
+        b = json.load(f)
+    print(a['class'], a['controller'], a['display_model'], '->', b['class'], b['controller'], b['display_model'])
+    for name in a['results']:
+        if name in b['results']:
+            ms_a = a['results'][name]['ms']
+            ms_b = b['results'][name]['ms']
+            print('{:8} {:6} ms -> {:6} ms  x{:.2f}'.format(name, ms_a, ms_b, ms_a / ms_b if ms_b else 0))
+
+def check_alloc(frame, frames = 10):
+    """ Heap allocation of a frame: gc.mem_alloc() before and after every call, collection is off.
+    The first call is not counted (kept buffers, caches and interned strings are made by it)
+    Args
+    frame (function): Drawing of one frame, without arguments
+    frames (int): Counted calls
+    Return (int): Allocated bytes of the worst frame, 0 - no allocation
+    """
+    frame()
+    gc.collect()
+    gc.disable() # Collection in the middle would hide allocation
+    worst = 0
+    try:
+        for i in range(frames):
+            before = gc.mem_alloc()
+            frame()
+            worst = max(worst, gc.mem_alloc() - before)
+    finally:
+        gc.enable()
+    return worst
+
+def alloc_test(tft, touch = None, frames = 10):
+    """ Asserts that common frames don't allocate: garbage collection never pauses an animation
+    Args
+    tft (ILI9XXX_8B_DIRECT or ILI9XXX_8B_FB): Display
+    touch (ResistiveTouchScreen): Touch screen, None - not tested
+    frames (int): Counted calls of every frame
+    """
+    import resources.LibreBodoni24 as font
+    from resources.bitmaps import rain
+    tft.set_font(font)
+    color = tft.rgb(255, 255, 0)
+
+    def frame_rect():
+        tft.fill_rect(10, 10, 60, 40, color)
+        finish(tft)
+
+    def frame_text():
+        tft.draw_text('Frame 0123', 10, 60, color)
+        finish(tft)
+
+    def frame_bitmap():
+        tft.draw_bitmap(rain, 10, 100, color)
+        finish(tft)
+
+    point = [0, 0]
+
+    def frame_touch():
+        touch.read_touch_into(point)
+
+    tests = [('rect', frame_rect), ('text', frame_text), ('bitmap', frame_bitmap)]
+    if touch is not None:
+        tests.append(('touch', frame_touch))
+
+    failed = []
+    print('Frame    allocated bytes')
+    for name, frame in tests:
+        size = check_alloc(frame, frames)
+        print('{:8} {:6}'.format(name, size))
+        if size:
+            failed.append(name)
+    assert not failed, 'Frames allocate: ' + ', '.join(failed)
+
+def main():
+    """ Runs the benchmark with both drawing classes on pins of the examples """
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    from ili9xxx_8b_fb import ILI9XXX_8B_FB
+
+    controller = ILI9XXX_8B_DIRECT.read_controller_name()
+    if controller == 'ESP32':
+        pins = ( [12, 13, 26, 25, 17, 16, 27, 14], 32, 15,  4,  2, 33 )
+    elif controller == 'RP2':
+        pins = ( [8, 9, 2, 3, 4, 5, 6, 7], 29, 28, 27, 26, 24 )
+    elif controller == 'ESP32-S3':
+        pins = ( [9, 8, 18, 17, 15, 16, 3, 14],  6,  7,  1,  2, 5 )
+    else:
+        print("Unknown controller!")
+        return
+
+    for cls, filename in ((ILI9XXX_8B_DIRECT, 'bench_direct.json'), (ILI9XXX_8B_FB, 'bench_fb.json')):
+        gc.collect()
+        try:
+            tft = cls(*pins)
+        except MemoryError:
+            print(cls.__name__, 'skipped: no memory for the buffer')
+            continue
+        print(cls.__name__, tft.controller_name, hex(tft.display_model), tft.width, 'x', tft.height)
+        run(tft, filename)
+        tft.bus.deinit()
+        tft = None
+
+if __name__ == '__main__':
+    main()
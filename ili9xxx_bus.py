@@ -0,0 +1,627 @@
+"""
+ILI9XXX_BUS bus backends for 8-bit display-shield v 0.1.7
+
+Backends send commands, parameters and pixels to the display.
+ILI9XXX_8B selects the fastest available backend at construction (see BUS_BACKENDS),
+own transports (RP2 PIO, ESP32-S3 LCD_CAM) are added without changing drawing classes.
+
+* ILI9XXX_BUS   - Base class: primitives and generic implementations
+* GPIO_BUS      - Bit-bang of GPIO registers (all controllers)
+* RECORDING_BUS - Records primitives, optionally passes them to another backend
+* PIO_BUS       - RP2 PIO + DMA, sending in background (ili9xxx_bus_rp2.py)
+
+Project path: https://github.com/r2d2-arduino/micropython_ili9488_9486_9341_shields
+MIT License
+
+Author: Arthur Derkach
+"""
+from time import sleep_ms
+
+@micropython.viper
+def expand_indexed8(buffer, line, palette, start:int, count:int):
+    """ RGB565 bytes of count pixels of 8-bit indexed buffer from pixel start """
+    src = ptr8(buffer)
+    dst = ptr8(line)
+    pal = ptr8(palette)
+    i = 0
+    while i < count:
+        index = src[start + i] << 1
+        dst[i << 1] = pal[index]
+        dst[(i << 1) + 1] = pal[index + 1]
+        i += 1
+
+@micropython.viper
+def expand_indexed4(buffer, line, palette, start:int, count:int):
+    """ RGB565 bytes of count pixels of 4-bit indexed buffer (GS4_HMSB) from pixel start """
+    src = ptr8(buffer)
+    dst = ptr8(line)
+    pal = ptr8(palette)
+    i = 0
+    while i < count:
+        pos = start + i
+        value = src[pos >> 1]
+        if pos & 1:
+            index = (value & 0x0F) << 1
+        else:
+            index = (value >> 4) << 1
+        dst[i << 1] = pal[index]
+        dst[(i << 1) + 1] = pal[index + 1]
+        i += 1
+
+class ILI9XXX_BUS:
+    """ Base of bus backends.
+    Required primitives: command, params, push, read.
+    window, push_rect, push_indexed, push_color and init_table have generic implementations.
+    """
+
+    NAME = 'base'
+
+    def __init__(self, display):
+        """ Constructor
+        Args
+        display (ILI9XXX_8B): Display, pins and settings of the bus
+        """
+        self.display = display
+        self.window_params = bytearray(4) # Start and end of window(), hi and low bytes
+        self.lines = None # Two lines of push_indexed()
+
+    @staticmethod
+    def available(display):
+        """ Return (bool): True if the backend works with the board and pins of the display """
+        return False
+
+    def begin(self):
+        """ Selects the display before window and pushing """
+        pass
+
+    def end(self):
+        """ Deselects the display after pushing """
+        pass
+
+    def busy(self):
+        """ Return (bool): True while pushed data is being sent in background (DMA) """
+        return False
+
+    def wait(self):
+        """ Waits until pushed data is sent """
+        pass
+
+    def deinit(self):
+        """ Frees resources of the backend, pins are returned to GPIO """
+        pass
+
+    def command(self, cmd):
+        """ Sends a command
+        Args
+        cmd (int): Command, example: 0x2A
+        """
+        raise NotImplementedError
+
+    def params(self, data):
+        """ Sends parameters of the last command
+        Args
+        data (bytes, list): Parameter bytes
+        """
+        raise NotImplementedError
+
+    def push(self, buffer, start, count):
+        """ Sends bytes of a buffer as pixel data
+        Args
+        buffer (bytearray): Data
+        start (int): First byte
+        count (int): Number of bytes
+        """
+        raise NotImplementedError
+
+    def read(self, cmd, count):
+        """ Reads bytes of a command (dummy byte is skipped)
+        Args
+        cmd (int): Read command, example: 0xD3
+        count (int): Number of bytes
+        Return (bytearray): Bytes
+        """
+        raise NotImplementedError
+
+    def read_rect(self, x0, y0, x1, y1, buffer):
+        """ Reads pixels of the area (Memory Read 0x2E) as RGB565, high byte first
+        Args
+        x0, y0 (int): Start position
+        x1, y1 (int): End position (included)
+        buffer (bytearray): Pixels, 2 bytes per pixel
+        """
+        self.window(x0, y0, x1, y1)
+        self.command(0x2E)
+        self.display.read_pixels(buffer, (x1 - x0 + 1) * (y1 - y0 + 1))
+
+    def window(self, x0, y0, x1, y1):
+        """ Sets the drawing area and starts memory write
+        Args
+        x0, y0 (int): Start position
+        x1, y1 (int): End position (included)
+        """
+        params = self.window_params
+        params[0] = x0 >> 8
+        params[1] = x0 & 0xFF
+        params[2] = x1 >> 8
+        params[3] = x1 & 0xFF
+        self.command(0x2A)
+        self.params(params)
+        params[0] = y0 >> 8
+        params[1] = y0 & 0xFF
+        params[2] = y1 >> 8
+        params[3] = y1 & 0xFF
+        self.command(0x2B)
+        self.params(params)
+        self.command(0x2C)
+
+    def push_rect(self, buffer, width, x0, y0, x1, y1, top = 0):
+        """ Sends a rectangle of RGB565 buffer
+        Args
+        buffer (bytearray): Buffer of 2 bytes per pixel
+        width (int): Width of the buffer in pixels
+        x0, y0 (int): Start position
+        x1, y1 (int): End position (included)
+        top (int): Screen row of the first row of the buffer (strip of the screen)
+        """
+        self.window(x0, y0, x1, y1)
+        row_size = (x1 - x0 + 1) * 2
+        for y in range(y0 - top, y1 - top + 1):
+            self.push(buffer, (y * width + x0) * 2, row_size)
+
+    def push_indexed(self, buffer, width, bits, palette, x0, y0, x1, y1, top = 0):
+        """ Sends a rectangle of indexed color buffer, indexes are expanded to RGB565 by palette
+        Args
+        buffer (bytearray): Buffer of 8 bits (GS8) or 4 bits (GS4_HMSB) per pixel
+        width (int): Width of the buffer in pixels
+        bits (int): Bits per pixel: 8 or 4
+        palette (bytearray): RGB565 colors (2 bytes, as in the RGB565 buffer) of all indexes
+        x0, y0 (int): Start position
+        x1, y1 (int): End position (included)
+        top (int): Screen row of the first row of the buffer (strip of the screen)
+        """
+        self.window(x0, y0, x1, y1)
+        count = x1 - x0 + 1
+        # Two lines: one is expanded while the other can be sent in background. Kept for next calls
+        lines = self.lines
+        if lines is None or len(lines[0]) < count * 2:
+            lines = self.lines = (bytearray(count * 2), bytearray(count * 2))
+        expand = expand_indexed8 if bits == 8 else expand_indexed4
+        for y in range(y0 - top, y1 - top + 1):
+            line = lines[y & 1]
+            expand(buffer, line, palette, y * width + x0, count)
+            self.push(line, 0, count * 2)
+
+    def push_color(self, color, count):
+        """ Sends the same color count times
+        Args
+        color (bytes): Bytes of one pixel, example: b'\\xF8\\x00'
+        count (int): Number of pixels
+        """
+        size = len(color)
+        for i in range(count):
+            self.push(color, 0, size)
+
+    def init_table(self, table, delay_scale = 100):
+        """ Sends init sequence
+        Args
+        table (bytes): Records of: command, count of params (+ 0x80 if delay follows), params, delay in ms
+        delay_scale (int): Delays in percents
+        """
+        pixel_format = self.display.pixel_format
+        pos = 0
+        while pos < len(table):
+            cmd = table[pos]
+            count = table[pos + 1]
+            pos += 2
+            end = pos + (count & 0x7F)
+            if cmd == 0x3A: # Pixel format is set by bpp
+                self.command(cmd)
+                self.params(bytes((pixel_format,)))
+            else:
+                self.command(cmd)
+                if end > pos:
+                    self.params(table[pos:end])
+            pos = end
+            if count & 0x80:
+                delay = table[pos] * delay_scale // 100
+                pos += 1
+                if delay > 0:
+                    sleep_ms(delay)
+
+
+class GPIO_BUS(ILI9XXX_BUS):
+    """ Bit-bang of the 8-bit bus through GPIO registers of the display.
+    Pushing kernel is selected by bus layout: BYTE2GPIO table, shift of contiguous pins,
+    dual bank or safe (set/clear) bus.
+    """
+
+    NAME = 'gpio'
+
+    def __init__(self, display):
+        super().__init__(display)
+
+        self.wr_bit = display.wr_bit
+        self.GPIO_OUT_REG = display.GPIO_OUT_REG
+        self.GPIO_OUT_SET = display.GPIO_OUT_SET
+        self.GPIO_OUT_CLR = display.GPIO_OUT_CLR
+        self.BYTE2GPIO = display.BYTE2GPIO
+
+        if display.safe_bus:
+            self.BYTE2SET = display.BYTE2SET
+            self.BYTE2CLR = display.BYTE2CLR
+            self.push = self.push_safe
+        elif display.dual_bank:
+            self.BYTE2GPIO1 = display.BYTE2GPIO1
+            self.GPIO_OUT1_REG = display.GPIO_OUT1_REG
+            self.GPIO_WR_SET = display.GPIO_WR_SET
+            self.push = self.push_dual
+        elif display.data_shift >= 0:
+            self.data_shift = display.data_shift
+            self.push = self.push_shift
+        else:
+            self.push = self.push_table
+
+        self.PAL2GPIO = None  # Register values of palette colors (2 per color) for push_indexed()
+        self.pal_colors = None
+        self.pal_state = 0
+
+    @staticmethod
+    def available(display):
+        return True
+
+    def begin(self):
+        self.display.bus_begin()
+
+    def end(self):
+        self.display.cs.value(1)
+
+    def command(self, cmd):
+        display = self.display
+        display.cs.value(0)  # Selecting a device
+        display.dc.value(0)  # Command Mode
+        display.set_data_pins(cmd)
+        display.wr.off()
+        display.wr.on()
+        display.cs.value(1)  # Deselect device
+
+    def params(self, data):
+        display = self.display
+        wr = display.wr
+        display.cs.value(0)  # Selecting a device
+        display.dc.value(1)  # Data mode
+        for value in data:
+            display.set_data_pins(value)
+            wr.off()
+            wr.on()
+        display.cs.value(1)  # Deselect device
+
+    def read(self, cmd, count):
+        self.command(cmd)
+        return self.display.read_bytes(count + 1)[1:]
+
+    def window(self, x0, y0, x1, y1):
+        self.display.set_window(x0, y0, x1, y1)
+
+    def init_table(self, table, delay_scale = 100):
+        self.display.bus_begin()
+        self.display.run_init_table(table, delay_scale)
+
+    def push_indexed(self, buffer, width, bits, palette, x0, y0, x1, y1, top = 0):
+        display = self.display
+        if display.safe_bus or display.dual_bank:
+            return super().push_indexed(buffer, width, bits, palette, x0, y0, x1, y1, top)
+
+        # Table is made again after changes of palette or other pins of the port
+        if self.pal_state != display.gpio_state or self.pal_colors != palette:
+            if self.PAL2GPIO is None or len(self.PAL2GPIO) != len(palette) * 4:
+                self.PAL2GPIO = bytearray(len(palette) * 4)
+            self.update_pal2gpio(palette)
+            self.pal_colors = bytes(palette)
+            self.pal_state = display.gpio_state
+
+        push = self.push_indexed8 if bits == 8 else self.push_indexed4
+        self.window(x0, y0, x1, y1)
+        count = x1 - x0 + 1
+        if count == width: # Whole rows
+            push(buffer, (y0 - top) * width, count * (y1 - y0 + 1))
+        else:
+            for y in range(y0 - top, y1 - top + 1):
+                push(buffer, y * width + x0, count)
+
+    @micropython.viper
+    def update_pal2gpio(self, palette):
+        """ Register values of both bytes of all palette colors, from BYTE2GPIO """
+        byte2gpio = ptr32(self.BYTE2GPIO)
+        pal2gpio  = ptr32(self.PAL2GPIO)
+        pal       = ptr8(palette)
+        size      = int(len(palette))
+        i = 0
+        while i < size:
+            pal2gpio[i] = byte2gpio[ pal[i] ]
+            i += 1
+
+    @micropython.viper
+    def push_indexed8(self, buffer, start:int, count:int):
+        """ Sends count pixels of 8-bit indexed buffer from pixel start through PAL2GPIO table """
+        wr_bit     = int(self.wr_bit)
+
+        data       = ptr8(buffer)
+        pal2gpio   = ptr32(self.PAL2GPIO)
+        GPIO_OUT   = ptr32(self.GPIO_OUT_REG)
+        GPIO_OUT_S = ptr32(self.GPIO_OUT_SET)
+
+        pos = start
+        end = start + count
+        while pos < end:
+            index = data[ pos ] << 1
+            GPIO_OUT[0] = pal2gpio[ index ]
+            GPIO_OUT_S[0] = wr_bit
+            GPIO_OUT[0] = pal2gpio[ index + 1 ]
+            GPIO_OUT_S[0] = wr_bit
+            pos += 1
+
+    @micropython.viper
+    def push_indexed4(self, buffer, start:int, count:int):
+        """ Sends count pixels of 4-bit indexed buffer (GS4_HMSB) from pixel start through PAL2GPIO table """
+        wr_bit     = int(self.wr_bit)
+
+        data       = ptr8(buffer)
+        pal2gpio   = ptr32(self.PAL2GPIO)
+        GPIO_OUT   = ptr32(self.GPIO_OUT_REG)
+        GPIO_OUT_S = ptr32(self.GPIO_OUT_SET)
+
+        pos = start
+        end = start + count
+        while pos < end:
+            value = data[ pos >> 1 ]
+            if pos & 1:
+                index = (value & 0x0F) << 1
+            else:
+                index = (value >> 4) << 1
+            GPIO_OUT[0] = pal2gpio[ index ]
+            GPIO_OUT_S[0] = wr_bit
+            GPIO_OUT[0] = pal2gpio[ index + 1 ]
+            GPIO_OUT_S[0] = wr_bit
+            pos += 1
+
+    @micropython.viper
+    def push_table(self, buffer, start:int, count:int):
+        """ push() through BYTE2GPIO table """
+        wr_bit     = int(self.wr_bit)
+
+        data       = ptr8(buffer)
+        byte2gpio  = ptr32(self.BYTE2GPIO)
+        GPIO_OUT   = ptr32(self.GPIO_OUT_REG)
+        GPIO_OUT_S = ptr32(self.GPIO_OUT_SET)
+
+        pos = start
+        end = start + count
+        while pos < end:
+            GPIO_OUT[0] = byte2gpio[ data[ pos ] ]
+            GPIO_OUT_S[0] = wr_bit
+            pos += 1
+
+    @micropython.viper
+    def push_shift(self, buffer, start:int, count:int):
+        """ push() for contiguous data pins: byte is shifted into the register snapshot """
+        wr_bit     = int(self.wr_bit)
+        shift      = int(self.data_shift)
+        base       = ptr32(self.BYTE2GPIO)[0] # Snapshot with data pins low
+
+        data       = ptr8(buffer)
+        GPIO_OUT   = ptr32(self.GPIO_OUT_REG)
+        GPIO_OUT_S = ptr32(self.GPIO_OUT_SET)
+
+        pos = start
+        end = start + count
+        while pos < end:
+            GPIO_OUT[0] = base | (data[ pos ] << shift)
+            GPIO_OUT_S[0] = wr_bit
+            pos += 1
+
+    @micropython.viper
+    def push_dual(self, buffer, start:int, count:int):
+        """ push() for the bus split between GPIO0-31 and GPIO32-48 """
+        wr_bit     = int(self.wr_bit)
+
+        data       = ptr8(buffer)
+        byte2gpio  = ptr32(self.BYTE2GPIO)
+        byte2gpio1 = ptr32(self.BYTE2GPIO1)
+        GPIO_OUT   = ptr32(self.GPIO_OUT_REG)
+        GPIO_OUT1  = ptr32(self.GPIO_OUT1_REG)
+        GPIO_WR_S  = ptr32(self.GPIO_WR_SET)
+
+        pos = start
+        end = start + count
+        while pos < end:
+            value = data[ pos ]
+            GPIO_OUT[0] = byte2gpio[ value ]
+            GPIO_OUT1[0] = byte2gpio1[ value ]
+            GPIO_WR_S[0] = wr_bit
+            pos += 1
+
+    @micropython.viper
+    def push_safe(self, buffer, start:int, count:int):
+        """ push() for the safe bus, only display pins are changed """
+        wr_bit     = int(self.wr_bit)
+
+        data       = ptr8(buffer)
+        byte2set   = ptr32(self.BYTE2SET)
+        byte2clr   = ptr32(self.BYTE2CLR)
+        GPIO_OUT_S = ptr32(self.GPIO_OUT_SET)
+        GPIO_OUT_C = ptr32(self.GPIO_OUT_CLR)
+
+        pos = start
+        end = start + count
+        while pos < end:
+            value = data[ pos ]
+            GPIO_OUT_C[0] = byte2clr[ value ]
+            GPIO_OUT_S[0] = byte2set[ value ]
+            GPIO_OUT_S[0] = wr_bit
+            pos += 1
+
+    @micropython.viper
+    def push_color(self, color, count:int):
+        wr_bit     = int(self.wr_bit)
+        data       = ptr8(color)
+        size       = int(len(color))
+
+        display    = self.display
+        byte2gpio  = ptr32(self.BYTE2GPIO)
+        GPIO_OUT   = ptr32(self.GPIO_OUT_REG)
+        GPIO_OUT_S = ptr32(self.GPIO_OUT_SET)
+
+        if display.safe_bus:
+            byte2set   = ptr32(self.BYTE2SET)
+            byte2clr   = ptr32(self.BYTE2CLR)
+            GPIO_OUT_C = ptr32(self.GPIO_OUT_CLR)
+            n = 0
+            while n < count:
+                i = 0
+                while i < size:
+                    GPIO_OUT_C[0] = byte2clr[ data[i] ]
+                    GPIO_OUT_S[0] = byte2set[ data[i] ]
+                    GPIO_OUT_S[0] = wr_bit
+                    i += 1
+                n += 1
+            return
+
+        if display.dual_bank:
+            byte2gpio1 = ptr32(self.BYTE2GPIO1)
+            GPIO_OUT1  = ptr32(self.GPIO_OUT1_REG)
+            GPIO_WR_S  = ptr32(self.GPIO_WR_SET)
+            n = 0
+            while n < count:
+                i = 0
+                while i < size:
+                    GPIO_OUT[0] = byte2gpio[ data[i] ]
+                    GPIO_OUT1[0] = byte2gpio1[ data[i] ]
+                    GPIO_WR_S[0] = wr_bit
+                    i += 1
+                n += 1
+            return
+
+        # Register values of color bytes are the same for all pixels
+        value0 = byte2gpio[ data[0] ]
+        n = 0
+        if size == 1:
+            while n < count:
+                GPIO_OUT[0] = value0
+                GPIO_OUT_S[0] = wr_bit
+                n += 1
+            return
+        value1 = byte2gpio[ data[1] ]
+        value2 = byte2gpio[ data[size - 1] ]
+        if size == 2:
+            while n < count:
+                GPIO_OUT[0] = value0
+                GPIO_OUT_S[0] = wr_bit
+                GPIO_OUT[0] = value1
+                GPIO_OUT_S[0] = wr_bit
+                n += 1
+        else:
+            while n < count:
+                GPIO_OUT[0] = value0
+                GPIO_OUT_S[0] = wr_bit
+                GPIO_OUT[0] = value1
+                GPIO_OUT_S[0] = wr_bit
+                GPIO_OUT[0] = value2
+                GPIO_OUT_S[0] = wr_bit
+                n += 1
+
+
+class RECORDING_BUS(ILI9XXX_BUS):
+    """ Records primitives into log: ('command', cmd), ('params', bytes), ('window', x0, y0, x1, y1),
+    ('push', count), ('push_rect', x0, y0, x1, y1), ('push_indexed', bits, x0, y0, x1, y1),
+    ('push_color', color, count), ('read', cmd, count), ('read_rect', x0, y0, x1, y1),
+    ('init_table', size). Primitives are passed to target backend, if it is set.
+    """
+
+    NAME = 'recording'
+
+    def __init__(self, display, target = None, replies = None):
+        """ Constructor
+        Args
+        display (ILI9XXX_8B): Display
+        target (ILI9XXX_BUS or class): Backend that really sends data, a class is created with the display, None - nothing is sent
+        replies (dict): Bytes returned by read() without target, by command, example: {0xD3: b'\\x00\\x94\\x88'}
+        """
+        super().__init__(display)
+        if isinstance(target, type):
+            target = target(display)
+        self.target = target
+        self.replies = replies if replies is not None else {}
+        self.log = []
+
+    def clear(self):
+        """ Clears the log """
+        self.log.clear()
+
+    def begin(self):
+        if self.target:
+            self.target.begin()
+
+    def end(self):
+        if self.target:
+            self.target.end()
+
+    def busy(self):
+        return self.target.busy() if self.target else False
+
+    def wait(self):
+        if self.target:
+            self.target.wait()
+
+    def command(self, cmd):
+        self.log.append(('command', cmd))
+        if self.target:
+            self.target.command(cmd)
+
+    def params(self, data):
+        self.log.append(('params', bytes(data)))
+        if self.target:
+            self.target.params(data)
+
+    def push(self, buffer, start, count):
+        self.log.append(('push', count))
+        if self.target:
+            self.target.push(buffer, start, count)
+
+    def read(self, cmd, count):
+        self.log.append(('read', cmd, count))
+        if self.target:
+            return self.target.read(cmd, count)
+        data = bytearray(count)
+        reply = self.replies.get(cmd, b'')
+        data[:len(reply[:count])] = reply[:count]
+        return data
+
+    def read_rect(self, x0, y0, x1, y1, buffer):
+        self.log.append(('read_rect', x0, y0, x1, y1))
+        if self.target:
+            self.target.read_rect(x0, y0, x1, y1, buffer)
+
+    def window(self, x0, y0, x1, y1):
+        self.log.append(('window', x0, y0, x1, y1))
+        if self.target:
+            self.target.window(x0, y0, x1, y1)
+
+    def push_rect(self, buffer, width, x0, y0, x1, y1, top = 0):
+        self.log.append(('push_rect', x0, y0, x1, y1))
+        if self.target:
+            self.target.push_rect(buffer, width, x0, y0, x1, y1, top)
+
+    def push_indexed(self, buffer, width, bits, palette, x0, y0, x1, y1, top = 0):
+        self.log.append(('push_indexed', bits, x0, y0, x1, y1))
+        if self.target:
+            self.target.push_indexed(buffer, width, bits, palette, x0, y0, x1, y1, top)
+
+    def push_color(self, color, count):
+        self.log.append(('push_color', bytes(color), count))
+        if self.target:
+            self.target.push_color(color, count)
+
+    def init_table(self, table, delay_scale = 100):
+        self.log.append(('init_table', len(table)))
+        if self.target:
+            self.target.init_table(table, delay_scale)
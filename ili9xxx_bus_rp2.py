@@ -0,0 +1,146 @@
+"""
+ILI9XXX_BUS_RP2 PIO + DMA bus backend for 8-bit display-shield v 0.1.3
+
+Raspberry Pi Pico: writes of the 8080 bus are made by a PIO state machine, pixels are fed
+to it from the buffer by DMA. push() returns right away, the CPU is free while the frame is sent.
+Use busy()/wait() before changing the buffer or the pins.
+
+Requirements: data pins D0-D7 on contiguous GPIO (example: [2, 3, 4, 5, 6, 7, 8, 9]), MicroPython with rp2.DMA (1.21+)
+
+Project path: https://github.com/r2d2-arduino/micropython_ili9488_9486_9341_shields
+MIT License
+
+Author: Arthur Derkach
+"""
+import rp2
+import uctypes
+from machine import Pin
+from ili9xxx_bus import ILI9XXX_BUS
+
+@rp2.asm_pio(out_init = (rp2.PIO.OUT_LOW,) * 8, sideset_init = rp2.PIO.OUT_HIGH,
+             out_shiftdir = rp2.PIO.SHIFT_RIGHT, fifo_join = rp2.PIO.JOIN_TX)
+def write_8080():
+    pull()          .side(1) # WR rising edge: display latches the previous byte
+    out(pins, 8)    .side(0) # Next byte on D0-D7, WR low
+
+class PIO_BUS(ILI9XXX_BUS):
+    """ 8080 write bus on PIO state machine, fed by DMA.
+    Commands and parameters are put to the state machine FIFO, reading uses GPIO (Pin).
+    """
+
+    NAME = 'pio'
+
+    PIO_FREQ = const(30_000_000) # 2 instructions per byte: 66 ns write cycle, 15 MB/s
+    PIO_TXF = (0x50200010, 0x50300010) # TX FIFO register of state machine 0 of PIO0, PIO1
+
+    def __init__(self, display, sm_id = 0, freq = PIO_FREQ):
+        """ Constructor
+        Args
+        display (ILI9XXX_8B): Display, pins and settings of the bus
+        sm_id (int): State machine 0-7 (4-7 are on PIO1)
+        freq (int): Frequency of the state machine, Hz
+        """
+        super().__init__(display)
+        self.sm_id = sm_id
+        self.freq = freq
+        self.init_sm()
+
+        # DMA is paced by DREQ of the TX FIFO
+        self.dma = rp2.DMA()
+        self.txf = self.PIO_TXF[sm_id >> 2] + (sm_id & 3) * 4
+        self.treq = (sm_id >> 2) * 8 + (sm_id & 3)
+        self.source = None # Buffer of running transfer, kept from garbage collector
+        self.color = bytearray(4) # Ring of push_color()
+
+    @staticmethod
+    def available(display):
+        return display.controller_name == 'RP2' and display.data_shift >= 0 and hasattr(rp2, 'DMA')
+
+    def init_sm(self):
+        """ (Re)starts the state machine, D0-D7 and WR are switched to PIO """
+        display = self.display
+        self.sm = rp2.StateMachine(self.sm_id, write_8080, freq = self.freq,
+                                   out_base = Pin(display.data_pins[0]), sideset_base = Pin(display.wr_pin))
+        self.sm.active(1)
+
+    def deinit(self):
+        """ Stops the state machine and frees DMA, D0-D7 and WR are switched back to GPIO """
+        self.wait()
+        self.sm.active(0)
+        self.dma.close()
+        display = self.display
+        for pin in display.data_pins:
+            Pin(pin, Pin.OUT, value = 0)
+        display.wr.init(Pin.OUT, value = 1)
+
+    def busy(self):
+        return self.dma.active() or self.sm.tx_fifo() > 0
+
+    def wait(self):
+        while self.busy():
+            pass
+
+    def begin(self):
+        self.wait()
+        self.display.cs.value(0)
+        self.display.dc.value(1)
+
+    def end(self):
+        pass # Transfer can be running, display stays selected
+
+    def command(self, cmd):
+        display = self.display
+        self.wait()
+        display.cs.value(0)
+        display.dc.value(0)
+        self.sm.put(cmd)
+        while self.sm.tx_fifo():
+            pass
+        # The byte is latched 2 PIO cycles after it leaves FIFO, faster than the next line
+        display.dc.value(1)
+
+    def params(self, data):
+        display = self.display
+        self.wait()
+        display.cs.value(0)
+        display.dc.value(1)
+        self.sm.put(data)
+
+    def push(self, buffer, start, count):
+        self.wait()
+        self.source = buffer # Address of the data is given to DMA: no memoryview per push
+        self.dma.config(read = uctypes.addressof(buffer) + start, write = self.txf, count = count,
+                        ctrl = self.dma.pack_ctrl(size = 0, inc_write = False, treq_sel = self.treq),
+                        trigger = True)
+
+    def push_rect(self, buffer, width, x0, y0, x1, y1, top = 0):
+        self.window(x0, y0, x1, y1)
+        row_size = (x1 - x0 + 1) * 2
+        if row_size == width * 2: # Whole rows are one transfer
+            self.push(buffer, (y0 - top) * row_size, row_size * (y1 - y0 + 1))
+        else:
+            for y in range(y0 - top, y1 - top + 1):
+                self.push(buffer, (y * width + x0) * 2, row_size)
+
+    def push_color(self, color, count):
+        if len(color) != 2:
+            return super().push_color(color, count)
+        self.wait()
+        self.color[0] = color[0]
+        self.color[1] = color[1]
+        # Read address wraps on 2 bytes (buffer is 4-byte aligned)
+        self.source = self.color
+        self.dma.config(read = self.color, write = self.txf, count = count * 2,
+                        ctrl = self.dma.pack_ctrl(size = 0, inc_write = False, ring_size = 1,
+                                                  treq_sel = self.treq),
+                        trigger = True)
+
+    def read(self, cmd, count):
+        self.command(cmd)
+        data = self.display.read_bytes(count + 1)[1:]
+        self.init_sm() # read_bytes() took the pins
+        return data
+
+    def read_rect(self, x0, y0, x1, y1, buffer):
+        super().read_rect(x0, y0, x1, y1, buffer)
+        self.init_sm() # read_pixels() took the pins
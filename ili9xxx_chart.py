@@ -0,0 +1,281 @@
+"""
+ILI9XXX_CHART charts for 8-bit display-shield v 0.1.3
+
+* STRIP_CHART - Oscilloscope-style plot of samples: the chart moves by vertical scroll of the panel,
+which is horizontal in landscape rotation (1 or 3). A sample costs one scroll start address
+and one column of the screen pushed through the bus, the rest of the picture is not redrawn.
+Fixed left and right bands of the screen (axis, labels) don't scroll.
+* PLOT - Line and area charts of large arrays: data is reduced to min/max of every column of pixels,
+every column is one window and one push. Time depends on the width of the chart, not on the length of data.
+
+Display: ILI9XXX_8B_DIRECT or ILI9XXX_8B_FB (the chart is sent to the display directly, don't show() over it)
+
+Project path: https://github.com/r2d2-arduino/micropython_ili9488_9486_9341_shields
+MIT License
+
+Author: Arthur Derkach
+"""
+from array import array
+
+@micropython.viper
+def fill_span(column, y0:int, y1:int, color:int):
+    """ Pixels y0..y1 (included, y0 <= y1) of RGB565 column (2 bytes per pixel, as sent to the display) """
+    buf = ptr8(column)
+    hi = (color >> 8) & 0xFF
+    lo = color & 0xFF
+    i = y0 << 1
+    end = (y1 + 1) << 1
+    while i < end:
+        buf[i] = hi
+        buf[i + 1] = lo
+        i += 2
+
+@micropython.viper
+def minmax_h(data, start:int, end:int, result):
+    """ Min and max of data[start:end] of array('h') to result[0], result[1] (array('h')) """
+    src = ptr16(data)
+    lo = 32767
+    hi = -32768
+    i = start
+    while i < end:
+        value = src[i]
+        if value & 0x8000:
+            value -= 0x10000
+        if value < lo:
+            lo = value
+        if value > hi:
+            hi = value
+        i += 1
+    out = ptr16(result)
+    out[0] = lo
+    out[1] = hi
+
+def color565(color):
+    """ RGB565 of (r, g, b) """
+    r, g, b = color
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+class STRIP_CHART:
+    """ Scrolling chart of several traces, new samples appear on the right
+
+    chart = STRIP_CHART(tft, [(255, 255, 0), (0, 255, 255)], 0, 4095, left = 40)
+    while True:
+        chart.add((adc1.read(), adc2.read()))
+    """
+
+    def __init__(self, display, colors, y_min = 0, y_max = 4095, bg = (0, 0, 0),
+                 grid = None, grid_step = 40, left = 0, right = 0):
+        """ Constructor
+        Args
+        display (ILI9XXX_8B): Display in landscape rotation (1 or 3)
+        colors (list): Colors (r, g, b) of traces
+        y_min, y_max (int or float): Values at the bottom and at the top of the chart
+        bg (tuple): Background color (r, g, b)
+        grid (tuple): Grid color (r, g, b) or None
+        grid_step (int): Pixels between grid lines (horizontal), samples between them (vertical)
+        left (int): Fixed columns on the left (axis band)
+        right (int): Fixed columns on the right
+        """
+        if not display.rotation & 1:
+            raise ValueError("Strip chart needs landscape rotation: 1 or 3")
+
+        self.display = display
+        self.colors = [color565(color) for color in colors]
+        self.y_min = y_min
+        self.y_max = y_max
+        self.height = display.height
+        self.grid_step = grid_step
+
+        # Columns of the screen are rows of the panel, rotation 3 (MY) counts them from the right
+        self.reverse = bool(display.rotation_madctl(display.rotation) & 0x80)
+        self.rows = display.width
+        self.top_fix = right if self.reverse else left
+        self.bot_fix = left if self.reverse else right
+        self.count = self.rows - left - right # Columns of the ring
+        if self.count < 2:
+            raise ValueError("No space for the chart")
+
+        # Column templates: background with grid dots, and grid line
+        self.column = bytearray(self.height * 2)
+        self.background = bytearray(self.height * 2)
+        self.grid_line = None
+        bg565 = color565(bg)
+        fill_span(self.background, 0, self.height - 1, bg565)
+        if grid is not None:
+            grid565 = color565(grid)
+            self.grid_line = bytearray(self.height * 2)
+            fill_span(self.grid_line, 0, self.height - 1, grid565)
+            for y in range(self.height - 1, -1, -grid_step):
+                fill_span(self.background, y, y, grid565)
+        self.bg = bytes((bg565 >> 8, bg565 & 0xFF))
+
+        self.last = [0] * len(colors) # y of previous samples, traces are joined by vertical spans
+        self.samples = 0
+        self.clear()
+
+    def clear(self):
+        """ Clears the chart, scroll starts again """
+        display = self.display
+        display.vert_scroll(self.top_fix, self.count, self.bot_fix)
+        self.pos = 0 # Place of the next sample in the ring
+        self.samples = 0
+        x0 = self.rows - self.top_fix - self.count if self.reverse else self.top_fix
+        bus = display.bus
+        bus.begin()
+        bus.window(x0, 0, x0 + self.count - 1, self.height - 1)
+        bus.push_color(self.bg, self.count * self.height)
+        bus.end()
+        display.vert_scroll_start_address(self.top_fix)
+
+    def value_y(self, value):
+        """ Row of the screen of a value, limited by the chart """
+        y = int((self.y_max - value) * (self.height - 1) / (self.y_max - self.y_min))
+        return min(max(y, 0), self.height - 1)
+
+    def add(self, values):
+        """ Adds a sample of every trace: the chart moves left by one column
+        Args
+        values (list or tuple): Values of traces, in order of colors
+        """
+        column = self.column
+        if self.grid_line is not None and self.samples % self.grid_step == 0:
+            column[:] = self.grid_line
+        else:
+            column[:] = self.background
+
+        last = self.last
+        for i in range(len(self.colors)):
+            y = self.value_y(values[i])
+            y0 = last[i] if self.samples else y
+            if y0 > y:
+                fill_span(column, y, y0, self.colors[i])
+            else:
+                fill_span(column, y0, y, self.colors[i])
+            last[i] = y
+        self.samples += 1
+
+        # Newest column is at the right end of the scroll area
+        row = self.top_fix + self.pos
+        if self.reverse:
+            x = self.rows - 1 - row
+            self.pos = (self.pos - 1) % self.count
+            start = row
+        else:
+            x = row
+            self.pos = (self.pos + 1) % self.count
+            start = self.top_fix + self.pos
+
+        display = self.display
+        bus = display.bus
+        bus.begin()
+        bus.window(x, 0, x, self.height - 1)
+        bus.push(column, 0, len(column))
+        bus.end()
+        display.vert_scroll_start_address(start)
+
+    def deinit(self):
+        """ Turns off the scroll, the whole screen is fixed again """
+        display = self.display
+        display.vert_scroll(0, self.rows, 0)
+        display.vert_scroll_start_address(0)
+
+
+class PLOT:
+    """ Line and area charts of arrays (array('h'), array('f'), list) with min/max decimation
+
+    plot = PLOT(tft, 0, 40, tft.width, 200)
+    plot.draw([samples], [(255, 255, 0)])
+    """
+
+    def __init__(self, display, x, y, width, height, bg = (0, 0, 0)):
+        """ Constructor
+        Args
+        display (ILI9XXX_8B): Display
+        x, y (int): Top left corner of the chart
+        width, height (int): Size of the chart
+        bg (tuple): Background color (r, g, b)
+        """
+        self.display = display
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        # Columns are filled in turn: one is built while the other is sent in background (PIO_BUS)
+        self.columns = (bytearray(height * 2), bytearray(height * 2))
+        self.background = bytearray(height * 2)
+        fill_span(self.background, 0, height - 1, color565(bg))
+        self.result = array('h', (0, 0)) # Min and max of a column of array('h')
+
+    def bucket(self, data, start, end):
+        """ Min and max of data[start:end]
+        Return (tuple): min, max
+        """
+        if isinstance(data, array) and data.typecode == 'h':
+            minmax_h(data, start, end, self.result)
+            return self.result[0], self.result[1]
+        lo = hi = data[start]
+        for i in range(start + 1, end):
+            value = data[i]
+            if value < lo:
+                lo = value
+            elif value > hi:
+                hi = value
+        return lo, hi
+
+    def draw(self, series, colors, y_min = None, y_max = None, area = False):
+        """ Draws data sets over the whole width of the chart, the chart is cleared
+        Args
+        series (list): Data sets: array('h'), array('f') or list of numbers, empty ones are not drawn
+        colors (list): Colors (r, g, b) of data sets
+        y_min, y_max (int or float): Values at the bottom and at the top, None - range of data
+        area (bool): Fill from the base line (0 or the bottom) to the values
+        """
+        if not [data for data in series if len(data)]:
+            return # No data, the chart is kept
+
+        if y_min is None or y_max is None:
+            lo = hi = None
+            for data in series:
+                if not len(data):
+                    continue
+                data_lo, data_hi = self.bucket(data, 0, len(data))
+                lo = data_lo if lo is None else min(lo, data_lo)
+                hi = data_hi if hi is None else max(hi, data_hi)
+            y_min = lo if y_min is None else y_min
+            y_max = hi if y_max is None else y_max
+        if y_max == y_min:
+            y_max = y_min + 1
+
+        bottom = self.height - 1
+        scale = bottom / (y_max - y_min)
+        base = bottom if y_min >= 0 else 0 if y_max <= 0 else int(y_max * scale)
+        colors = [color565(color) for color in colors]
+
+        columns = self.columns
+        bus = self.display.bus
+        bus.begin()
+        for col in range(self.width):
+            column = columns[col & 1] # push() of the other column waits for this one to be sent
+            column[:] = self.background
+            for i in range(len(series)):
+                data = series[i]
+                count = len(data)
+                if not count:
+                    continue
+                start = col * count // self.width
+                end = max((col + 1) * count // self.width, start + 1)
+                if col and not area:
+                    start = max(start - 1, 0) # Joined with the last value of previous column
+                lo, hi = self.bucket(data, start, end)
+
+                y0 = min(max(int((y_max - hi) * scale), 0), bottom)
+                y1 = min(max(int((y_max - lo) * scale), 0), bottom)
+                if area:
+                    y0 = min(y0, base)
+                    y1 = max(y1, base)
+                fill_span(column, y0, y1, colors[i])
+
+            x = self.x + col
+            bus.window(x, self.y, x, self.y + bottom)
+            bus.push(column, 0, len(column))
+        bus.end()
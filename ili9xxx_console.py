@@ -0,0 +1,184 @@
+"""
+ILI9XXX_CONSOLE text console on hardware scroll for 8-bit display-shield v 0.1.1
+
+Text lines are kept in a ring of GRAM rows. A new line moves the scroll start address
+(vert_scroll_start_address) and only the strip of the new line is cleared and drawn.
+Works as os.dupterm() stream: REPL and print() output go to the display.
+
+Display: ILI9XXX_8B_DIRECT, or ILI9XXX_8B_FB (show() is called after every write), rotation 0
+Font: font of tft_draw (get_ch(), height())
+
+Project path: https://github.com/r2d2-arduino/micropython_ili9488_9486_9341_shields
+MIT License
+
+Author: Arthur Derkach
+"""
+import io
+
+class CONSOLE(io.IOBase):
+    """ Log / terminal console in the scrolling area of the display
+
+    console = CONSOLE(tft, font, tft.rgb(0, 255, 0))
+    console.write('Hello\\n')
+    os.dupterm(console)
+    """
+
+    def __init__(self, display, font, color = 0xFFFF, bg = 0, top = 0, bottom = 0):
+        """ Constructor
+        Args
+        display (ILI9XXX_8B_DIRECT or ILI9XXX_8B_FB): Display with set_font(), draw_text() and fill_rect()
+        font (module): Font of the text
+        color (int): Text color
+        bg (int): Background color
+        top (int): Fixed rows above the console (title, status bar)
+        bottom (int): Fixed rows below the console, the rest of rows which are less than a line is added
+        """
+        self.display = display
+        self.font = font
+        self.color = color
+        self.bg = bg
+        self.show = getattr(display, 'show', None) # Framebuffer sends drawn strips
+
+        if display.rotation:
+            print('Hardware scroll moves rows of the panel, the console needs rotation 0')
+
+        self.line_height = font.height()
+        self.top = top
+        self.rows = (display.height - top - bottom) // self.line_height # Lines of the ring
+        if self.rows < 1:
+            raise ValueError("No space for a line of the console")
+
+        display.vert_scroll(top, self.rows * self.line_height, display.height - top - self.rows * self.line_height)
+
+        self.lines = [''] * self.rows # Text of lines in GRAM order
+        self.first = 0 # Line of the ring at the top of the console
+        self.clear()
+
+    def clear(self):
+        """ Clears the console, the cursor goes to the first line """
+        for i in range(self.rows):
+            self.lines[i] = ''
+        self.first = 0
+        self.row = 0 # Line of the cursor, counted from the top of the console
+        self.x = 0
+        self.cr = False # Carriage return: text of the line is replaced by next characters
+        self.escape = False # Skipping ANSI escape sequence of REPL
+        self.display.fill_rect(0, self.top, self.display.width, self.rows * self.line_height, self.bg)
+        self.display.vert_scroll_start_address(self.top)
+        if self.show:
+            self.show()
+
+    def line_y(self, row):
+        """ Row of GRAM of the line
+        Args
+        row (int): Line, counted from the top of the console
+        Return (int): y of the line
+        """
+        return self.top + (self.first + row) % self.rows * self.line_height
+
+    def new_line(self):
+        """ Moves the cursor to the next line, on the last line the console is scrolled up by one line """
+        self.x = 0
+        self.cr = False
+        if self.row < self.rows - 1:
+            self.row += 1
+            return
+
+        # Top line goes out and its strip of GRAM becomes the new bottom line
+        self.first = (self.first + 1) % self.rows
+        self.clear_line()
+        self.display.vert_scroll_start_address(self.line_y(0))
+
+    def clear_line(self):
+        """ Clears text of the cursor line """
+        self.lines[(self.first + self.row) % self.rows] = ''
+        self.display.fill_rect(0, self.line_y(self.row), self.display.width, self.line_height, self.bg)
+
+    def backspace(self):
+        """ Removes the last character of the cursor line """
+        index = (self.first + self.row) % self.rows
+        text = self.lines[index]
+        if not text:
+            return
+        width = self.font.get_ch(text[-1])[2]
+        self.x = max(self.x - width, 0)
+        self.lines[index] = text[:-1]
+        self.display.fill_rect(self.x, self.line_y(self.row), width, self.line_height, self.bg)
+
+    def put_text(self, text):
+        """ Draws text from the cursor, wraps it by the width of the display
+        Args
+        text (str): Text without control characters
+        """
+        font = self.font
+        width = self.display.width
+        start = 0
+        x = self.x
+        for i in range(len(text)):
+            char_width = font.get_ch(text[i])[2]
+            if x + char_width > width and x:
+                self.draw_part(text[start:i])
+                self.new_line()
+                start = i
+                x = 0
+            x += char_width
+        self.draw_part(text[start:])
+
+    def draw_part(self, text):
+        """ Draws text, which fits into the cursor line """
+        if not text:
+            return
+        if self.cr: # Line is written again after '\r'
+            self.clear_line()
+            self.cr = False
+        index = (self.first + self.row) % self.rows
+        self.display.set_font(self.font) # Other code draws with own fonts, widths are of the console font
+        self.display.draw_text(text, self.x, self.line_y(self.row), self.color)
+        self.lines[index] += text
+        for ch in text:
+            self.x += self.font.get_ch(ch)[2]
+
+    def write(self, data):
+        """ Writes text to the console (stream of os.dupterm and print(file = console))
+        Args
+        data (str, bytes or bytearray): Text, '\\n', '\\r', '\\b' move the cursor, ANSI escape sequences are skipped
+        Return (int): Count of written bytes or characters
+        """
+        text = data if isinstance(data, str) else bytes(data).decode('utf-8', 'ignore')
+        start = 0
+        for i in range(len(text)):
+            ch = text[i]
+            if self.escape:
+                if 'A' <= ch <= 'Z' or 'a' <= ch <= 'z':
+                    self.escape = False
+                start = i + 1
+            elif ch < ' ':
+                self.put_text(text[start:i])
+                start = i + 1
+                if ch == '\n':
+                    self.new_line()
+                elif ch == '\r':
+                    self.x = 0
+                    self.cr = True
+                elif ch == '\b':
+                    self.backspace()
+                elif ch == '\x1b':
+                    self.escape = True
+        self.put_text(text[start:])
+
+        if self.show:
+            self.show()
+        return len(data)
+
+    def readinto(self, buf):
+        """ Console has no input, REPL keeps reading UART / USB """
+        return None
+
+    def ioctl(self, op, arg):
+        return 0
+
+    def deinit(self):
+        """ Turns off the scroll, the whole screen is fixed again. Call os.dupterm(None) before it """
+        display = self.display
+        display.vert_scroll(0, display.height, 0)
+        display.vert_scroll_start_address(0)
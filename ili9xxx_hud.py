@@ -0,0 +1,131 @@
+"""
+ILI9XXX_HUD performance overlay for 8-bit display-shield v 0.1.1
+
+Shows in a corner of the screen: frames per second, time of the last show(), speed of show() (MB/s: pixel bytes
+of its windows per time inside show, with background sending (PIO_BUS, double buffer) - until show() returns),
+or kilobytes per frame of a display without show(), windows opened per frame and free memory.
+Numbers come from profiler() of the display (show and set_window only), it is started again if it was stopped.
+The corner is redrawn a few times per second by one window and one push, the rest of the screen is not touched.
+
+Display: ILI9XXX_8B_DIRECT or ILI9XXX_8B_FB in 16-bit color (the corner is sent to the display directly,
+keep it out of animated regions of the framebuffer)
+
+hud = HUD(tft, corner = 1)
+while True:
+    ...           # Drawing of a frame
+    tft.show()
+    hud.update()  # Once per frame
+
+Project path: https://github.com/r2d2-arduino/micropython_ili9488_9486_9341_shields
+MIT License
+
+Author: Arthur Derkach
+"""
+from time import ticks_ms, ticks_diff
+import framebuf
+import gc
+
+HUD_OPS = ('show', 'set_window')
+LINES = const(5)
+LINE_HEIGHT = const(10) # 8x8 font of framebuf and a gap
+WIDTH = const(96)       # 12 characters
+
+def color565_swapped(color):
+    """ RGB565 of (r, g, b) with swapped bytes: framebuf keeps the low byte first, the display takes the high one """
+    r, g, b = color
+    value = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+    return ((value & 0xFF) << 8) | (value >> 8)
+
+class HUD:
+    """ Overlay of performance counters """
+
+    def __init__(self, display, corner = 0, color = (255, 255, 0), bg = (0, 0, 0), interval_ms = 250):
+        """ Constructor
+        Args
+        display (ILI9XXX_8B_DIRECT or ILI9XXX_8B_FB): Display
+        corner (int): 0 - top left, 1 - top right, 2 - bottom left, 3 - bottom right
+        color (tuple): Text color (r, g, b)
+        bg (tuple): Background color (r, g, b)
+        interval_ms (int): Shortest time between redraws
+        """
+        self.display = display
+        self.width = WIDTH
+        self.height = LINES * LINE_HEIGHT
+        self.x = display.width - self.width if corner & 1 else 0
+        self.y = display.height - self.height if corner & 2 else 0
+        self.color = color565_swapped(color)
+        self.bg = color565_swapped(bg)
+        self.interval_ms = interval_ms
+
+        self.buffer = bytearray(self.width * self.height * 2)
+        self.fb = framebuf.FrameBuffer(self.buffer, self.width, self.height, framebuf.RGB565)
+
+        # Counters of the profiler, own one is started if it is off
+        self.own_profiler = display.profile_stats is None
+        if self.own_profiler:
+            display.profiler(True, HUD_OPS)
+        self.reset()
+
+    def reset(self):
+        """ Starts a new interval of counting """
+        display = self.display
+        self.frames = 0
+        self.start = ticks_ms()
+        self.bytes = display.profile_bytes
+        self.windows = display.profile_windows
+        show = display.profile_stats.get('show')
+        self.show_us = show[1] if show else 0
+        self.show_bytes = show[3] if show else 0
+
+    def update(self):
+        """ Counts a frame and redraws the overlay, if the interval has passed """
+        self.frames += 1
+        elapsed = ticks_diff(ticks_ms(), self.start)
+        if elapsed < self.interval_ms:
+            return
+
+        display = self.display
+        if display.profile_stats is None: # Stopped by profiler(False), counters are lost
+            display.profiler(True, HUD_OPS)
+            self.own_profiler = True
+            self.reset()
+            return
+        if display.profile_windows < self.windows: # Restarted by profiler(True)
+            self.reset()
+            return
+
+        show = display.profile_stats.get('show')
+        fps = self.frames * 1000 / elapsed
+        windows = (display.profile_windows - self.windows) // self.frames
+        if show:
+            show_us = show[1] - self.show_us
+            speed = 'MB/s {:.2f}'.format((show[3] - self.show_bytes) / show_us if show_us > 0 else 0)
+        else:
+            speed = 'KB/f {:.1f}'.format((display.profile_bytes - self.bytes) / self.frames / 1024)
+
+        fb = self.fb
+        fb.fill(self.bg)
+        fb.text('FPS {:.1f}'.format(fps), 2, 1, self.color)
+        fb.text('show {}'.format('{:.1f}ms'.format(show[4] / 1000) if show and show[0] else '-'), 2, 1 + LINE_HEIGHT, self.color)
+        fb.text(speed, 2, 1 + LINE_HEIGHT * 2, self.color)
+        fb.text('win {}'.format(windows), 2, 1 + LINE_HEIGHT * 3, self.color)
+        fb.text('mem {}'.format(gc.mem_free()), 2, 1 + LINE_HEIGHT * 4, self.color)
+        self.draw()
+        self.reset() # Own push is not counted
+
+    def draw(self):
+        """ Sends the overlay to its corner """
+        display = self.display
+        if hasattr(display, 'fence'):
+            display.wait() # show() of the framebuffer can be sent in background
+        bus = display.bus
+        bus.begin()
+        bus.window(self.x, self.y, self.x + self.width - 1, self.y + self.height - 1)
+        bus.push(self.buffer, 0, len(self.buffer))
+        bus.end()
+        bus.wait()
+
+    def deinit(self):
+        """ Stops the own profiler, the overlay stays on the screen until it is drawn over """
+        if self.own_profiler:
+            self.display.profiler(False)
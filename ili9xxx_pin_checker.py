@@ -1,5 +1,5 @@
 """
-ILI9XXX_PIN_CHECKER for 8-bit shield v 0.2.3
+ILI9XXX_PIN_CHECKER for 8-bit shield v 0.2.5
 
 Project path: https://github.com/r2d2-arduino/micropython_ili9488_9486_9341_shields
 MIT License
@@ -47,13 +47,15 @@ class ILI9XXX_PIN_CHECKER:
         if controller == 'ESP32':
             self.INVALID_PINS = [0, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47]
         elif controller == 'ESP32-S3':
-            self.INVALID_PINS = [0, 12, 26, 27, 28, 29, 30, 31, 32, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47]
+            self.INVALID_PINS = [0, 12, 26, 27, 28, 29, 30, 31, 32, 34, 35, 36, 37] # SPI flash and octal PSRAM
         elif controller == 'RP2':
             self.INVALID_PINS = [ 23, 25 ]
         else: #Unknown controller
             self.INVALID_PINS = []
         
         self.check_pins( data_pins, cs_pin, dc_pin, wr_pin, rd_pin, rst_pin )
+
+        self.check_bus_layout( data_pins, dc_pin, wr_pin )
         
         self.test_control_pins()
 
@@ -77,6 +79,34 @@ class ILI9XXX_PIN_CHECKER:
             if pin in self.INVALID_PINS:
                 raise ValueError(f"Pin {pin} is not suitable for connection. Please use another GPIO.")
 
+    def check_bus_layout(self, data_pins, dc_pin: int, wr_pin: int):
+        """
+        Reports the fast path, that the library will use for these pins.
+        
+        Params:
+        data_pins (list): List of data bus pin numbers for D0, D1,..., D7
+        dc_pin, wr_pin (int): Pin numbers for DC, WR
+        """
+        bus_pins = list(data_pins) + [dc_pin, wr_pin]
+        high_pins = [pin for pin in bus_pins if pin > 31]
+        if not high_pins:
+            print("Bus pins: GPIO0-31, one register")
+        elif len(high_pins) == len(bus_pins):
+            print("Bus pins: GPIO32-48, one register")
+        else:
+            print("Bus pins: split between GPIO0-31 and GPIO32-48, both registers are written (slower, no direct drawing)")
+
+        first = data_pins[0]
+        contiguous = (first & 31) <= 24 and not (0 < len(high_pins) < len(bus_pins))
+        for i in range(8):
+            if data_pins[i] != first + i:
+                contiguous = False
+
+        if contiguous:
+            print(f"Data pins: contiguous GPIO{first}-{first + 7}, fast path without BYTE2GPIO table")
+        else:
+            print("Data pins: not contiguous, BYTE2GPIO table is used (D0-D7 on consecutive GPIOs would be faster)")
+
     def test_control_pins(self):
         """
         Checks the correct operation of control pins (CS, DC, WR, RD, RST)
@@ -0,0 +1,176 @@
+"""
+ILI9XXX_TRACE render trace for 8-bit display-shield v 0.1.1
+
+Records begin and end of drawing calls (operation, rectangle, pixel bytes, time) into a ring
+of fixed size and exports them as Chrome trace events (JSON). The file is opened on the desktop
+in chrome://tracing or https://ui.perfetto.dev: show() slices, windows, text, images and touch sampling
+on the time line, nested calls below the outer ones.
+
+Methods are wrapped on the traced objects only, deinit() returns the methods wrapped before (profiler() of the display).
+
+trace = TRACE(512)
+trace.instrument(tft)                          # ILI9XXX_8B_DIRECT or ILI9XXX_8B_FB and its bus
+trace.instrument(touch, TOUCH_OPS, 'touch')    # ResistiveTouchScreen
+...
+trace.export('trace.json')                     # Or over REPL: mpremote exec "trace.export()" > trace.json
+
+Project path: https://github.com/r2d2-arduino/micropython_ili9488_9486_9341_shields
+MIT License
+
+Author: Arthur Derkach
+"""
+from time import ticks_us, ticks_diff
+from array import array
+import sys
+
+# Drawing calls of the display, 'bus.' - methods of the bus backend
+DISPLAY_OPS = ('show', 'show_region', 'push_rect', 'render_band', 'set_window', 'bus.window',
+               'fill', 'fill_rect', 'draw_text', 'draw_bitmap', 'draw_bmp', 'draw_raw_image')
+TOUCH_OPS = ('read_touch',)
+
+# Positions of rectangle arguments: x, y, width, height or x, y
+RECT_ARGS = { 'show_region': (0, 1, 2, 3), 'fill_rect': (0, 1, 2, 3), 'draw_raw_image': (1, 2, 3, 4),
+              'draw_text': (1, 2), 'draw_bitmap': (1, 2), 'draw_bmp': (1, 2) }
+# Operations with x0, y0, x1, y1 (included), windows are counted as pixel bytes
+WINDOW_OPS = ('set_window', 'bus.window', 'push_rect')
+
+FIELDS = const(8) # Operation, x, y, w, h, bytes, begin, end
+
+class TRACE:
+    """ Ring of complete events: the oldest ones are overwritten """
+
+    def __init__(self, size = 256):
+        """ Constructor
+        Args
+        size (int): Events in the ring, 32 bytes per event
+        """
+        self.size = size
+        self.records = array('i', bytes(size * FIELDS * 4))
+        self.names = []   # Operations, index is kept in records
+        self.threads = [] # Names of traced objects, index is tid
+        self.wrapped = [] # (object, method name, previous method) of instrument()
+        self.bytes = 0    # Pixel bytes of opened windows
+        self.counted = True
+        self.clear()
+
+    def clear(self):
+        """ Forgets recorded events """
+        self.pos = 0
+        self.count = 0
+
+    def instrument(self, obj, ops = DISPLAY_OPS, thread = 'display'):
+        """ Wraps methods of an object, missing methods are skipped
+        Args
+        obj (object): Display (ILI9XXX_8B_DIRECT, ILI9XXX_8B_FB) or touch screen (ResistiveTouchScreen)
+        ops (tuple): Method names, 'bus.window' - method of obj.bus
+        thread (string): Line of the object on the time line
+        Return (list): Wrapped names
+        """
+        tid = len(self.threads)
+        self.threads.append(thread)
+        pixel = 3 if getattr(obj, 'pixel_format', 0x55) in (0x66, 0x77) else 2
+        wrapped = []
+        for name in ops:
+            target = obj
+            attr = name
+            if name.startswith('bus.'):
+                target = getattr(obj, 'bus', None)
+                attr = name[4:]
+            method = getattr(target, attr, None)
+            if method is None:
+                continue
+            if name not in self.names:
+                self.names.append(name)
+            setattr(target, attr, self.wrap(name, method, tid, pixel))
+            self.wrapped.append((target, attr, method))
+            wrapped.append(name)
+        return wrapped
+
+    def wrap(self, name, method, tid, pixel):
+        """ Wrapper of a method for instrument()
+        Return (function): Method with recording
+        """
+        op = self.names.index(name) | (tid << 16)
+        rect = RECT_ARGS.get(name)
+        window = name in WINDOW_OPS
+        records = self.records
+
+        def wrapper(*args, **kwargs):
+            start_bytes = self.bytes
+            begin = ticks_us()
+            if window:
+                self.counted = False
+            result = method(*args, **kwargs)
+            end = ticks_us()
+
+            x = y = w = h = 0
+            if window:
+                x = args[0]
+                y = args[1]
+                w = args[2] - x + 1
+                h = args[3] - y + 1
+                if not self.counted: # Windows of the bus through set_window() are counted once
+                    self.bytes += w * h * pixel
+                    self.counted = True
+            elif rect is not None and len(args) > rect[-1]:
+                x = args[rect[0]]
+                y = args[rect[1]]
+                if len(rect) == 4:
+                    w = args[rect[2]]
+                    h = args[rect[3]]
+
+            i = self.pos * FIELDS
+            records[i] = op
+            records[i + 1] = int(x)
+            records[i + 2] = int(y)
+            records[i + 3] = int(w)
+            records[i + 4] = int(h)
+            records[i + 5] = self.bytes - start_bytes
+            records[i + 6] = begin
+            records[i + 7] = end
+            self.pos = (self.pos + 1) % self.size
+            if self.count < self.size:
+                self.count += 1
+            return result
+        return wrapper
+
+    def export(self, filename = None):
+        """ Writes events as Chrome trace JSON, time in us from the oldest event
+        Args
+        filename (string): JSON file, None - printed to REPL (sys.stdout)
+        """
+        records = self.records
+        first = (self.pos - self.count) % self.size
+        base = records[first * FIELDS + 6]
+        for n in range(self.count): # Nested calls end earlier, but begin later than outer ones
+            begin = records[(first + n) % self.size * FIELDS + 6]
+            if ticks_diff(begin, base) < 0:
+                base = begin
+
+        stream = open(filename, 'w') if filename else sys.stdout
+        stream.write('{"traceEvents":[\n')
+        for tid in range(len(self.threads)):
+            stream.write('{"name":"thread_name","ph":"M","pid":1,"tid":%d,"args":{"name":"%s"}},\n'
+                         % (tid, self.threads[tid]))
+        for n in range(self.count):
+            i = (first + n) % self.size * FIELDS
+            op = records[i]
+            name = self.names[op & 0xFFFF]
+            stream.write('{"name":"%s","ph":"X","pid":1,"tid":%d,"ts":%d,"dur":%d,"args":{' %
+                         (name, op >> 16, ticks_diff(records[i + 6], base), ticks_diff(records[i + 7], records[i + 6])))
+            if name in WINDOW_OPS or len(RECT_ARGS.get(name, ())) == 4:
+                stream.write('"x":%d,"y":%d,"w":%d,"h":%d,' % (records[i + 1], records[i + 2], records[i + 3], records[i + 4]))
+            elif name in RECT_ARGS:
+                stream.write('"x":%d,"y":%d,' % (records[i + 1], records[i + 2]))
+            stream.write('"bytes":%d}}%s\n' % (records[i + 5], ',' if n < self.count - 1 else ''))
+        stream.write('],"displayTimeUnit":"ms"}\n')
+        if filename:
+            stream.close()
+
+    def deinit(self):
+        """ Removes wrappers, methods of traced objects are called as before instrument() """
+        for target, attr, previous in reversed(self.wrapped):
+            delattr(target, attr)
+            if getattr(target, attr) != previous: # Wrapper on the object (profiler), not the class method
+                setattr(target, attr, previous)
+        self.wrapped.clear()
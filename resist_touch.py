@@ -1,5 +1,5 @@
 """
-resist_touch v 0.3.2
+resist_touch v 0.3.4
 
 Project path: https://github.com/r2d2-arduino/micropython_ili9488_9486_9341_shields
 
@@ -9,6 +9,11 @@ Author: Arthur Derkach
 from machine import Pin, ADC
 from time import sleep_ms, sleep_us, ticks_us
 
+def div_trunc(a, b):
+    """ a / b rounded toward zero as int(a / b), in integers: no float objects """
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
 class ResistiveTouchScreen:
     
     NUM_SAMPLES = const(11) # Number of attempts to find the correct value
@@ -82,6 +87,7 @@ class ResistiveTouchScreen:
         self.prev_y = -1
         
         self._sample_buf = [0] * self.NUM_SAMPLES
+        self._point = [0, 0] # Values of read_touch() and read_coordinats() before they are returned
         
         self.reset_pins()
         
@@ -142,10 +148,28 @@ class ResistiveTouchScreen:
         # Calculate pressure using correct ADC maximum
         return self.adc_max - z2 + z1    
 
+    @staticmethod
+    def set_point(point, x, y):
+        """ Writes X & Y into the list of *_into() functions
+        Return (list): point
+        """
+        point[0] = x
+        point[1] = y
+        return point
+
     def read_touch(self):
         """ Read ADC values of touch. Exclude noise touches. 
         Return (int, int): X & Y adc values
         """
+        point = self.read_touch_into(self._point)
+        return point[0], point[1]
+
+    def read_touch_into(self, point):
+        """ read_touch() without allocation, for loops of drawing
+        Args
+        point (list): X & Y adc values are written to it, example: [0, 0]
+        Return (list): point
+        """
         min_lvl, max_lvl = self.ADC_LEVEL
         noise_lvl, noise_press = self.NOISE
         adc_type = self.adc_type
@@ -154,21 +178,19 @@ class ResistiveTouchScreen:
         z = self.read_z()
         
         if z < noise_press:
-            return -noise_press, -noise_press
+            return self.set_point(point, -noise_press, -noise_press)
         
         sambuf = self._sample_buf
-        readx = self.read_x
-        ready = self.read_y
         #Taking multiple measurements to choose an average X
         for i in range(num_samp):
-            sambuf[i] = readx()
+            sambuf[i] = self.read_x()
         
         sambuf.sort()
         x = sambuf[ num_samp // 2 ]
         
         #Taking multiple measurements to choose an average Y
         for i in range( num_samp ):
-            sambuf[i] = ready()            
+            sambuf[i] = self.read_y()
         sambuf.sort()
         y = sambuf[ num_samp // 2 ]
         
@@ -183,9 +205,9 @@ class ResistiveTouchScreen:
             if abs(sum_xy - prev_sum) < noise_lvl:
                 if self.auto_calibration:
                     self.auto_calibrate(x, y)
-                return x, y
+                return self.set_point(point, x, y)
 
-        return -noise_lvl, -noise_lvl
+        return self.set_point(point, -noise_lvl, -noise_lvl)
       
     def set_rotation(self, rotation):
         """ Set orientation for Toushscreen
@@ -214,6 +236,40 @@ class ResistiveTouchScreen:
         x_pix = int( x_adc / self.x_coef - self.x_corr )
         y_pix = int( y_adc / self.y_coef - self.y_corr )
 
+        point = self.screen_point(self._point, x_pix, y_pix)
+        return point[0], point[1]
+
+    def read_coordinats_into(self, point):
+        """ read_coordinats() without allocation, for loops of drawing.
+        Pixels are calculated in integers, rounding of floats in read_coordinats() can differ by 1 pixel
+        Args
+        point (list): X & Y coordinates in pixels are written to it, example: [0, 0]
+        Return (list): point
+        """
+        noise_lvl = self.NOISE[0]
+
+        self.read_touch_into(point)
+        x_adc = point[0]
+        y_adc = point[1]
+
+        if x_adc < 0 or y_adc < 0:
+            return self.set_point(point, -noise_lvl, -noise_lvl)
+
+        # adc / coef - corr of calc_coefs()
+        x_min = self.X_CALIB[0]
+        y_min = self.Y_CALIB[0]
+        x_pix = div_trunc((x_adc - x_min) * self.x_len, self.X_CALIB[1] - x_min)
+        y_pix = div_trunc((y_adc - y_min) * self.y_len, self.Y_CALIB[1] - y_min)
+
+        return self.screen_point(point, x_pix, y_pix)
+
+    def screen_point(self, point, x_pix, y_pix):
+        """ Pixels of the touch plates to X & Y of the screen in current rotation
+        Args
+        point (list): X & Y are written to it
+        x_pix, y_pix (int): Pixels along X and Y plates
+        Return (list): point
+        """
         revert = self.revert 
         
         if self.rotation & 1: # for 90 & 270 degress
@@ -232,7 +288,7 @@ class ResistiveTouchScreen:
             if x_dir == 0: # down -> up      
                 x_coord = self.x_len - x_pix
                 
-            return y_coord, x_coord
+            return self.set_point(point, y_coord, x_coord)
         else:
             if x_dir == 3: # left <- right
                 x_coord = self.x_len - x_pix
@@ -240,7 +296,7 @@ class ResistiveTouchScreen:
             if y_dir == 0: # down -> up      
                 y_coord = self.y_len - y_pix
                 
-            return x_coord, y_coord            
+            return self.set_point(point, x_coord, y_coord)
         
     def listening(self, delay = 10):
         """ Listening of touches
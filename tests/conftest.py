@@ -0,0 +1,52 @@
+"""
+Tests of the library on the emulated controller and display (tools/emulator), CPython 3.8+ with pytest.
+tft_draw is not a part of this repository, it must be on the path:
+
+PYTHONPATH=../tft_draw python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'tools', 'emulator'))
+sys.path.insert(1, ROOT)
+
+import ili9xxx_emu
+
+# const, ptr8, micropython.viper, machine and time functions are needed before the library is imported
+ili9xxx_emu.install()
+
+
+@pytest.fixture
+def emulate(monkeypatch):
+    """ Return (function): install(controller, model, wiring) - new emulated display, returns the panel """
+    monkeypatch.chdir(ROOT) # resources/ of the examples
+
+    def install(controller = 'ESP32-S3', model = 0x9341, wiring = None):
+        from ili9xxx_8b import ILI9XXX_8B
+        ILI9XXX_8B.CONTROLLER_NAME = None # Detected again for the new controller
+        return ili9xxx_emu.install(controller, model, wiring)
+    return install
+
+
+def wiring(controller = 'ESP32-S3'):
+    """ Return (tuple): data_pins, cs, dc, wr, rd, rst of the examples """
+    return ili9xxx_emu.WIRING[controller]
+
+
+def color_at(panel, x, y):
+    """ Color of a pixel in GRAM, at the position of the current rotation
+    Return (int): RGB565
+    """
+    offset = panel.gram_offset(x, y)
+    r, g, b = panel.gram[offset: offset + 3]
+    if not panel.madctl & 0x08: # RGB order on BGR glass
+        r, b = b, r
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+def rgb565(r, g, b):
+    """ Return (int): RGB565 of a color, as color_at() returns it """
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
@@ -0,0 +1,126 @@
+"""
+Frames of drawing and touch must not make garbage: gc.collect() would pause an animation.
+ili9xxx_benchmark.check_alloc() compares gc.mem_alloc() with collection off, like on the board.
+The emulator counts every allocation of the frame in gc.mem_alloc(), also garbage freed at once
+by CPython, and keeps allocating lines in ili9xxx_emu.HEAP.lines for the report.
+"""
+import pytest
+
+pytest.importorskip('tft_draw')
+
+from conftest import wiring
+
+import ili9xxx_emu
+
+
+def allocated(frame, frames = 10):
+    """ Return (tuple): bytes of the worst frame, {(file, line): bytes} of counted frames """
+    from ili9xxx_benchmark import check_alloc
+    ili9xxx_emu.HEAP.lines.clear()
+    size = check_alloc(frame, frames)
+    return size, dict(ili9xxx_emu.HEAP.lines)
+
+
+@pytest.fixture
+def fb(emulate):
+    emulate()
+    from ili9xxx_8b_fb import ILI9XXX_8B_FB
+    import resources.LibreBodoni24 as font
+    fb = ILI9XXX_8B_FB(*wiring())
+    fb.show()
+    fb.set_font(font)
+    return fb
+
+
+@pytest.fixture
+def touch(emulate):
+    emulate('ESP32')
+    from resist_touch import ResistiveTouchScreen
+    touch = ResistiveTouchScreen(15, 2, 13, 4, 32, 240, 320)
+    touch.ADC_XR.level = touch.ADC_YU.level = 2000 << 4
+    return touch
+
+
+def test_frame_rect(fb):
+    color = fb.rgb(255, 255, 0)
+
+    def frame():
+        fb.fill_rect(10, 10, 60, 40, color)
+        fb.show()
+    assert allocated(frame) == (0, {})
+
+
+def test_frame_text(fb):
+    color = fb.rgb(255, 255, 0)
+
+    def frame():
+        fb.draw_text('Frame 0123', 10, 60, color)
+        fb.show()
+    assert allocated(frame) == (0, {})
+
+
+def test_frame_bitmap(fb):
+    from resources.bitmaps import rain
+    color = fb.rgb(255, 255, 0)
+
+    def frame():
+        fb.draw_bitmap(rain, 10, 100, color)
+        fb.show()
+    assert allocated(frame) == (0, {})
+
+
+class _SLEEP:
+    """ asyncio.sleep(0) of MicroPython: one reused awaitable, CPython makes a coroutine per call """
+    def __call__(self, delay):
+        self.done = False
+        return self
+
+    def __await__(self):
+        return self
+
+    def __next__(self):
+        if self.done:
+            raise StopIteration
+        self.done = True
+
+
+def test_frame_show_async(fb, monkeypatch):
+    import ili9xxx_8b_fb
+    monkeypatch.setattr(ili9xxx_8b_fb.asyncio, 'sleep', _SLEEP())
+    color = fb.rgb(255, 255, 0)
+    coroutine = [None]
+
+    def frame():
+        fb.fill_rect(10, 10, 60, 40, color)
+        coroutine[0] = fb.show_async(40) # A coroutine per frame, as asyncio.create_task()
+        try:
+            while True:
+                coroutine[0].send(None)
+        except StopIteration:
+            pass
+    size, lines = allocated(frame)
+    assert size > 0
+    assert list(lines) == [(__file__, frame.__code__.co_firstlineno + 2)] # Only the coroutine
+
+
+def test_touch(touch):
+    point = [0, 0]
+
+    def frame():
+        touch.read_touch_into(point)
+        touch.read_coordinats_into(point)
+    assert allocated(frame) == (0, {})
+
+
+def test_garbage_is_counted(touch):
+    """ Garbage freed at once by CPython is counted, as on the board """
+    def frame():
+        for i in range(5):
+            bytearray(4096)
+    size, lines = allocated(frame)
+    assert size >= 5 * 4096
+    assert list(lines) == [(__file__, frame.__code__.co_firstlineno + 2)]
+
+    size, lines = allocated(touch.read_coordinats) # Returns a new tuple
+    assert size > 0
+    assert [line for line in lines if line[0].endswith('resist_touch.py')]
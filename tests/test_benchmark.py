@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip('tft_draw')
+
+from conftest import wiring
+
+
+@pytest.fixture
+def tft(emulate):
+    emulate()
+    from ili9xxx_8b_fb import ILI9XXX_8B_FB
+    return ILI9XXX_8B_FB(*wiring())
+
+
+def test_missing_image_is_skipped(tft, monkeypatch):
+    import ili9xxx_benchmark
+    monkeypatch.setattr(ili9xxx_benchmark, 'image_file', lambda tft, extension: ('resources/none.' + extension, 8, 8))
+    tests = (('fill', ili9xxx_benchmark.bench_fill), ('raw', ili9xxx_benchmark.bench_raw))
+    report = ili9xxx_benchmark.run(tft, tests = tests)
+    assert ili9xxx_benchmark.missing(tft, 'raw') == 'resources/none.raw'
+    assert list(report['results']) == ['fill']
+
+
+def test_errors_of_the_driver_are_raised(tft):
+    import ili9xxx_benchmark
+
+    def bench_broken(tft):
+        raise AttributeError('bug of the driver')
+    with pytest.raises(AttributeError):
+        ili9xxx_benchmark.run(tft, tests = (('fill', bench_broken),))
@@ -0,0 +1,40 @@
+import pytest
+
+from conftest import wiring
+
+
+@pytest.mark.parametrize('controller, safe_bus', [('ESP32', False), ('ESP32', True), ('ESP32-S3', False), ('RP2', False)])
+@pytest.mark.parametrize('color, count, expected', [
+    (b'\xAB', 8, 0xABAB),          # One byte sent twice per pixel
+    (b'\xF8\x1F', 4, 0xF81F),
+])
+def test_push_color(emulate, controller, safe_bus, color, count, expected):
+    emulate(controller)
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    tft = ILI9XXX_8B_DIRECT(*wiring(controller), safe_bus = safe_bus)
+    tft.fill(0)
+    bus = tft.bus
+    bus.begin()
+    bus.window(10, 10, 13, 10)
+    bus.push_color(color, count)
+    bus.end()
+    assert tft.read_pixel(9, 10) == 0
+    assert [tft.read_pixel(x, 10) for x in range(10, 14)] == [expected] * 4
+    assert tft.read_pixel(14, 10) == 0
+
+
+def test_recording_bus_target(emulate):
+    emulate()
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    from ili9xxx_bus import GPIO_BUS, RECORDING_BUS
+    tft = ILI9XXX_8B_DIRECT(*wiring(), bus = lambda display: RECORDING_BUS(display, target = GPIO_BUS))
+    assert isinstance(tft.bus.target, GPIO_BUS)
+
+    tft.bus.clear()
+    bus = tft.bus
+    bus.begin()
+    bus.window(0, 0, 1, 0)
+    bus.push_color(b'\x07\xE0', 2)
+    bus.end()
+    assert ('push_color', b'\x07\xE0', 2) in bus.log
+    assert tft.read_pixel(1, 0) == 0x07E0 # Passed to the display
@@ -0,0 +1,78 @@
+"""
+Bus cost of fixed operations (tools/emulator/bus_cost.py) must not go up.
+Drawing calls of ILI9XXX_8B_DIRECT are sent to the bus by tft_draw, which is not a part of
+this repository: they are not compared. After a change that is cheaper on the bus,
+update BASELINE to the printed 'Cheaper' numbers.
+"""
+import pytest
+
+pytest.importorskip('tft_draw')
+
+from conftest import wiring
+
+import bus_cost
+
+OPERATIONS = ('fill', 'fill_rect', 'set_window', 'draw_text', 'draw_bitmap', 'show')
+
+BASELINE = {'classes': {
+    'ILI9XXX_8B_DIRECT': {
+        'init': {'commands': 23, 'windows': 0, 'strobes': 85},
+        'set_window': {'commands': 3, 'windows': 1, 'strobes': 11},
+    },
+    'ILI9XXX_8B_FB': {
+        'init': {'commands': 23, 'windows': 0, 'strobes': 85},
+        'fill': {'commands': 0, 'windows': 0, 'strobes': 0},
+        'fill_rect': {'commands': 0, 'windows': 0, 'strobes': 0},
+        'set_window': {'commands': 3, 'windows': 1, 'strobes': 11},
+        'draw_text': {'commands': 0, 'windows': 0, 'strobes': 0},
+        'draw_bitmap': {'commands': 0, 'windows': 0, 'strobes': 0},
+        'show': {'commands': 3, 'windows': 1, 'strobes': 153611}, # fill() damages the whole screen
+    },
+}}
+
+
+def workload(tft):
+    from resources.bitmaps import rain
+    import resources.LibreBodoni24 as font
+    white = tft.rgb(255, 255, 255)
+    tft.fill(tft.rgb(0, 0, 255))
+    tft.fill_rect(20, 30, 100, 60, tft.rgb(255, 0, 0))
+    tft.set_window(0, 0, 99, 99)
+    tft.cs.value(1)
+    if hasattr(tft, 'show'):
+        tft.set_font(font)
+        tft.draw_text('Hello, world!', 10, 100, white)
+        for x in range(0, 160, 16):
+            tft.draw_bitmap(rain, x, 140, white)
+        tft.show()
+
+
+def measure(panel, cls):
+    cost = bus_cost.COST_MODEL(panel)
+    tft = cost.measure('init', cls, *wiring())
+    if hasattr(tft, 'show'):
+        tft.show() # Whole screen of the constructor
+    cost.instrument(tft, OPERATIONS)
+    workload(tft)
+    return cost.report()
+
+
+def report(emulate):
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    from ili9xxx_8b_fb import ILI9XXX_8B_FB
+    result = {'classes': {}}
+    for cls in (ILI9XXX_8B_DIRECT, ILI9XXX_8B_FB):
+        panel = emulate()
+        result['classes'][cls.__name__] = measure(panel, cls)
+    return result
+
+
+def test_bus_cost_is_not_higher(emulate):
+    assert bus_cost.compare(report(emulate), BASELINE, 0) == 0
+
+
+def test_higher_cost_fails(emulate):
+    baseline = {'classes': {'ILI9XXX_8B_FB': {'show': {'commands': 3, 'windows': 1, 'strobes': 1000}}}}
+    costs = report(emulate)
+    assert bus_cost.compare(costs, baseline, 0) == 1
+    assert bus_cost.compare(costs, baseline, 20000) == 0 # Tolerance in percents
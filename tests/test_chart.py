@@ -0,0 +1,80 @@
+from array import array
+
+import pytest
+
+pytest.importorskip('tft_draw')
+
+from conftest import wiring, color_at, rgb565
+
+YELLOW = (255, 255, 0)
+CYAN = (0, 255, 255)
+
+
+@pytest.fixture
+def tft(emulate):
+    panel = emulate()
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    tft = ILI9XXX_8B_DIRECT(*wiring())
+    tft.panel = panel
+    return tft
+
+
+def test_strip_chart_needs_landscape(tft):
+    from ili9xxx_chart import STRIP_CHART
+    with pytest.raises(ValueError):
+        STRIP_CHART(tft, [YELLOW])
+
+
+@pytest.mark.parametrize('rotation', [1, 3])
+def test_strip_chart_ring(tft, rotation):
+    from ili9xxx_chart import STRIP_CHART
+    tft.set_rotation(rotation)
+    chart = STRIP_CHART(tft, [YELLOW], 0, 100, left = 30)
+    chart.add((100,))
+    start = tft.panel.vsp
+    for i in range(chart.count):
+        chart.add((100,))
+    assert tft.panel.vsp == start # Ring went round
+    assert all(color_at(tft.panel, x, 0) == rgb565(*YELLOW) for x in range(30, tft.width))
+    assert all(color_at(tft.panel, x, tft.height - 1) == 0 for x in range(30, tft.width))
+    assert color_at(tft.panel, 29, 0) == 0 # Fixed band is not drawn
+
+    chart.add((0,))
+    assert tft.panel.vsp != start
+
+
+def plot_pixels(tft, plot):
+    return [[color_at(tft.panel, plot.x + x, plot.y + y) for y in range(plot.height)] for x in range(plot.width)]
+
+
+def test_plot_empty_series(tft):
+    from ili9xxx_chart import PLOT
+    plot = PLOT(tft, 0, 40, 100, 50)
+    tft.panel.reset_stats()
+    plot.draw([[], array('h')], [YELLOW, CYAN])
+    assert tft.panel.stats['windows'] == 0 # Nothing to draw
+
+    plot.draw([[], [0, 10]], [YELLOW, CYAN]) # Empty data set is skipped
+    assert tft.panel.stats['windows'] == 100
+    assert rgb565(*YELLOW) not in [color for column in plot_pixels(tft, plot) for color in column]
+
+
+def test_plot_fewer_values_than_columns(tft):
+    from ili9xxx_chart import PLOT
+    plot = PLOT(tft, 0, 40, 100, 50)
+    plot.draw([[0, 10]], [YELLOW])
+    pixels = plot_pixels(tft, plot)
+    assert pixels[0][49] == pixels[49][49] == rgb565(*YELLOW) # First value at the bottom
+    assert pixels[50][0] == pixels[99][0] == rgb565(*YELLOW) # Second value at the top
+    assert pixels[49][0] == 0 # Columns of the first value
+
+
+def test_plot_array_h_as_list(tft):
+    from ili9xxx_chart import PLOT
+    plot = PLOT(tft, 0, 40, 100, 50)
+    values = [(i * 37) % 200 - 100 for i in range(1000)]
+    plot.draw([array('h', values)], [CYAN], area = True)
+    pixels = plot_pixels(tft, plot)
+    plot.draw([values], [CYAN], area = True)
+    assert plot_pixels(tft, plot) == pixels
+    assert rgb565(*CYAN) in pixels[0]
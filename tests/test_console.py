@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip('tft_draw')
+
+from conftest import wiring
+
+
+def test_text_is_drawn_with_console_font(emulate, monkeypatch):
+    emulate()
+    from ili9xxx_8b_fb import ILI9XXX_8B_FB
+    from ili9xxx_console import CONSOLE
+    import resources.font10 as font
+    import resources.LibreBodoni24 as title_font
+    fb = ILI9XXX_8B_FB(*wiring())
+    console = CONSOLE(fb, font, top = 30)
+
+    fb.set_font(title_font) # Title drawn by the application
+    fb.draw_text('Title', 0, 0, 0xFFFF)
+    fonts = []
+    draw_text = fb.draw_text
+    def spy(text, *args):
+        fonts.append(fb.font)
+        return draw_text(text, *args)
+    monkeypatch.setattr(fb, 'draw_text', spy)
+
+    console.write('Hello\nworld')
+    assert fonts == [font, font]
+    assert console.x == sum(font.get_ch(ch)[2] for ch in 'world')
@@ -0,0 +1,222 @@
+import pytest
+
+pytest.importorskip('tft_draw')
+
+from conftest import wiring, color_at, rgb565
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+def make_fb(**kwargs):
+    from ili9xxx_8b_fb import ILI9XXX_8B_FB
+    fb = ILI9XXX_8B_FB(*wiring(), **kwargs)
+    fb.show() # Whole screen of the constructor
+    return fb
+
+
+def test_show_sends_damaged_regions_only(emulate):
+    panel = emulate()
+    fb = make_fb()
+    panel.reset_stats()
+
+    fb.fill_rect(10, 20, 30, 40, fb.rgb(*RED))
+    fb.show()
+    assert panel.stats['windows'] == 1
+    assert panel.stats['pixels'] == 30 * 40
+    assert color_at(panel, 10, 20) == color_at(panel, 39, 59) == rgb565(*RED)
+    assert color_at(panel, 40, 60) == 0
+    assert not fb.dirty_rects
+
+    panel.reset_stats()
+    fb.show() # Nothing is damaged
+    assert panel.stats['windows'] == 0
+
+
+def test_overlapping_regions_are_merged(emulate):
+    panel = emulate()
+    fb = make_fb()
+    fb.fill_rect(10, 10, 20, 20, fb.rgb(*RED))
+    fb.fill_rect(25, 25, 20, 20, fb.rgb(*BLUE))
+    fb.fill_rect(200, 300, 5, 5, fb.rgb(*BLUE))
+    assert fb.dirty_rects == [[10, 10, 44, 44], [200, 300, 204, 304]]
+
+    panel.reset_stats()
+    fb.show()
+    assert panel.stats['windows'] == 2
+    assert color_at(panel, 12, 12) == rgb565(*RED)
+    assert color_at(panel, 40, 40) == color_at(panel, 202, 302) == rgb565(*BLUE)
+
+
+def test_full_show_after_rotation(emulate):
+    panel = emulate()
+    fb = make_fb()
+    fb.set_rotation(1)
+    assert fb.dirty_rects == [[0, 0, fb.width - 1, fb.height - 1]]
+    fb.fill_rect(0, 0, 10, 10, fb.rgb(*RED))
+    fb.show()
+    assert color_at(panel, 5, 5) == rgb565(*RED)
+
+
+@pytest.mark.parametrize('bits, color', [(8, (255, 0, 0)), (4, (0, 0, 255))])
+def test_palette_buffer(emulate, bits, color):
+    panel = emulate()
+    fb = make_fb(buffer_bits = bits)
+    assert len(fb.buffer) == fb.width * fb.height * bits // 8
+
+    fb.fill_rect(16, 16, 8, 8, fb.rgb(*color))
+    fb.show()
+    assert color_at(panel, 16, 16) == color_at(panel, 23, 23) == rgb565(*color)
+    assert color_at(panel, 24, 24) == 0
+
+    fb.set_palette(fb.rgb(*color), 0, 255, 0) # Whole screen is recolored
+    fb.show()
+    assert color_at(panel, 20, 20) == rgb565(0, 255, 0)
+
+
+def test_banded_mode(emulate):
+    panel = emulate()
+    fb = make_fb(band_height = 32)
+    assert len(fb.buffer) == max(fb.width, fb.height) * 32 * 2
+
+    fb.fill(fb.rgb(*BLUE))
+    fb.fill_rect(10, 20, 40, 50, fb.rgb(*RED)) # Rows of 3 strips
+    fb.show()
+    for y in (20, 31, 32, 63, 64, 69):
+        assert color_at(panel, 10, y) == color_at(panel, 49, y) == rgb565(*RED)
+    assert color_at(panel, 10, 70) == color_at(panel, 200, 300) == rgb565(*BLUE)
+
+
+def write_bmp(filename, width, height, color):
+    """ 24-bit BMP of one color, rows from the bottom """
+    import struct
+    row = bytes((color[2], color[1], color[0])) * width
+    row += bytes(-len(row) % 4)
+    with open(filename, 'wb') as f:
+        f.write(b'BM' + struct.pack('<IHHI', 54 + len(row) * height, 0, 0, 54))
+        f.write(struct.pack('<IiiHHIIiiII', 40, width, height, 1, 24, 0, len(row) * height, 0, 0, 0, 0))
+        f.write(row * height)
+
+
+def test_draw_bmp_is_shown(emulate, tmp_path):
+    panel = emulate()
+    fb = make_fb()
+    filename = str(tmp_path / 'image.bmp')
+    write_bmp(filename, 6, 5, RED)
+
+    fb.draw_bmp(filename, 30, 40)
+    assert fb.dirty_rects == [[30, 40, 35, 44]]
+    fb.show()
+    assert color_at(panel, 30, 40) == color_at(panel, 35, 44) == rgb565(*RED)
+
+
+def primitives(fb, tmp_path):
+    """ Drawing calls of every override, all of them paint inside (50, 60, 10, 10) """
+    import framebuf
+    import struct
+    from array import array
+    import resources.LibreBodoni24 as font
+    from resources.bitmaps import rain
+    color = fb.rgb(*RED)
+    raw = str(tmp_path / 'image.raw')
+    with open(raw, 'wb') as f:
+        f.write(struct.pack('<H', color) * 100)
+    sprite = framebuf.FrameBuffer(bytearray(200), 10, 10, framebuf.RGB565)
+    sprite.fill(color)
+    fb.set_font(font)
+    return {
+        'pixel': lambda: fb.pixel(55, 65, color),
+        'hline': lambda: fb.hline(50, 65, 10, color),
+        'vline': lambda: fb.vline(55, 60, 10, color),
+        'line': lambda: fb.line(50, 60, 59, 69, color),
+        'rect': lambda: fb.rect(50, 60, 10, 10, color),
+        'fill_rect': lambda: fb.fill_rect(50, 60, 10, 10, color),
+        'ellipse': lambda: fb.ellipse(55, 65, 4, 4, color, True),
+        'poly': lambda: fb.poly(50, 60, array('h', [0, 0, 9, 0, 9, 9, 0, 9]), color, True),
+        'text': lambda: fb.text('A', 50, 60, color),
+        'blit': lambda: fb.blit(sprite, 50, 60),
+        'draw_text': lambda: fb.draw_text('A', 50, 60, color),
+        'draw_bitmap': lambda: fb.draw_bitmap(rain, 50, 60, color),
+        'draw_raw_image': lambda: fb.draw_raw_image(raw, 50, 60, 10, 10),
+    }
+
+
+@pytest.mark.parametrize('name', ['pixel', 'hline', 'vline', 'line', 'rect', 'fill_rect', 'ellipse', 'poly',
+                                  'text', 'blit', 'draw_text', 'draw_bitmap', 'draw_raw_image'])
+def test_drawing_is_shown(emulate, tmp_path, name):
+    """ Every drawing override marks its pixels dirty: show() sends all of them """
+    panel = emulate()
+    fb = make_fb()
+    primitives(fb, tmp_path)[name]()
+    assert fb.dirty_rects
+    fb.show()
+    painted = [(x, y) for y in range(fb.height) for x in range(fb.width) if fb.pixel(x, y)]
+    assert painted
+    assert all(color_at(panel, x, y) == rgb565(*RED) for x, y in painted)
+
+
+def test_scroll(emulate):
+    panel = emulate()
+    fb = make_fb()
+    fb.scroll(0) # Hardware scroll of ILI9XXX_8B
+    assert panel.stats['by_command'].get(0x37) == fb.height
+
+    fb.fill_rect(0, 0, 4, 4, fb.rgb(*RED))
+    fb.show()
+    fb.scroll_buffer(10, 0)
+    assert fb.dirty_rects == [[0, 0, fb.width - 1, fb.height - 1]]
+    fb.show()
+    assert color_at(panel, 10, 0) == rgb565(*RED)
+
+
+def count_waits(monkeypatch, bus):
+    """ Return (list): Calls of bus.wait() by this thread """
+    import _thread
+    calls = []
+    wait = bus.wait
+    ident = _thread.get_ident()
+
+    def counted():
+        if _thread.get_ident() == ident:
+            calls.append(1)
+        wait()
+    monkeypatch.setattr(bus, 'wait', counted)
+    return calls
+
+
+@pytest.mark.parametrize('double_buffer, waits', [(False, 1), (True, 0)])
+def test_drawing_waits_once_per_frame(emulate, monkeypatch, double_buffer, waits):
+    from ili9xxx_bus_rp2 import PIO_BUS
+    pins = ([2, 3, 4, 5, 6, 7, 8, 9], 29, 28, 27, 26, 24)
+    panel = emulate('RP2', 0x9341, pins)
+    from ili9xxx_8b_fb import ILI9XXX_8B_FB
+    fb = ILI9XXX_8B_FB(*pins, bus = PIO_BUS, double_buffer = double_buffer)
+    fb.show()
+    fb.wait()
+    calls = count_waits(monkeypatch, fb.bus)
+
+    for i in range(10): # Only the buffer sent by show() is waited for, by the first drawing call
+        fb.pixel(i, 0, fb.rgb(*RED))
+        fb.fill_rect(i * 10, 10, 5, 5, fb.rgb(*RED))
+    assert len(calls) == 0
+
+    fb.show()
+    calls.clear() # show() waits for own transfers
+    for i in range(10):
+        fb.pixel(i, 20, fb.rgb(*BLUE))
+    assert len(calls) == waits
+
+    fb.wait()
+    assert color_at(panel, 5, 0) == color_at(panel, 90, 14) == rgb565(*RED)
+
+
+def test_show_async_keeps_lists(emulate):
+    import asyncio
+    emulate()
+    fb = make_fb()
+    lists = {id(fb.dirty_rects), id(fb.spare_rects)}
+    for i in range(3):
+        fb.fill_rect(10, 10, 20, 20, fb.rgb(*RED))
+        asyncio.run(fb.show_async())
+        assert not fb.dirty_rects
+        assert {id(fb.dirty_rects), id(fb.spare_rects)} == lists
@@ -0,0 +1,57 @@
+import pytest
+
+from conftest import wiring
+
+
+def make_hud(tft):
+    """ HUD redrawn on every update(), lines of text are recorded """
+    from ili9xxx_hud import HUD
+    hud = HUD(tft, interval_ms = 0)
+    lines = []
+    hud.fb.text = lambda text, x, y, color: lines.append(text)
+    return hud, lines
+
+
+def test_speed_of_show(emulate):
+    pytest.importorskip('tft_draw')
+    emulate()
+    from ili9xxx_8b_fb import ILI9XXX_8B_FB
+    tft = ILI9XXX_8B_FB(*wiring())
+    tft.show() # Whole screen of the constructor
+    hud, lines = make_hud(tft)
+
+    tft.fill_rect(0, 0, 100, 50, 0xFFFF)
+    tft.show()
+    show = tft.profile_stats['show']
+    size = show[3] - hud.show_bytes
+    time_us = show[1] - hud.show_us
+    assert size == 100 * 50 * 2
+    hud.update()
+    assert lines[2] == 'MB/s {:.2f}'.format(size / time_us) # Bytes of show() per its time
+
+
+def test_kilobytes_per_frame_without_show(emulate):
+    emulate()
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    tft = ILI9XXX_8B_DIRECT(*wiring())
+    hud, lines = make_hud(tft)
+
+    tft.fill_rect(0, 0, 64, 32, 0xFFFF)
+    hud.update()
+    assert lines[2] == 'KB/f 4.0'
+
+
+def test_profiler_stopped(emulate):
+    emulate()
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    tft = ILI9XXX_8B_DIRECT(*wiring())
+    hud, lines = make_hud(tft)
+
+    tft.profiler(False)
+    hud.update() # Own profiler is started again
+    assert tft.profile_stats is not None and not lines
+    tft.fill_rect(0, 0, 64, 32, 0xFFFF)
+    hud.update()
+    assert lines[2] == 'KB/f 4.0'
+    hud.deinit()
+    assert tft.profile_stats is None
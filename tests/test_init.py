@@ -0,0 +1,68 @@
+import pytest
+
+from conftest import wiring
+
+
+@pytest.mark.parametrize('controller', ['ESP32', 'ESP32-S3', 'RP2'])
+@pytest.mark.parametrize('model', [0x9341, 0x9486, 0x9488])
+def test_init(emulate, controller, model):
+    panel = emulate(controller, model)
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    tft = ILI9XXX_8B_DIRECT(*wiring(controller))
+
+    assert tft.controller_name == controller
+    assert tft.display_model == model # Detected by ID (0xD3)
+    assert (tft.width, tft.height) == (panel.width, panel.height)
+    assert not panel.sleep and panel.display_on
+    assert panel.colmod & 0x07 == tft.pixel_format & 0x07
+
+
+def test_init_table_of_clone(emulate, monkeypatch):
+    from ili9xxx_8b import ILI9XXX_8B
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    panel = emulate()
+    monkeypatch.setattr(ILI9XXX_8B, 'INIT_TABLES', dict(ILI9XXX_8B.INIT_TABLES))
+    monkeypatch.setattr(ILI9XXX_8B, 'INIT_DELAY_SCALE', dict(ILI9XXX_8B.INIT_DELAY_SCALE))
+    table = bytes((0x11, 0x80, 5,      # Sleep out, 5 ms
+                   0x3A, 0x01, 0x55,   # 16-bit pixels
+                   0x29, 0x00))        # Display on
+    ILI9XXX_8B.register_init_table(0x9341, table)
+    ILI9XXX_8B_DIRECT(*wiring(), display_model = 0x9341)
+    assert panel.stats['by_command'].get(0x3A) == 1
+    assert panel.colmod == 0x55 and panel.display_on
+
+
+@pytest.mark.parametrize('rotation', [0, 1, 2, 3])
+def test_set_window(emulate, rotation):
+    panel = emulate()
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    tft = ILI9XXX_8B_DIRECT(*wiring())
+    tft.set_rotation(rotation)
+    windows = panel.stats['windows']
+
+    tft.set_window(10, 20, 109, 59)
+    tft.cs.value(1)
+    assert (panel.col_start, panel.page_start, panel.col_end, panel.page_end) == (10, 20, 109, 59)
+    assert panel.stats['windows'] == windows + 1
+
+
+@pytest.mark.parametrize('source', ['argument', 'probe_cache', 'id'])
+def test_reset_delay_scale(emulate, monkeypatch, source):
+    import ili9xxx_8b
+    from ili9xxx_8b import ILI9XXX_8B
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    emulate()
+    monkeypatch.setattr(ILI9XXX_8B, 'INIT_DELAY_SCALE', {0x9341: 50})
+    cache = {}
+    if source == 'probe_cache':
+        ILI9XXX_8B_DIRECT(*wiring(), probe_cache = cache)
+        assert cache['display_model'] == 0x9341
+        emulate()
+    delays = []
+    monkeypatch.setattr(ili9xxx_8b, 'sleep_ms', delays.append)
+
+    tft = ILI9XXX_8B_DIRECT(*wiring(), display_model = 0x9341 if source == 'argument' else 0,
+                            probe_cache = cache if source == 'probe_cache' else None)
+    assert tft.display_model == 0x9341
+    # Model detected by ID is known only after reset
+    assert delays[:3] == ([10, 120, 120] if source == 'id' else [5, 60, 60])
@@ -0,0 +1,72 @@
+from conftest import wiring
+
+
+def display(emulate):
+    emulate()
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    return ILI9XXX_8B_DIRECT(*wiring())
+
+
+def test_profiler_counts(emulate):
+    tft = display(emulate)
+    tft.profiler(True)
+    tft.fill_rect(0, 0, 10, 10, 0xFFFF)
+    assert tft.profile_stats['fill_rect'][0] == 1
+    assert tft.profile_stats['fill_rect'][3] == 10 * 10 * 2
+
+    tft.profiler(False)
+    assert tft.profile_stats is None
+    assert 'fill_rect' not in vars(tft) and 'window' not in vars(tft.bus) # Class methods again
+
+
+def test_profiler_off_after_bus_change(emulate):
+    from ili9xxx_bus import GPIO_BUS
+    tft = display(emulate)
+    tft.profiler(True)
+    old_bus = tft.bus
+    tft.bus = GPIO_BUS(tft) # examples_fb/bus_speed.py
+    tft.profiler(False)
+    assert 'window' not in vars(old_bus) and 'window' not in vars(tft.bus)
+
+
+def test_profiler_keeps_trace(emulate):
+    from ili9xxx_trace import TRACE
+    tft = display(emulate)
+    trace = TRACE(16)
+    trace.instrument(tft)
+    traced = (tft.fill_rect, tft.bus.window)
+
+    tft.profiler(True)
+    tft.profiler(False)
+    assert (tft.fill_rect, tft.bus.window) == traced
+    tft.fill_rect(0, 0, 10, 10, 0xFFFF)
+    assert trace.count > 0
+    trace.deinit()
+
+
+def test_trace_then_profiler(emulate):
+    from ili9xxx_trace import TRACE
+    tft = display(emulate)
+    trace = TRACE(16)
+    trace.instrument(tft)
+    tft.profiler(True)
+    tft.profiler(False)
+    trace.deinit()
+    assert 'fill_rect' not in vars(tft) and 'window' not in vars(tft.bus)
+
+
+def test_profiler_then_trace(emulate):
+    from ili9xxx_trace import TRACE
+    tft = display(emulate)
+    tft.profiler(True)
+    profiled = (tft.fill_rect, tft.bus.window)
+    trace = TRACE(16)
+    trace.instrument(tft)
+    trace.deinit()
+    assert (tft.fill_rect, tft.bus.window) == profiled
+    tft.fill_rect(0, 0, 10, 10, 0xFFFF)
+    assert tft.profile_stats['fill_rect'][0] == 1
+    assert trace.count == 0
+
+    tft.profiler(False)
+    assert 'fill_rect' not in vars(tft) and 'window' not in vars(tft.bus)
@@ -0,0 +1,74 @@
+import pytest
+
+from conftest import wiring
+
+COLORS = [(0xF800, (255, 0, 0)), (0x07E0, (0, 255, 0)), (0x001F, (0, 0, 255)), (0xCB26, (200, 100, 50))]
+
+# Decoding of data pins: not contiguous (table), contiguous (shift), split between banks (through Pin)
+WIRINGS = [('ESP32', None, False),
+           ('RP2', ([2, 3, 4, 5, 6, 7, 8, 9], 29, 28, 27, 26, 24), False),
+           ('ESP32-S3', None, True)]
+
+
+def draw_stripes(tft):
+    """ 4 stripes of 5 x 4 pixels at (10, 10) """
+    for i in range(len(COLORS)):
+        tft.fill_rect(10 + 5 * i, 10, 5, 4, tft.rgb(*COLORS[i][1]))
+
+
+def pixels(buffer):
+    return [(buffer[i] << 8) | buffer[i + 1] for i in range(0, len(buffer), 2)]
+
+
+@pytest.mark.parametrize('controller, pins, split', WIRINGS)
+@pytest.mark.parametrize('rotation', [0, 1])
+def test_read_rect(emulate, controller, pins, split, rotation):
+    emulate(controller, 0x9341, pins)
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    tft = ILI9XXX_8B_DIRECT(*(pins or wiring(controller)))
+    if split: # Direct drawing needs one bank, only reading is switched to the slow path
+        tft.GPIO_IN_REG = None
+    tft.set_rotation(rotation)
+    tft.fill(0)
+    draw_stripes(tft)
+
+    row = [color for color, rgb in COLORS for i in range(5)]
+    assert pixels(tft.read_rect(10, 10, 20, 4)) == row * 4
+    assert tft.read_pixel(27, 13) == 0xCB26
+    assert tft.read_pixel(30, 10) == 0
+
+
+def test_read_rect_buffer(emulate):
+    emulate()
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    tft = ILI9XXX_8B_DIRECT(*wiring())
+    tft.fill(0)
+    draw_stripes(tft)
+
+    buffer = bytearray(20 * 4 * 2)
+    assert tft.read_rect(10, 10, 20, 4, buffer) is buffer
+    with pytest.raises(ValueError):
+        tft.read_rect(10, 10, 20, 5, buffer)
+
+    # Save-under: the area is drawn over and restored from the buffer
+    tft.fill_rect(0, 0, 40, 20, 0xFFFF)
+    bus = tft.bus
+    bus.begin()
+    bus.window(10, 10, 29, 13)
+    bus.push(buffer, 0, len(buffer))
+    bus.end()
+    assert tft.read_rect(10, 10, 20, 4) == buffer
+
+
+def test_read_rect_pio_bus(emulate):
+    pins = ([2, 3, 4, 5, 6, 7, 8, 9], 29, 28, 27, 26, 24)
+    emulate('RP2', 0x9341, pins)
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    from ili9xxx_bus_rp2 import PIO_BUS
+    tft = ILI9XXX_8B_DIRECT(*pins, bus = PIO_BUS)
+    tft.fill(0)
+    draw_stripes(tft)
+    assert tft.read_pixel(12, 11) == 0xF800
+
+    tft.fill_rect(0, 0, 5, 5, tft.rgb(0, 255, 0)) # PIO got the pins back
+    assert tft.read_pixel(2, 2) == 0x07E0
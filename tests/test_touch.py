@@ -0,0 +1,40 @@
+import pytest
+
+
+def make_touch(emulate, adc):
+    emulate('ESP32')
+    from resist_touch import ResistiveTouchScreen
+    touch = ResistiveTouchScreen(15, 2, 13, 4, 32, 240, 320)
+    touch.ADC_XR.level = touch.ADC_YU.level = adc << 4 # Both plates at adc of 12 bits
+    touch.read_touch() # First sample only sets the previous one
+    return touch
+
+
+def test_read_touch(emulate):
+    touch = make_touch(emulate, 2000)
+    first = touch.read_touch()
+    second = touch.read_touch()
+    assert first == second == (2000, 2000)
+    assert first is not second
+
+    point = [0, 0]
+    assert touch.read_touch_into(point) is point
+    assert point == [2000, 2000]
+
+
+@pytest.mark.parametrize('adc', [540, 1000, 2000, 3690])
+@pytest.mark.parametrize('rotation', [0, 1])
+def test_read_coordinats(emulate, adc, rotation):
+    touch = make_touch(emulate, adc)
+    touch.set_rotation(rotation)
+    x, y = touch.read_coordinats()
+
+    point = [0, 0]
+    assert touch.read_coordinats_into(point) is point
+    assert point == [x, y]
+
+
+def test_coordinats_below_calibration(emulate):
+    touch = make_touch(emulate, 520) # Under the minimum of X_CALIB: negative pixels are rounded toward zero
+    x, y = touch.read_coordinats()
+    assert touch.read_coordinats_into([0, 0]) == [x, y]
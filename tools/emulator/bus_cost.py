@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""Bus-cycle cost model: counts commands, windows, WR strobes and pixels of
+every public drawing call on the emulated shield, and compares them with a
+baseline. Numbers do not depend on the speed of the PC, so CI can fail when
+a change makes an operation more expensive on the bus.
+
+Usage:
+    python tools/emulator/bus_cost.py [--model 0x9341] [--controller ESP32-S3]
+        [--out cost.json] [--baseline cost.json] [--tolerance 0]
+
+Exit code is 1 if an operation got more commands, windows or strobes than in
+the baseline (plus tolerance in percents).
+
+Scripts can measure own calls with COST_MODEL:
+    cost = COST_MODEL(ili9xxx_emu.PANEL)
+    cost.instrument(tft, ('fill', 'show'))
+    ...
+    print(cost.report())
+
+Libraries that are not part of this repository (tft_draw) must be on the
+path, for example: PYTHONPATH=../tft_draw
+"""
+
+import argparse
+import json
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import ili9xxx_emu
+
+# Counters compared with the baseline, others are informative
+COMPARED = ('commands', 'windows', 'strobes')
+COUNTERS = ('commands', 'windows', 'strobes', 'data', 'pixels', 'reads')
+
+
+class COST_MODEL:
+    """ Bus counters of the emulated panel, summed by public call.
+    Nested calls (fill -> fill_rect -> set_window) are counted in the outer one. """
+
+    def __init__(self, panel):
+        """ Constructor
+        Args
+        panel (ILI9XXX_PANEL): Emulated display, ili9xxx_emu.PANEL
+        """
+        self.panel = panel
+        self.costs = {}
+        self.depth = 0
+
+    def measure(self, name, func, *args, **kwargs):
+        """ Calls func and adds bus counters of the call to operation name
+        Return: Result of func
+        """
+        if self.depth:
+            return func(*args, **kwargs)
+        before = self.panel.snapshot_stats()
+        self.depth += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.depth -= 1
+            after = self.panel.snapshot_stats()
+            cost = self.costs.setdefault(name, dict.fromkeys(('calls',) + COUNTERS, 0))
+            cost['calls'] += 1
+            for key in COUNTERS:
+                cost[key] += after[key] - before[key]
+
+    def instrument(self, obj, names):
+        """ Wraps methods of an object, missing names are skipped
+        Args
+        obj (object): Display
+        names (list): Method names
+        Return (list): Wrapped names
+        """
+        wrapped = []
+        for name in names:
+            method = getattr(obj, name, None)
+            if method is None:
+                continue
+
+            def wrapper(*args, _name = name, _method = method, **kwargs):
+                return self.measure(_name, _method, *args, **kwargs)
+
+            setattr(obj, name, wrapper)
+            wrapped.append(name)
+        return wrapped
+
+    def report(self):
+        """ Return (dict): Counters by operation """
+        return {name: dict(cost) for name, cost in sorted(self.costs.items())}
+
+
+OPERATIONS = ('fill', 'fill_rect', 'set_window', 'draw_text', 'draw_bitmap', 'draw_bmp', 'show')
+
+
+def workload(tft):
+    """ Fixed set of calls, same for every drawing class """
+    from resources.bitmaps import rain
+    import resources.LibreBodoni24 as font
+
+    white = tft.rgb(255, 255, 255)
+    tft.fill(tft.rgb(0, 0, 255))
+    tft.fill_rect(20, 30, 100, 60, tft.rgb(255, 0, 0))
+    tft.set_window(0, 0, 99, 99)
+    tft.cs.value(1)
+    if hasattr(tft, 'set_font'):
+        tft.set_font(font)
+    if hasattr(tft, 'draw_text'):
+        tft.draw_text('Hello, world!', 10, 100, white)
+    if hasattr(tft, 'draw_bitmap'):
+        for x in range(0, 160, 16):
+            tft.draw_bitmap(rain, x, 140, white)
+    if hasattr(tft, 'draw_bmp'):
+        tft.draw_bmp('resources/grass240x320.bmp', 0, 160)
+    if hasattr(tft, 'show'):
+        tft.show()
+
+
+def run(panel, cls, wiring):
+    """ Creates the display and runs the workload
+    Return (dict): Counters by operation, 'init' - constructor
+    """
+    data_pins, cs, dc, wr, rd, rst = wiring
+    cost = COST_MODEL(panel)
+    tft = cost.measure('init', cls, data_pins, cs, dc, wr, rd, rst)
+    if hasattr(tft, 'show'):
+        tft.show() # Whole screen of the constructor is not a part of the workload
+    cost.instrument(tft, OPERATIONS)
+    workload(tft)
+    return cost.report()
+
+
+def compare(report, baseline, tolerance):
+    """ Prints operations more expensive than in the baseline
+    Return (int): Count of regressions
+    """
+    regressions = 0
+    for cls, operations in baseline['classes'].items():
+        for name, base in operations.items():
+            new = report['classes'].get(cls, {}).get(name)
+            if new is None:
+                print('Missing:', cls, name)
+                continue
+            for key in COMPARED:
+                limit = base[key] * (100 + tolerance) // 100
+                if new[key] > limit:
+                    print('More expensive:', cls, name, key, base[key], '->', new[key])
+                    regressions += 1
+                elif new[key] < base[key]:
+                    print('Cheaper:', cls, name, key, base[key], '->', new[key])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Bus-cycle cost of ILI9XXX drawing calls')
+    parser.add_argument('--model', default = '0x9341', help = '0x9341, 0x9486 or 0x9488')
+    parser.add_argument('--controller', default = 'ESP32-S3', choices = sorted(ili9xxx_emu.UNAME))
+    parser.add_argument('--out', default = None, help = 'JSON report file, default - stdout')
+    parser.add_argument('--baseline', default = None, help = 'JSON report to compare with')
+    parser.add_argument('--tolerance', type = int, default = 0, help = 'Allowed growth, percents')
+    args = parser.parse_args()
+
+    out = os.path.abspath(args.out) if args.out else None
+    baseline_file = os.path.abspath(args.baseline) if args.baseline else None
+
+    panel = ili9xxx_emu.install(args.controller, int(args.model, 16))
+    os.chdir(ROOT)
+    sys.path.insert(1, ROOT)
+
+    from ili9xxx_8b_direct import ILI9XXX_8B_DIRECT
+    from ili9xxx_8b_fb import ILI9XXX_8B_FB
+
+    report = {'model': args.model, 'controller': args.controller, 'classes': {}}
+    for cls in (ILI9XXX_8B_DIRECT, ILI9XXX_8B_FB):
+        panel.reset_stats()
+        report['classes'][cls.__name__] = run(panel, cls, ili9xxx_emu.WIRING[args.controller])
+
+    text = json.dumps(report, indent = 1)
+    if out:
+        with open(out, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if baseline_file:
+        with open(baseline_file) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Emulated `framebuf` module (pure Python, slow but byte-compatible layout).
+text() draws placeholder boxes instead of the built-in 8x8 font."""
+
+MONO_VLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+MVLSB = MONO_VLSB
+
+
+class FrameBuffer:
+
+    def __init__(self, buffer, width, height, format, stride = None):
+        # Private names: subclasses (drivers) keep their own width/height
+        self._buf = buffer
+        self._w = width
+        self._h = height
+        self._fmt = format
+        self._stride = width if stride is None else stride
+        self._mv = memoryview(buffer).cast('B')
+
+    # Pixel access
+
+    def _get(self, x, y):
+        mv = self._mv
+        fmt = self._fmt
+        if fmt == RGB565:
+            i = (y * self._stride + x) * 2
+            return mv[i] | (mv[i + 1] << 8)
+        if fmt == GS8:
+            return mv[y * self._stride + x]
+        if fmt == GS4_HMSB:
+            i = (y * self._stride + x) >> 1
+            return (mv[i] >> 4) & 0x0F if not x & 1 else mv[i] & 0x0F
+        if fmt == GS2_HMSB:
+            i = (y * self._stride + x) >> 2
+            return (mv[i] >> (6 - 2 * (x & 3))) & 3
+        if fmt == MONO_HLSB:
+            i = (y * ((self._stride + 7) >> 3)) + (x >> 3)
+            return (mv[i] >> (7 - (x & 7))) & 1
+        if fmt == MONO_HMSB:
+            i = (y * ((self._stride + 7) >> 3)) + (x >> 3)
+            return (mv[i] >> (x & 7)) & 1
+        i = (y >> 3) * self._stride + x # MONO_VLSB
+        return (mv[i] >> (y & 7)) & 1
+
+    def _set(self, x, y, c):
+        mv = self._mv
+        fmt = self._fmt
+        if fmt == RGB565:
+            i = (y * self._stride + x) * 2
+            mv[i] = c & 0xFF
+            mv[i + 1] = (c >> 8) & 0xFF
+        elif fmt == GS8:
+            mv[y * self._stride + x] = c & 0xFF
+        elif fmt == GS4_HMSB:
+            i = (y * self._stride + x) >> 1
+            if x & 1:
+                mv[i] = (mv[i] & 0xF0) | (c & 0x0F)
+            else:
+                mv[i] = (mv[i] & 0x0F) | ((c & 0x0F) << 4)
+        elif fmt == GS2_HMSB:
+            i = (y * self._stride + x) >> 2
+            shift = 6 - 2 * (x & 3)
+            mv[i] = (mv[i] & ~(3 << shift)) | ((c & 3) << shift)
+        elif fmt in (MONO_HLSB, MONO_HMSB):
+            i = (y * ((self._stride + 7) >> 3)) + (x >> 3)
+            bit = 1 << (7 - (x & 7) if fmt == MONO_HLSB else x & 7)
+            mv[i] = (mv[i] | bit) if c & 1 else (mv[i] & ~bit)
+        else:
+            i = (y >> 3) * self._stride + x
+            bit = 1 << (y & 7)
+            mv[i] = (mv[i] | bit) if c & 1 else (mv[i] & ~bit)
+
+    # Drawing
+
+    def pixel(self, x, y, c = None):
+        if 0 <= x < self._w and 0 <= y < self._h:
+            if c is None:
+                return self._get(x, y)
+            self._set(x, y, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, self._w), min(y + h, self._h)
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self._set(xx, yy, c)
+
+    def fill(self, c):
+        self.fill_rect(0, 0, self._w, self._h, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f = False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+        else:
+            self.fill_rect(x, y, w, 1, c)
+            self.fill_rect(x, y + h - 1, w, 1, c)
+            self.fill_rect(x, y, 1, h, c)
+            self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x0, y0, x1, y1, c):
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            self.pixel(x0, y0, c)
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def ellipse(self, x, y, xr, yr, c, f = False, m = 0x0F):
+        spans = [int(xr * (1 - (dy / yr) ** 2) ** 0.5 + 0.5) if yr else xr
+                 for dy in range(-yr, yr + 1)]
+        for i, span in enumerate(spans):
+            dy = i - yr
+            inner = -span
+            if not f:
+                prev = spans[i - 1] if i > 0 else -1
+                next = spans[i + 1] if i + 1 < len(spans) else -1
+                inner = min(span, max(min(prev, next) + 1, 0))
+            for dx in range(-span, span + 1):
+                if abs(dx) < inner:
+                    continue
+                quadrant = (1 if dx >= 0 else 2) if dy <= 0 else (8 if dx >= 0 else 4)
+                if m & quadrant:
+                    self.pixel(x + dx, y + dy, c)
+
+    def poly(self, x, y, coords, c, f = False):
+        points = [(coords[i], coords[i + 1]) for i in range(0, len(coords) - 1, 2)]
+        if not points:
+            return
+        if f:
+            ys = [p[1] for p in points]
+            for yy in range(min(ys), max(ys) + 1):
+                xs = []
+                for i, (ax, ay) in enumerate(points):
+                    bx, by = points[i - 1]
+                    if (ay <= yy < by) or (by <= yy < ay):
+                        xs.append(ax + (yy - ay) * (bx - ax) // (by - ay))
+                xs.sort()
+                for i in range(0, len(xs) - 1, 2):
+                    self.hline(x + xs[i], y + yy, xs[i + 1] - xs[i] + 1, c)
+        for i, (ax, ay) in enumerate(points):
+            bx, by = points[i - 1]
+            self.line(x + ax, y + ay, x + bx, y + by, c)
+
+    def text(self, s, x, y, c = 1):
+        for ch in s:
+            if ch != ' ':
+                self.rect(x + 1, y + 1, 6, 7, c)
+            x += 8
+
+    def scroll(self, xstep, ystep):
+        w, h = self._w, self._h
+        pixels = [[self._get(xx, yy) for xx in range(w)] for yy in range(h)]
+        for yy in range(h):
+            for xx in range(w):
+                sx, sy = xx - xstep, yy - ystep
+                if 0 <= sx < w and 0 <= sy < h:
+                    self._set(xx, yy, pixels[sy][sx])
+
+    def blit(self, fbuf, x, y, key = -1, palette = None):
+        if isinstance(fbuf, tuple):
+            fbuf = FrameBuffer(*fbuf)
+        for yy in range(fbuf._h):
+            for xx in range(fbuf._w):
+                c = fbuf._get(xx, yy)
+                if palette is not None:
+                    c = palette._get(c, 0)
+                if c != key:
+                    self.pixel(x + xx, y + yy, c)
+
+
+def FrameBuffer1(buffer, width, height, stride = None):
+    return FrameBuffer(buffer, width, height, MONO_VLSB, stride)
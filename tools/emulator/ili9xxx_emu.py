@@ -0,0 +1,809 @@
+# -*- coding: utf-8 -*-
+"""Host-side emulator of an ILI9341/ILI9486/ILI9488 shield on an 8-bit bus.
+
+The emulator is made of two parts:
+* GPIO_MATRIX - GPIO levels of the controller (Esp32, Esp32-S3, RP2) with the
+  memory mapped registers used by ILI9XXX_8B (GPIO_OUT_REG, GPIO_OUT_SET, ...).
+  Both machine.Pin and ptr32(<register>) writes go through it.
+* ILI9XXX_PANEL - display controller connected to the GPIO: decodes WR/RD
+  strobes into commands, parameters and GRAM, and answers read commands.
+
+Usage:
+    python tools/emulator/run_emulator.py examples/draw.py --model 0x9488 --out screen.png
+"""
+
+import builtins
+import dis
+import struct
+import sys
+import time
+import tracemalloc
+import zlib
+
+# Register maps: address -> (register kind, bank)
+_ESP32_REGS = {
+    0x04: ('out', 0), 0x08: ('w1ts', 0), 0x0C: ('w1tc', 0),
+    0x10: ('out', 1), 0x14: ('w1ts', 1), 0x18: ('w1tc', 1),
+    0x20: ('en', 0), 0x24: ('en_w1ts', 0), 0x28: ('en_w1tc', 0),
+    0x2C: ('en', 1), 0x30: ('en_w1ts', 1), 0x34: ('en_w1tc', 1),
+    0x3C: ('in', 0), 0x40: ('in', 1),
+}
+
+_RP2_REGS = {
+    0x04: ('in', 0),
+    0x10: ('out', 0), 0x14: ('w1ts', 0), 0x18: ('w1tc', 0), 0x1C: ('xor', 0),
+    0x20: ('en', 0), 0x24: ('en_w1ts', 0), 0x28: ('en_w1tc', 0), 0x2C: ('en_xor', 0),
+}
+
+REGISTERS = {}
+for _base in (0x3FF44000, 0x60004000): # ESP32, ESP32-S3 (and C3)
+    for _offset, _reg in _ESP32_REGS.items():
+        REGISTERS[_base + _offset] = _reg
+for _offset, _reg in _RP2_REGS.items():
+    REGISTERS[0xD0000000 + _offset] = _reg
+
+MASK32 = 0xFFFFFFFF
+
+# Native (rotation 0) size of GRAM
+PANEL_SIZE = {0x9341: (240, 320), 0x9486: (320, 480), 0x9488: (320, 480)}
+# Glass of these panels is wired right-to-left, MADCTL.MX puts it right
+PANEL_MIRROR_X = {0x9341: True, 0x9486: False, 0x9488: True}
+# Glass of these panels shows correct colors only with inversion on (0x21)
+PANEL_INVERTED = {0x9341: False, 0x9486: False, 0x9488: True}
+
+# uname() of the emulated controllers
+UNAME = {
+    'ESP32':    ('esp32', 'Generic ESP32 module with ESP32'),
+    'ESP32-S3': ('esp32', 'Generic ESP32S3 module with ESP32S3'),
+    'ESP32-C3': ('esp32', 'ESP32C3 module with ESP32C3'),
+    'RP2':      ('rp2', 'Raspberry Pi Pico with RP2040'),
+}
+
+# Pin sets used across the examples: data_pins, cs, dc, wr, rd, rst
+WIRING = {
+    'ESP32':    ([12, 13, 26, 25, 17, 16, 27, 14], 32, 15, 4, 2, 33),
+    'ESP32-S3': ([9, 8, 18, 17, 15, 16, 3, 14], 6, 7, 1, 2, 5),
+    'ESP32-C3': ([9, 8, 18, 17, 15, 16, 3, 14], 6, 7, 1, 2, 5),
+    'RP2':      ([8, 9, 2, 3, 4, 5, 6, 7], 29, 28, 27, 26, 24),
+}
+
+
+class GPIO_MATRIX:
+    """ Levels of up to 64 GPIO, shared by machine.Pin and register pointers """
+
+    def __init__(self):
+        self.out = 0      # Output latch
+        self.enable = 0   # Output enable
+        self.ext = 0      # Levels driven by connected devices
+        self.ext_mask = 0 # Pins driven by connected devices
+        self.listeners = []
+
+    def levels(self):
+        """ Return (int): Current level of all pins """
+        driven = self.ext_mask & ~self.enable
+        return (self.out & ~driven) | (self.ext & driven)
+
+    def _update(self, out, enable):
+        old = self.levels()
+        self.out = out
+        self.enable = enable
+        new = self.levels()
+        if old != new:
+            for listener in self.listeners:
+                listener(old, new)
+
+    def drive(self, mask, value):
+        """ External device drives (or releases with mask = 0) the pins
+        Args
+        mask  (int): Driven pins
+        value (int): Driven levels
+        """
+        self.ext_mask = mask
+        self.ext = value & mask
+
+    def set_pin(self, pin, value):
+        bit = 1 << pin
+        if value:
+            self._update(self.out | bit, self.enable)
+        else:
+            self._update(self.out & ~bit, self.enable)
+
+    def set_mode(self, pin, output):
+        bit = 1 << pin
+        if output:
+            self._update(self.out, self.enable | bit)
+        else:
+            self._update(self.out, self.enable & ~bit)
+
+    def get_pin(self, pin):
+        return (self.levels() >> pin) & 1
+
+    def write_reg(self, addr, value):
+        """ Write to memory mapped GPIO register """
+        kind, bank = REGISTERS[addr]
+        shift = 32 * bank
+        value = (value & MASK32) << shift
+        bank_mask = MASK32 << shift
+        out = self.out
+        enable = self.enable
+        if kind == 'out':
+            out = (out & ~bank_mask) | value
+        elif kind == 'w1ts':
+            out |= value
+        elif kind == 'w1tc':
+            out &= ~value
+        elif kind == 'xor':
+            out ^= value
+        elif kind == 'en':
+            enable = (enable & ~bank_mask) | value
+        elif kind == 'en_w1ts':
+            enable |= value
+        elif kind == 'en_w1tc':
+            enable &= ~value
+        elif kind == 'en_xor':
+            enable ^= value
+        else: # input registers are read-only
+            return
+        self._update(out, enable)
+
+    def read_reg(self, addr):
+        """ Read memory mapped GPIO register """
+        kind, bank = REGISTERS[addr]
+        shift = 32 * bank
+        if kind == 'in':
+            value = self.levels()
+        elif kind in ('en', 'en_w1ts', 'en_w1tc', 'en_xor'):
+            value = self.enable
+        else:
+            value = self.out
+        return (value >> shift) & MASK32
+
+
+GPIO = GPIO_MATRIX()
+
+
+class REGISTER:
+    """ ptr32(<address>) of a GPIO register """
+
+    def __init__(self, addr):
+        self.addr = addr
+
+    def __getitem__(self, index):
+        return GPIO.read_reg(self.addr + 4 * index)
+
+    def __setitem__(self, index, value):
+        GPIO.write_reg(self.addr + 4 * index, value)
+
+
+class POINTER:
+    """ ptr8/ptr16/ptr32 to a buffer, stores are truncated as in viper """
+
+    def __init__(self, buf, size):
+        mv = memoryview(buf)
+        if mv.format != 'B':
+            mv = mv.cast('B')
+        self.mv = mv.cast({1: 'B', 2: 'H', 4: 'I'}[size])
+        self.mask = (1 << (8 * size)) - 1
+
+    def __getitem__(self, index):
+        return self.mv[index]
+
+    def __setitem__(self, index, value):
+        self.mv[index] = value & self.mask
+
+
+def _pointer(size):
+    def pointer(obj):
+        if isinstance(obj, int):
+            if size != 4:
+                raise NotImplementedError('Only ptr32 is emulated for registers')
+            return REGISTER(obj)
+        return POINTER(obj, size)
+    return pointer
+
+
+class ILI9XXX_PANEL:
+    """ Display controller model, attached to GPIO_MATRIX """
+
+    READ_ID = {0x9341: (0x00, 0x93, 0x41), 0x9486: (0x00, 0x94, 0x86), 0x9488: (0x00, 0x94, 0x88)}
+
+    def __init__(self, model, data_pins, cs_pin, dc_pin, wr_pin, rd_pin, rst_pin, gpio = GPIO):
+        """ Constructor
+        Args
+        model     (hex): 0x9341, 0x9486 or 0x9488
+        data_pins (list): Data bus pins (D0, D1, ..., D7)
+        cs_pin, dc_pin, wr_pin, rd_pin, rst_pin (int): Control pins
+        """
+        self.model = model
+        self.width, self.height = PANEL_SIZE[model]
+        self.gpio = gpio
+
+        self.data_pins = list(data_pins)
+        self.data_mask = 0
+        for pin in data_pins:
+            self.data_mask |= 1 << pin
+        self.cs_bit = 1 << cs_pin
+        self.dc_bit = 1 << dc_pin
+        self.wr_bit = 1 << wr_pin
+        self.rd_bit = 1 << rd_pin
+        self.rst_bit = 1 << rst_pin
+        self._decode = {}
+
+        self.gram = bytearray(self.width * self.height * 3)
+        self.reset_stats()
+        self.power_on()
+        gpio.listeners.append(self.on_change)
+
+    def power_on(self):
+        """ State after power on: sleep in, display off """
+        self.sleep = True
+        self.display_on = False
+        self.booster = False
+        self.hw_reset()
+
+    def hw_reset(self):
+        """ Registers after reset, GRAM is kept """
+        self.madctl = 0x00
+        self.colmod = 0x66
+        self.sleep = True
+        self.display_on = False
+        self.booster = False
+        self.inversion = False
+        self.idle = False
+        self.partial = False
+        self.tearing = False
+        self.scroll_mode = False
+        self.tfa, self.vsa, self.bfa = 0, self.height, 0
+        self.vsp = 0
+        self.col_start, self.col_end = 0, self.width - 1
+        self.page_start, self.page_end = 0, self.height - 1
+        self.registers = {}
+        self.cmd = None
+        self.params = []
+        self._pixel = []
+        self._read = []
+        self._read_pos = 0
+        self._read_pixels = None
+        self._driving = False
+        self.gpio.drive(0, 0)
+
+    def reset_stats(self):
+        """ Clear bus counters """
+        self.stats = {'strobes': 0, 'commands': 0, 'data': 0, 'windows': 0,
+                      'pixels': 0, 'reads': 0, 'by_command': {}}
+
+    def snapshot_stats(self):
+        """ Return (dict): Copy of bus counters """
+        stats = dict(self.stats)
+        stats['by_command'] = dict(self.stats['by_command'])
+        return stats
+
+    # Bus decoding
+
+    def decode_byte(self, levels):
+        key = levels & self.data_mask
+        byte = self._decode.get(key)
+        if byte is None:
+            byte = 0
+            for i, pin in enumerate(self.data_pins):
+                byte |= ((levels >> pin) & 1) << i
+            self._decode[key] = byte
+        return byte
+
+    def encode_byte(self, byte):
+        value = 0
+        for i, pin in enumerate(self.data_pins):
+            if (byte >> i) & 1:
+                value |= 1 << pin
+        return value
+
+    def on_change(self, old, new):
+        changed = old ^ new
+        if changed & self.rst_bit:
+            if not new & self.rst_bit:
+                self.hw_reset()
+            return
+        if not new & self.rst_bit:
+            return
+
+        if new & self.cs_bit: # Deselected
+            if changed & self.cs_bit:
+                self._release()
+            return
+
+        if changed & self.wr_bit and new & self.wr_bit: # WR rising edge
+            self.stats['strobes'] += 1
+            byte = self.decode_byte(new)
+            if new & self.dc_bit:
+                self.write_data(byte)
+            else:
+                self.write_command(byte)
+
+        if changed & self.rd_bit and new & self.rd_bit: # RD rising edge: next byte
+            self._release()
+            self._read_pos += 1
+        elif not new & self.rd_bit and (changed & (self.rd_bit | self.cs_bit)):
+            self._drive()
+
+    def _drive(self):
+        self.stats['reads'] += 1
+        byte = self.read_byte(self._read_pos)
+        self.gpio.drive(self.data_mask, self.encode_byte(byte))
+        self._driving = True
+
+    def _release(self):
+        if self._driving:
+            self.gpio.drive(0, 0)
+            self._driving = False
+
+    def read_byte(self, pos):
+        if self._read_pixels is not None:
+            if pos == 0:
+                return 0 # dummy
+            pos -= 1
+            if pos // 3 >= len(self._read_pixels):
+                self._read_pixels.extend(self._next_read_pixels())
+            return self._read_pixels[pos // 3][pos % 3]
+        if pos < len(self._read):
+            return self._read[pos]
+        return 0
+
+    # Commands
+
+    def write_command(self, cmd):
+        stats = self.stats
+        stats['commands'] += 1
+        stats['by_command'][cmd] = stats['by_command'].get(cmd, 0) + 1
+        self.cmd = cmd
+        self.params = []
+        self._pixel = []
+        self._read = []
+        self._read_pos = 0
+        self._read_pixels = None
+
+        if cmd == 0x01: # Software reset
+            self.hw_reset()
+        elif cmd == 0x10:
+            self.sleep = True
+            self.booster = False
+        elif cmd == 0x11:
+            self.sleep = False
+            self.booster = True
+        elif cmd == 0x12:
+            self.partial = True
+        elif cmd == 0x13:
+            self.partial = False
+            self.scroll_mode = False
+        elif cmd in (0x20, 0x21):
+            self.inversion = cmd == 0x21
+        elif cmd in (0x28, 0x29):
+            self.display_on = cmd == 0x29
+        elif cmd == 0x2A:
+            stats['windows'] += 1
+        elif cmd in (0x2C, 0x2E):
+            self._x, self._y = self.col_start, self.page_start
+            if cmd == 0x2E:
+                self._read_pixels = []
+        elif cmd == 0x3E:
+            self._read_pixels = []
+        elif cmd == 0x34:
+            self.tearing = False
+        elif cmd == 0x35:
+            self.tearing = True
+        elif cmd in (0x38, 0x39):
+            self.idle = cmd == 0x39
+        elif cmd == 0x04:
+            self._read = [0] + list(self.READ_ID[self.model])
+        elif cmd == 0x09:
+            self._read = [0] + list(self.display_status())
+        elif cmd == 0x0A:
+            self._read = [0, self.power_mode()]
+        elif cmd == 0x0B:
+            self._read = [0, self.madctl]
+        elif cmd == 0x0C:
+            self._read = [0, self.colmod]
+        elif cmd == 0xD3:
+            self._read = [0] + list(self.READ_ID[self.model])
+        elif cmd in (0xDA, 0xDB, 0xDC):
+            self._read = [0, self.READ_ID[self.model][cmd - 0xDA]]
+
+    def write_data(self, byte):
+        self.stats['data'] += 1
+        cmd = self.cmd
+        if cmd in (0x2C, 0x3C):
+            self.write_pixel_byte(byte)
+            return
+
+        params = self.params
+        params.append(byte)
+        count = len(params)
+        if cmd == 0x2A and count == 4:
+            self.col_start = (params[0] << 8) | params[1]
+            self.col_end = (params[2] << 8) | params[3]
+        elif cmd == 0x2B and count == 4:
+            self.page_start = (params[0] << 8) | params[1]
+            self.page_end = (params[2] << 8) | params[3]
+        elif cmd == 0x36 and count == 1:
+            self.madctl = byte
+        elif cmd == 0x3A and count == 1:
+            self.colmod = byte
+        elif cmd == 0x33 and count == 6:
+            self.tfa = (params[0] << 8) | params[1]
+            self.vsa = (params[2] << 8) | params[3]
+            self.bfa = (params[4] << 8) | params[5]
+        elif cmd == 0x37 and count == 2:
+            self.vsp = (params[0] << 8) | params[1]
+            self.scroll_mode = True
+        elif cmd is not None:
+            self.registers[cmd] = bytes(params)
+
+    def bytes_per_pixel(self):
+        return 2 if self.colmod & 7 == 5 else 3
+
+    def write_pixel_byte(self, byte):
+        pixel = self._pixel
+        pixel.append(byte)
+        if self.colmod & 7 == 5:
+            if len(pixel) < 2:
+                return
+            value = (pixel[0] << 8) | pixel[1]
+            r = (value >> 8) & 0xF8
+            g = (value >> 3) & 0xFC
+            b = (value << 3) & 0xF8
+        else:
+            if len(pixel) < 3:
+                return
+            r, g, b = pixel
+            if self.colmod & 7 == 6:
+                r, g, b = r & 0xFC, g & 0xFC, b & 0xFC
+        self._pixel = []
+
+        if not self.madctl & 0x08: # RGB order on BGR glass
+            r, b = b, r
+
+        offset = self.gram_offset(self._x, self._y)
+        if offset >= 0:
+            gram = self.gram
+            gram[offset] = r
+            gram[offset + 1] = g
+            gram[offset + 2] = b
+        self.stats['pixels'] += 1
+        self._advance()
+
+    def _advance(self):
+        self._x += 1
+        if self._x > self.col_end:
+            self._x = self.col_start
+            self._y += 1
+            if self._y > self.page_end:
+                self._y = self.page_start
+
+    def _next_read_pixels(self):
+        offset = self.gram_offset(self._x, self._y)
+        self._advance()
+        if offset < 0:
+            return [(0, 0, 0)]
+        r, g, b = self.gram[offset: offset + 3]
+        if not self.madctl & 0x08:
+            r, b = b, r
+        return [(r & 0xFC, g & 0xFC, b & 0xFC)]
+
+    def gram_offset(self, col, page):
+        """ Return (int): Offset of the pixel in GRAM or -1 """
+        madctl = self.madctl
+        if madctl & 0x20: # MV: Row/Column exchange
+            x, y = page, col
+        else:
+            x, y = col, page
+        if madctl & 0x40: # MX
+            x = self.width - 1 - x
+        if madctl & 0x80: # MY
+            y = self.height - 1 - y
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return (y * self.width + x) * 3
+        return -1
+
+    def power_mode(self):
+        """ Return (int): Value of Read Display Power Mode (0x0A) """
+        return ((self.booster << 7) | (self.idle << 6) | (self.partial << 5)
+                | ((not self.sleep) << 4) | ((not self.partial) << 3) | (self.display_on << 2))
+
+    def display_status(self):
+        """ Return (tuple): 4 bytes of Read Display Status (0x09) """
+        dbi = self.colmod & 7
+        return (
+            (self.booster << 7) | ((self.madctl >> 1) & 0x7E),
+            (dbi << 4) | (self.idle << 3) | (self.partial << 2) | ((not self.sleep) << 1) | (not self.partial),
+            (self.scroll_mode << 7) | (self.inversion << 5) | (self.display_on << 2) | (self.tearing << 1),
+            0x00,
+        )
+
+    # Output
+
+    def frame(self):
+        """ Picture on the glass, with scrolling, inversion and display state
+        Return (bytearray): width * height RGB888 pixels
+        """
+        width, height = self.width, self.height
+        if self.sleep or not self.display_on:
+            return bytearray(b'\xff' * (width * height * 3))
+
+        row_size = width * 3
+        gram = self.gram
+        out = bytearray(len(gram))
+        for row in range(height):
+            src = row
+            if self.scroll_mode and self.vsa and self.tfa <= row < self.tfa + self.vsa:
+                src = self.tfa + (row - self.tfa + self.vsp - self.tfa) % self.vsa
+            out[row * row_size: (row + 1) * row_size] = gram[src * row_size: (src + 1) * row_size]
+
+        if PANEL_MIRROR_X[self.model]:
+            for row in range(height):
+                line = out[row * row_size: (row + 1) * row_size]
+                pixels = [line[i: i + 3] for i in range(0, row_size, 3)]
+                pixels.reverse()
+                out[row * row_size: (row + 1) * row_size] = b''.join(pixels)
+
+        if self.inversion != PANEL_INVERTED[self.model]:
+            out = bytearray(b ^ 0xFF for b in out)
+        return out
+
+    def save_png(self, filename, gram = False):
+        """ Save the picture (or raw GRAM) as PNG """
+        data = self.gram if gram else self.frame()
+        write_png(filename, self.width, self.height, data)
+
+    def save_ppm(self, filename, gram = False):
+        """ Save the picture (or raw GRAM) as PPM """
+        data = self.gram if gram else self.frame()
+        with open(filename, 'wb') as f:
+            f.write(b'P6\n%d %d\n255\n' % (self.width, self.height))
+            f.write(data)
+
+    def save(self, filename, gram = False):
+        if filename.lower().endswith('.ppm'):
+            self.save_ppm(filename, gram)
+        else:
+            self.save_png(filename, gram)
+
+
+def write_png(filename, width, height, rgb):
+    """ Write RGB888 data as PNG without external dependencies """
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & MASK32)
+
+    row_size = width * 3
+    raw = bytearray()
+    for row in range(height):
+        raw.append(0)
+        raw += rgb[row * row_size: (row + 1) * row_size]
+
+    with open(filename, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(bytes(raw), 6)))
+        f.write(chunk(b'IEND', b''))
+
+
+class _CLOCK:
+    """ MicroPython ticks on top of the host clock. Sleeps are skipped unless
+    realtime, but always advance the ticks. """
+
+    def __init__(self, realtime = False):
+        self.realtime = realtime
+        self.offset = 0.0
+        self.start = time.monotonic()
+
+    def now(self):
+        return time.monotonic() - self.start + self.offset
+
+    def sleep(self, seconds):
+        if self.realtime:
+            time.sleep(seconds)
+        else:
+            self.offset += seconds
+
+
+CLOCK = _CLOCK()
+
+
+class _HEAP:
+    """ gc.mem_alloc() of MicroPython with collection off: every object made by the running
+    code is counted, also garbage that CPython frees at once by reference counting.
+    Counting runs between gc.disable() and gc.enable(): bytecodes of the code out of the emulator
+    are traced, growth of tracemalloc memory is counted after every bytecode, objects that CPython
+    takes from free lists are counted by the bytecodes that build them (tuple, list, dict, closure).
+    Not counted, as MicroPython does not allocate them: growth up to the size of int and float
+    objects of CPython (small ints are kept in the pointer, viper uses machine words), iterators
+    of for loops and range() of them, frames, calls into the emulator (ptr8, Pin, registers).
+    lines - allocated bytes by (file, line). """
+
+    NUMBER = 36 # The largest int or float object of CPython
+    BUILD = { 'BUILD_TUPLE': (40, 8), 'BUILD_LIST': (56, 8), 'BUILD_MAP': (64, 0), 'BUILD_CONST_KEY_MAP': (64, 0),
+              'BUILD_SET': (216, 0), 'BUILD_STRING': (49, 0), 'LIST_TO_TUPLE': (40, 0),
+              'MAKE_FUNCTION': (136, 0) } # Base size and size of an item of objects from free lists
+
+    def __init__(self):
+        self.allocated = 0
+        self.lines = {}
+        self.counting = False
+        self.own_tracing = False
+        self.skip = (__file__.rsplit('/', 1)[0] + '/', tracemalloc.__file__)
+        self.codes = {} # Code object: {offset: (opname, arg, not counted, line)}
+        self.memory = 0
+        self.last = None # Bytecode traced last, the tracing itself makes no objects
+        self.last_code = None
+
+    def counted(self, filename):
+        return not filename.startswith(self.skip)
+
+    def instructions(self, code):
+        """ Bytecodes of a code object by offset """
+        instructions = self.codes.get(code)
+        if instructions is None:
+            listing = list(dis.get_instructions(code))
+            instructions = {}
+            line = code.co_firstlineno
+            for i, ins in enumerate(listing):
+                if ins.starts_line is not None:
+                    line = ins.starts_line
+                loop = False
+                if ins.opname == 'GET_ITER':
+                    loop = True
+                elif i + 1 < len(listing) and listing[i + 1].opname == 'GET_ITER':
+                    loop = self.range_call(listing, i)
+                instructions[ins.offset] = (ins.opname, ins.arg or 0, loop, line)
+            self.codes[code] = instructions
+        return instructions
+
+    @staticmethod
+    def range_call(listing, end):
+        """ Return (bool): the call at end makes range() of a for loop """
+        depth = 1
+        for i in range(end, -1, -1):
+            ins = listing[i]
+            depth -= dis.stack_effect(ins.opcode, ins.arg) if ins.opcode >= dis.HAVE_ARGUMENT else dis.stack_effect(ins.opcode)
+            if depth <= 0:
+                return ins.opname in ('LOAD_GLOBAL', 'LOAD_NAME') and ins.argval == 'range'
+        return False
+
+    def count(self):
+        """ Memory grown by the last traced bytecode is added to allocated """
+        memory = tracemalloc.get_traced_memory()[0]
+        last = self.last
+        if last is not None:
+            opname, arg, loop, line = last
+            size = memory - self.memory
+            build = self.BUILD.get(opname)
+            if build is not None:
+                size = max(size, build[0] + build[1] * arg)
+            if size > self.NUMBER and not loop:
+                self.allocated += size
+                line = (self.last_code.co_filename, line)
+                self.lines[line] = self.lines.get(line, 0) + size
+        self.memory = memory
+
+    def trace(self, frame, event, arg):
+        code = frame.f_code
+        counted = self.counted(code.co_filename)
+        if counted:
+            self.instructions(code)
+        self.last = None # Frame of the call is not counted
+        self.count()
+        if counted:
+            frame.f_trace_opcodes = True
+            return self.trace_code
+        return None
+
+    def trace_code(self, frame, event, arg):
+        if event == 'opcode':
+            self.count()
+            code = frame.f_code
+            self.last = self.codes[code][frame.f_lasti]
+            self.last_code = code
+        return self.trace_code
+
+    def start(self):
+        self.counting = True
+        self.own_tracing = not tracemalloc.is_tracing()
+        if self.own_tracing:
+            tracemalloc.start(1)
+        self.last = None
+        sys.settrace(self.trace)
+
+    def stop(self):
+        sys.settrace(None)
+        self.count()
+        self.last = None
+        if self.own_tracing:
+            tracemalloc.stop()
+        self.counting = False
+
+
+HEAP = _HEAP()
+
+
+class _UNAME:
+    def __init__(self, controller):
+        self.sysname, self.machine = UNAME.get(controller, ('linux', 'Linux'))
+        self.nodename = self.sysname
+        self.release = '1.24.0'
+        self.version = 'emulator'
+
+
+def _mem_alloc():
+    HEAP.count()
+    HEAP.last = None
+    return HEAP.allocated
+
+
+def _gc_disable(disable):
+    def gc_disable():
+        disable()
+        if not HEAP.counting:
+            HEAP.start()
+    return gc_disable
+
+
+def _gc_enable(enable):
+    def gc_enable():
+        if HEAP.counting:
+            HEAP.stop()
+        enable()
+    return gc_enable
+
+
+PANEL = None
+
+
+def install(controller = 'ESP32-S3', model = 0x9341, wiring = None, realtime = False):
+    """ Make the running CPython look like MicroPython on the controller,
+    with the display shield connected.
+    Args
+    controller (string): ESP32, ESP32-S3, ESP32-C3 or RP2
+    model      (hex): 0x9341, 0x9486 or 0x9488
+    wiring     (tuple): data_pins, cs, dc, wr, rd, rst, default is the set used in the examples
+    realtime   (bool): Honour sleep_ms/sleep_us
+    Return (ILI9XXX_PANEL): Emulated display
+    """
+    global PANEL
+    import gc
+    import os
+
+    here = __file__.rsplit('/', 1)[0] if '/' in __file__ else '.'
+    if here not in sys.path:
+        sys.path.insert(0, here)
+
+    import micropython # Code emitter decorators need no import on MicroPython
+    builtins.micropython = micropython
+    builtins.ptr8 = _pointer(1)
+    builtins.ptr16 = _pointer(2)
+    builtins.ptr32 = _pointer(4)
+    builtins.const = lambda value: value
+
+    CLOCK.realtime = realtime
+    time.ticks_ms = lambda: int(CLOCK.now() * 1000)
+    time.ticks_us = lambda: int(CLOCK.now() * 1000000)
+    time.ticks_cpu = time.ticks_us
+    time.ticks_diff = lambda end, start: end - start
+    time.ticks_add = lambda ticks, delta: ticks + delta
+    time.sleep_ms = lambda ms: CLOCK.sleep(ms / 1000)
+    time.sleep_us = lambda us: CLOCK.sleep(us / 1000000)
+
+    uname = _UNAME(controller)
+    os.uname = lambda: uname
+
+    if not hasattr(gc, 'mem_free'):
+        gc.mem_free = lambda: 8 * 1024 * 1024
+        gc.mem_alloc = _mem_alloc
+        gc.disable = _gc_disable(gc.disable)
+        gc.enable = _gc_enable(gc.enable)
+
+    if wiring is None:
+        wiring = WIRING[controller]
+    data_pins, cs_pin, dc_pin, wr_pin, rd_pin, rst_pin = wiring
+    if PANEL is not None:
+        GPIO.listeners.remove(PANEL.on_change)
+    PANEL = ILI9XXX_PANEL(model, data_pins, cs_pin, dc_pin, wr_pin, rd_pin, rst_pin)
+    return PANEL
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Emulated `machine` module: Pin and ADC on top of ili9xxx_emu.GPIO."""
+
+from ili9xxx_emu import GPIO, CLOCK
+
+
+class Pin:
+    IN = 1
+    OUT = 3
+    OPEN_DRAIN = 7
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 1
+    IRQ_RISING = 2
+
+    def __init__(self, id, mode = -1, pull = -1, value = None):
+        self.id = id
+        self._irq = None
+        self.init(mode, pull, value)
+
+    def init(self, mode = -1, pull = -1, value = None):
+        if value is not None:
+            GPIO.set_pin(self.id, value)
+        if mode != -1:
+            GPIO.set_mode(self.id, mode in (Pin.OUT, Pin.OPEN_DRAIN))
+
+    def value(self, value = None):
+        if value is None:
+            return GPIO.get_pin(self.id)
+        GPIO.set_pin(self.id, value)
+
+    def __call__(self, value = None):
+        return self.value(value)
+
+    def on(self):
+        GPIO.set_pin(self.id, 1)
+
+    def off(self):
+        GPIO.set_pin(self.id, 0)
+
+    def high(self):
+        self.on()
+
+    def low(self):
+        self.off()
+
+    def irq(self, handler = None, trigger = IRQ_FALLING | IRQ_RISING, hard = False):
+        """ Handler is called on edges of the pin level """
+        if self._irq is not None:
+            GPIO.listeners.remove(self._irq)
+            self._irq = None
+        if handler is None:
+            return
+        bit = 1 << self.id
+
+        def listener(old, new):
+            if (old ^ new) & bit:
+                if (new & bit and trigger & Pin.IRQ_RISING
+                        or not new & bit and trigger & Pin.IRQ_FALLING):
+                    handler(self)
+
+        self._irq = listener
+        GPIO.listeners.append(listener)
+
+    def __repr__(self):
+        return 'Pin(%d)' % self.id
+
+
+class ADC:
+    ATTN_0DB = 0
+    ATTN_2_5DB = 1
+    ATTN_6DB = 2
+    ATTN_11DB = 3
+
+    def __init__(self, pin, *args, **kwargs):
+        self.pin = pin
+        self.level = 0 # Set from the host to emulate a touch
+
+    def atten(self, attn):
+        pass
+
+    def width(self, bits):
+        pass
+
+    def read(self):
+        return self.level >> 4
+
+    def read_u16(self):
+        return self.level
+
+
+def freq(hz = None):
+    if hz is None:
+        return 240000000
+
+
+def reset():
+    raise SystemExit('machine.reset()')
+
+
+def soft_reset():
+    raise SystemExit('machine.soft_reset()')
+
+
+def idle():
+    CLOCK.sleep(0.001)
+
+
+def unique_id():
+    return b'\x00\x00\x00\x00\x00\x00'
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state = 0):
+    pass
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Emulated `micropython` module: code emitters run as plain Python.
+ptr8/ptr16/ptr32 and const are installed as builtins by ili9xxx_emu.install()."""
+
+
+def viper(func):
+    return func
+
+
+def native(func):
+    return func
+
+
+def const(value):
+    return value
+
+
+def opt_level(level = None):
+    return 0
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def schedule(func, arg):
+    func(arg)
+
+
+def mem_info(verbose = False):
+    print('mem: emulated')
+
+
+def heap_lock():
+    return 0
+
+
+def heap_unlock():
+    return 0
@@ -0,0 +1,611 @@
+# -*- coding: utf-8 -*-
+"""Emulated `rp2` module: PIO assembler, instruction level state machine and DMA.
+
+* asm_pio assembles the program into the real 16-bit PIO opcodes.
+* StateMachine decodes and runs them: OSR/ISR, X/Y, FIFO with autopull/autopush,
+  side-set and delays. Pins are driven through ili9xxx_emu.GPIO, so the panel
+  model sees every WR strobe of the program. A state machine runs when it gets
+  data (put() or DMA) until it stalls.
+* DMA moves buffers to the TX FIFO of a state machine (pacing by DREQ is implied),
+  transfers complete at once.
+
+Cycles of the state machines are counted in STATS, clock time of the bus is
+cycles / freq of the state machine.
+"""
+
+from ili9xxx_emu import GPIO
+
+MASK32 = 0xFFFFFFFF
+MAX_STEPS = 50000000 # Endless programs without stall are stopped after it
+
+# Cycles and FIFO words of all state machines
+STATS = {'instructions': 0, 'cycles': 0, 'words': 0, 'bus_time_us': 0.0}
+
+
+# Assembler
+
+_JMP_COND = {None: 0, 'not_x': 1, 'x_dec': 2, 'not_y': 3, 'y_dec': 4, 'x_not_y': 5, 'pin': 6, 'not_osre': 7}
+_WAIT_SRC = {'gpio': 0, 'pin': 1, 'irq': 2}
+_IN_SRC = {'pins': 0, 'x': 1, 'y': 2, 'null': 3, 'isr': 6, 'osr': 7}
+_OUT_DEST = {'pins': 0, 'x': 1, 'y': 2, 'null': 3, 'pindirs': 4, 'pc': 5, 'isr': 6, 'exec': 7}
+_MOV_DEST = {'pins': 0, 'x': 1, 'y': 2, 'exec': 4, 'pc': 5, 'isr': 6, 'osr': 7}
+_MOV_SRC = {'pins': 0, 'x': 1, 'y': 2, 'null': 3, 'status': 5, 'isr': 6, 'osr': 7}
+_SET_DEST = {'pins': 0, 'x': 1, 'y': 2, 'pindirs': 4}
+
+# Operands of the instructions, as they are named in MicroPython programs
+_NAMES = ('pins', 'x', 'y', 'null', 'pindirs', 'pc', 'isr', 'osr', 'exec', 'status',
+          'not_x', 'x_dec', 'not_y', 'y_dec', 'x_not_y', 'pin', 'not_osre', 'gpio')
+
+
+class _MOV_OP(str):
+    def __new__(cls, name, op):
+        obj = str.__new__(cls, name)
+        obj.op = op
+        return obj
+
+
+def invert(src):
+    return _MOV_OP(src, 1)
+
+
+def reverse(src):
+    return _MOV_OP(src, 2)
+
+
+class _INSTR:
+
+    def __init__(self, program, opcode, target = None):
+        self.program = program
+        self.opcode = opcode
+        self.target = target # Label of jmp
+        self.side_value = None
+        self.delay_value = 0
+
+    def side(self, value):
+        self.side_value = value
+        return self
+
+    def __getitem__(self, delay):
+        self.delay_value = delay
+        return self
+
+    def encode(self, labels, sideset_count):
+        opcode = self.opcode
+        if self.target is not None:
+            opcode |= labels[self.target]
+        delay_bits = 5 - sideset_count
+        if self.delay_value >= 1 << delay_bits:
+            raise ValueError('delay too large')
+        side = self.side_value or 0
+        return opcode | (((side << delay_bits) | self.delay_value) << 8)
+
+
+class _ASSEMBLER:
+    """ Globals of a program function while it is assembled """
+
+    def __init__(self):
+        self.instrs = []
+        self.labels = {}
+        self.wrap_target = 0
+        self.wrap = None
+
+    def emit(self, opcode, target = None):
+        instr = _INSTR(self, opcode, target)
+        self.instrs.append(instr)
+        return instr
+
+    def functions(self):
+        a = self
+
+        def wrap_target():
+            a.wrap_target = len(a.instrs)
+
+        def wrap():
+            a.wrap = len(a.instrs) - 1
+
+        def label(name):
+            a.labels[name] = len(a.instrs)
+
+        def word(instr, label = None):
+            return a.emit(instr, label)
+
+        def jmp(cond, label = None):
+            if label is None:
+                cond, label = None, cond
+            return a.emit(_JMP_COND[cond] << 5, label)
+
+        def wait(polarity, src, index):
+            return a.emit((1 << 13) | (polarity << 7) | (_WAIT_SRC[src] << 5) | index)
+
+        def in_(src, count):
+            return a.emit((2 << 13) | (_IN_SRC[src] << 5) | (count & 31))
+
+        def out(dest, count):
+            return a.emit((3 << 13) | (_OUT_DEST[dest] << 5) | (count & 31))
+
+        def push(*args):
+            block = 0 if 'noblock' in args else 1
+            return a.emit((4 << 13) | (('iffull' in args) << 6) | (block << 5))
+
+        def pull(*args):
+            block = 0 if 'noblock' in args else 1
+            return a.emit((4 << 13) | 0x80 | (('ifempty' in args) << 6) | (block << 5))
+
+        def mov(dest, src):
+            op = getattr(src, 'op', 0)
+            return a.emit((5 << 13) | (_MOV_DEST[dest] << 5) | (op << 3) | _MOV_SRC[src])
+
+        def irq(*args):
+            index = args[-1]
+            clear = 'clear' in args[:-1]
+            wait = 'block' in args[:-1]
+            return a.emit((6 << 13) | (clear << 6) | (wait << 5) | (index & 0x1F))
+
+        def set(dest, data):
+            return a.emit((7 << 13) | (_SET_DEST[dest] << 5) | (data & 31))
+
+        def nop():
+            return a.emit(0xA042) # mov(y, y)
+
+        names = {name: name for name in _NAMES}
+        names.update(wrap_target = wrap_target, wrap = wrap, label = label, word = word,
+                     jmp = jmp, wait = wait, in_ = in_, out = out, push = push, pull = pull,
+                     mov = mov, irq = irq, set = set, nop = nop, invert = invert, reverse = reverse,
+                     block = 'block', noblock = 'noblock', iffull = 'iffull', ifempty = 'ifempty',
+                     clear = 'clear', rel = lambda index: index | 0x10)
+        return names
+
+
+class PROGRAM:
+    """ Result of asm_pio: opcodes and settings of the state machine """
+
+    def __init__(self, opcodes, wrap_target, wrap, settings):
+        self.opcodes = opcodes
+        self.wrap_target = wrap_target
+        self.wrap = wrap
+        self.settings = settings
+
+
+def asm_pio(out_init = None, set_init = None, sideset_init = None, in_shiftdir = 0, out_shiftdir = 0,
+            autopush = False, autopull = False, push_thresh = 32, pull_thresh = 32, fifo_join = 0):
+    """ Decorator: assembles the PIO program """
+
+    def as_tuple(value):
+        if value is None:
+            return ()
+        return value if isinstance(value, tuple) else (value,)
+
+    def assemble(func):
+        assembler = _ASSEMBLER()
+        names = dict(func.__globals__)
+        names.update(assembler.functions())
+        type(func)(func.__code__, names)()
+
+        sideset = as_tuple(sideset_init)
+        opcodes = [instr.encode(assembler.labels, len(sideset)) for instr in assembler.instrs]
+        wrap = assembler.wrap if assembler.wrap is not None else len(opcodes) - 1
+        settings = dict(out_init = as_tuple(out_init), set_init = as_tuple(set_init), sideset_init = sideset,
+                        in_shiftdir = in_shiftdir, out_shiftdir = out_shiftdir, autopush = autopush,
+                        autopull = autopull, push_thresh = push_thresh, pull_thresh = pull_thresh,
+                        fifo_join = fifo_join)
+        return PROGRAM(opcodes, assembler.wrap_target, wrap, settings)
+
+    return assemble
+
+
+# State machines
+
+class PIO:
+    IN_LOW = 0
+    IN_HIGH = 1
+    OUT_LOW = 2
+    OUT_HIGH = 3
+    SHIFT_LEFT = 0
+    SHIFT_RIGHT = 1
+    JOIN_NONE = 0
+    JOIN_TX = 1
+    JOIN_RX = 2
+    IRQ_SM0 = 0x100
+    IRQ_SM1 = 0x200
+    IRQ_SM2 = 0x400
+    IRQ_SM3 = 0x800
+
+    BASE = (0x50200000, 0x50300000)
+
+    def __init__(self, id):
+        self.id = id
+
+    def state_machine(self, id, program = None, *args, **kwargs):
+        return StateMachine(self.id * 4 + id, program, *args, **kwargs)
+
+    def remove_program(self, program = None):
+        pass
+
+    def add_program(self, program):
+        pass
+
+
+_MACHINES = {}       # id -> StateMachine
+_TXF = {}            # TX FIFO register address -> id
+for _id in range(8):
+    _TXF[PIO.BASE[_id >> 2] + 0x10 + 4 * (_id & 3)] = _id
+
+
+def _pin_number(pin):
+    return pin if isinstance(pin, int) or pin is None else pin.id
+
+
+class StateMachine:
+
+    def __new__(cls, id, *args, **kwargs):
+        machine = _MACHINES.get(id)
+        if machine is None:
+            machine = object.__new__(cls)
+            machine.id = id
+            machine.program = None
+            machine.running = False
+            _MACHINES[id] = machine
+        return machine
+
+    def __init__(self, id, program = None, *args, **kwargs):
+        if program is not None:
+            self.init(program, *args, **kwargs)
+
+    def init(self, program, freq = 125000000, *, in_base = None, out_base = None, set_base = None,
+             jmp_pin = None, sideset_base = None, **kwargs):
+        settings = dict(program.settings)
+        settings.update(kwargs)
+        self.program = program
+        self.freq = freq
+        self.settings = settings
+        self.in_base = _pin_number(in_base)
+        self.out_base = _pin_number(out_base)
+        self.set_base = _pin_number(set_base)
+        self.sideset_base = _pin_number(sideset_base)
+        self.jmp_pin = _pin_number(jmp_pin)
+        self.out_count = len(settings['out_init'])
+        self.set_count = len(settings['set_init'])
+        self.sideset_count = len(settings['sideset_init'])
+        self.fifo_depth = 8 if settings['fifo_join'] else 4
+        self.tx = []
+        self.rx = []
+        self.running = False
+        self.cycles = 0
+        self.restart()
+
+        # Pin levels and directions from *_init
+        for base, init in ((self.out_base, settings['out_init']), (self.set_base, settings['set_init']),
+                           (self.sideset_base, settings['sideset_init'])):
+            if base is None:
+                continue
+            out, enable = GPIO.out, GPIO.enable
+            for i, mode in enumerate(init):
+                bit = 1 << (base + i)
+                out = (out | bit) if mode in (PIO.IN_HIGH, PIO.OUT_HIGH) else (out & ~bit)
+                enable = (enable | bit) if mode in (PIO.OUT_LOW, PIO.OUT_HIGH) else (enable & ~bit)
+            GPIO._update(out, enable)
+
+    def restart(self):
+        self.pc = self.program.wrap_target if self.program else 0
+        self.x = self.y = 0
+        self.osr = self.isr = 0
+        self.osr_count = 32 # Empty
+        self.isr_count = 0
+        self.delay = 0
+
+    def active(self, value = None):
+        if value is None:
+            return self.running
+        self.running = bool(value)
+        if self.running:
+            self.run()
+
+    def put(self, value, shift = 0):
+        values = [value] if isinstance(value, int) else value
+        for word in values:
+            while len(self.tx) >= self.fifo_depth:
+                if not self.run():
+                    raise RuntimeError('PIO: TX FIFO is full and state machine is stalled')
+            self.tx.append((word << shift) & MASK32)
+            STATS['words'] += 1
+        self.run()
+
+    def get(self, buf = None, shift = 0):
+        self.run()
+        if not self.rx:
+            raise RuntimeError('PIO: RX FIFO is empty')
+        return self.rx.pop(0) >> shift
+
+    def tx_fifo(self):
+        return len(self.tx)
+
+    def rx_fifo(self):
+        return len(self.rx)
+
+    def exec(self, instr):
+        if isinstance(instr, str):
+            assembler = _ASSEMBLER()
+            eval(instr, assembler.functions())
+            instr = assembler.instrs[0].encode({}, 0)
+        self.step(instr)
+
+    def irq(self, handler = None, trigger = 0, hard = False):
+        pass
+
+    # Simulation
+
+    def _pins(self, base, count, value, enable = False):
+        """ Drives count pins from base """
+        if base is None or count == 0:
+            return
+        mask = ((1 << count) - 1) << base
+        bits = (value << base) & mask
+        if enable:
+            GPIO._update(GPIO.out, (GPIO.enable & ~mask) | bits)
+        elif (GPIO.out & mask) != bits:
+            GPIO._update((GPIO.out & ~mask) | bits, GPIO.enable)
+
+    def run(self):
+        """ Runs the program until it stalls
+        Return (bool): True if any instruction was executed
+        """
+        if not self.running or self.program is None:
+            return False
+        executed = False
+        opcodes = self.program.opcodes
+        wrap = self.program.wrap
+        wrap_target = self.program.wrap_target
+        for i in range(MAX_STEPS):
+            pc = self.pc
+            jump = self.step(opcodes[pc])
+            if jump is None: # Stalled
+                return executed
+            executed = True
+            if jump is False:
+                self.pc = wrap_target if pc == wrap else pc + 1
+        raise RuntimeError('PIO: program does not stall')
+
+    def step(self, opcode):
+        """ Executes one instruction
+        Return: None - stalled, False - next instruction, True - jump
+        """
+        delay_side = (opcode >> 8) & 0x1F
+        delay_bits = 5 - self.sideset_count
+        if self.sideset_count:
+            # Side-set is asserted even if the instruction stalls
+            self._pins(self.sideset_base, self.sideset_count, delay_side >> delay_bits)
+        delay = delay_side & ((1 << delay_bits) - 1)
+
+        kind = opcode >> 13
+        arg1 = (opcode >> 5) & 7
+        arg2 = opcode & 0x1F
+        settings = self.settings
+        result = False
+
+        if kind == 0: # jmp
+            cond = arg1
+            take = (cond == 0 or (cond == 1 and not self.x) or (cond == 2 and self.x)
+                    or (cond == 3 and not self.y) or (cond == 4 and self.y) or (cond == 5 and self.x != self.y)
+                    or (cond == 6 and GPIO.get_pin(self.jmp_pin))
+                    or (cond == 7 and self.osr_count < settings['pull_thresh']))
+            if cond == 2:
+                self.x = (self.x - 1) & MASK32
+            elif cond == 4:
+                self.y = (self.y - 1) & MASK32
+            if take:
+                self.pc = arg2
+                result = True
+        elif kind == 1: # wait
+            polarity = (opcode >> 7) & 1
+            src = (opcode >> 5) & 3
+            if src == 0:
+                level = GPIO.get_pin(arg2)
+            elif src == 1:
+                level = GPIO.get_pin(self.in_base + arg2)
+            else:
+                level = polarity # irq flags are not emulated
+            if level != polarity:
+                return None
+        elif kind == 2: # in
+            count = arg2 or 32
+            src = arg1
+            value = {0: GPIO.levels() >> (self.in_base or 0), 1: self.x, 2: self.y, 3: 0,
+                     6: self.isr, 7: self.osr}.get(src, 0) & ((1 << count) - 1)
+            if settings['in_shiftdir'] == PIO.SHIFT_RIGHT:
+                self.isr = ((self.isr >> count) | (value << (32 - count))) & MASK32
+            else:
+                self.isr = ((self.isr << count) | value) & MASK32
+            self.isr_count = min(self.isr_count + count, 32)
+            if settings['autopush'] and self.isr_count >= settings['push_thresh']:
+                self.rx.append(self.isr)
+                self.isr = self.isr_count = 0
+        elif kind == 3: # out
+            if settings['autopull'] and self.osr_count >= settings['pull_thresh']:
+                if not self.tx:
+                    return None
+                self.osr = self.tx.pop(0)
+                self.osr_count = 0
+            count = arg2 or 32
+            if settings['out_shiftdir'] == PIO.SHIFT_RIGHT:
+                value = self.osr & ((1 << count) - 1)
+                self.osr = (self.osr >> count) if count < 32 else 0
+            else:
+                value = self.osr >> (32 - count)
+                self.osr = (self.osr << count) & MASK32
+            self.osr_count = min(self.osr_count + count, 32)
+            dest = arg1
+            if dest == 0:
+                self._pins(self.out_base, self.out_count, value)
+            elif dest == 1:
+                self.x = value
+            elif dest == 2:
+                self.y = value
+            elif dest == 4:
+                self._pins(self.out_base, self.out_count, value, True)
+            elif dest == 5:
+                self.pc = value & 0x1F
+                result = True
+            elif dest == 6:
+                self.isr = value
+        elif kind == 4: # push / pull
+            block = (opcode >> 5) & 1
+            if opcode & 0x80: # pull
+                if_empty = (opcode >> 6) & 1
+                if not (if_empty and self.osr_count < settings['pull_thresh']):
+                    if self.tx:
+                        self.osr = self.tx.pop(0)
+                        self.osr_count = 0
+                    elif block:
+                        return None
+                    else:
+                        self.osr = self.x
+                        self.osr_count = 0
+            else: # push
+                if_full = (opcode >> 6) & 1
+                if not (if_full and self.isr_count < settings['push_thresh']):
+                    if len(self.rx) >= self.fifo_depth:
+                        if block:
+                            return None
+                    else:
+                        self.rx.append(self.isr)
+                    self.isr = self.isr_count = 0
+        elif kind == 5: # mov
+            src = arg2 & 7
+            op = (arg2 >> 3) & 3
+            value = {0: GPIO.levels() >> (self.in_base or 0), 1: self.x, 2: self.y, 3: 0,
+                     5: MASK32 if len(self.tx) < 1 else 0, 6: self.isr, 7: self.osr}.get(src, 0) & MASK32
+            if op == 1:
+                value = ~value & MASK32
+            elif op == 2:
+                value = int('{:032b}'.format(value)[::-1], 2)
+            dest = arg1
+            if dest == 0:
+                self._pins(self.out_base, self.out_count, value)
+            elif dest == 1:
+                self.x = value
+            elif dest == 2:
+                self.y = value
+            elif dest == 5:
+                self.pc = value & 0x1F
+                result = True
+            elif dest == 6:
+                self.isr = value
+                self.isr_count = 0
+            elif dest == 7:
+                self.osr = value
+                self.osr_count = 0
+        elif kind == 6: # irq is not emulated
+            pass
+        else: # set
+            dest = arg1
+            if dest == 0:
+                self._pins(self.set_base, self.set_count, arg2)
+            elif dest == 1:
+                self.x = arg2
+            elif dest == 2:
+                self.y = arg2
+            elif dest == 4:
+                self._pins(self.set_base, self.set_count, arg2, True)
+
+        cycles = 1 + delay
+        self.cycles += cycles
+        STATS['instructions'] += 1
+        STATS['cycles'] += cycles
+        STATS['bus_time_us'] += cycles * 1000000 / self.freq
+        return result
+
+
+# DMA
+
+_CTRL_FIELDS = ( # name, bit, width
+    ('enable', 0, 1), ('high_pri', 1, 1), ('size', 2, 2), ('inc_read', 4, 1), ('inc_write', 5, 1),
+    ('ring_size', 6, 4), ('ring_sel', 10, 1), ('chain_to', 11, 4), ('treq_sel', 15, 6),
+    ('irq_quiet', 21, 1), ('bswap', 22, 1), ('sniff_en', 23, 1), ('busy', 24, 1),
+    ('write_err', 29, 1), ('read_err', 30, 1), ('ahb_err', 31, 1))
+
+
+class DMA:
+    """ DMA channel: buffer -> TX FIFO of a state machine """
+
+    _channels = [False] * 12
+
+    def __init__(self):
+        for channel, used in enumerate(DMA._channels):
+            if not used:
+                break
+        else:
+            raise OSError('No DMA channels')
+        DMA._channels[channel] = True
+        self.channel = channel
+        self.read = None
+        self.write = None
+        self.count = 0
+        self.ctrl = self.pack_ctrl()
+
+    def close(self):
+        DMA._channels[self.channel] = False
+
+    def pack_ctrl(self, default = None, **kwargs):
+        if default is None:
+            values = dict(enable = 1, size = 2, inc_read = 1, inc_write = 1, chain_to = self.channel,
+                          treq_sel = 0x3F, irq_quiet = 1)
+        else:
+            values = self.unpack_ctrl(default)
+        values.update(kwargs)
+        ctrl = 0
+        for name, bit, width in _CTRL_FIELDS:
+            ctrl |= (int(values.get(name, 0)) & ((1 << width) - 1)) << bit
+        return ctrl
+
+    @staticmethod
+    def unpack_ctrl(ctrl):
+        return {name: (ctrl >> bit) & ((1 << width) - 1) for name, bit, width in _CTRL_FIELDS}
+
+    def config(self, read = None, write = None, count = None, ctrl = None, trigger = False):
+        if read is not None:
+            self.read = read
+        if write is not None:
+            self.write = write
+        if count is not None:
+            self.count = count
+        if ctrl is not None:
+            self.ctrl = ctrl
+        if trigger:
+            self.active(1)
+
+    def active(self, value = None):
+        if value is None:
+            return False # Transfers complete at once
+        if value:
+            self._transfer()
+
+    def _transfer(self):
+        fields = self.unpack_ctrl(self.ctrl)
+        if not fields['enable']:
+            return
+        machine = _MACHINES.get(_TXF.get(self.write)) if isinstance(self.write, int) else None
+        if machine is None:
+            raise NotImplementedError('DMA: only writes to TX FIFO of a state machine are emulated')
+
+        size = 1 << fields['size']
+        if isinstance(self.read, int): # Address of uctypes.addressof()
+            import uctypes
+            src = uctypes.buffer_at(self.read)
+            if src is None:
+                raise NotImplementedError('DMA: only reads of buffers of uctypes.addressof() are emulated')
+        else:
+            src = memoryview(self.read)
+        if src.format != 'B' or src.ndim != 1:
+            src = src.cast('B')
+        ring = 1 << fields['ring_size'] if fields['ring_size'] and not fields['ring_sel'] else 0
+        step = size if fields['inc_read'] else 0
+        pos = 0
+        for i in range(self.count):
+            offset = pos % ring if ring else pos
+            value = int.from_bytes(src[offset:offset + size], 'little')
+            if size == 1:
+                value *= 0x01010101 # Byte is replicated on the bus
+            elif size == 2:
+                value *= 0x00010001
+            machine.put(value)
+            pos += step
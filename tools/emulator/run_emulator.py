@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Run a MicroPython script for the shield under CPython, with the emulated
+controller and display. The picture is saved when the script ends (or on
+timeout for endless examples), bus counters are printed as JSON.
+
+Usage:
+    python tools/emulator/run_emulator.py <script.py> [--model 0x9488]
+        [--controller ESP32-S3] [--pins 9,8,18,17,15,16,3,14:6,7,1,2,5]
+        [--out screen.png] [--gram] [--timeout 10] [--realtime] [--stats]
+
+Libraries that are not part of this repository (tft_draw) must be on the
+path, for example: PYTHONPATH=../tft_draw
+"""
+
+import argparse
+import json
+import os
+import runpy
+import signal
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import ili9xxx_emu
+
+
+class Timeout(Exception):
+    pass
+
+
+def parse_pins(text):
+    """ '9,8,18,17,15,16,3,14:6,7,1,2,5' -> ([D0..D7], cs, dc, wr, rd, rst) """
+    data, control = text.split(':')
+    data_pins = [int(pin) for pin in data.split(',')]
+    cs, dc, wr, rd, rst = [int(pin) for pin in control.split(',')]
+    return data_pins, cs, dc, wr, rd, rst
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'ILI9XXX shield emulator')
+    parser.add_argument('script')
+    parser.add_argument('--model', default = '0x9341', help = '0x9341, 0x9486 or 0x9488')
+    parser.add_argument('--controller', default = 'ESP32-S3', choices = sorted(ili9xxx_emu.UNAME))
+    parser.add_argument('--pins', default = None, help = 'D0,...,D7:CS,DC,WR,RD,RST')
+    parser.add_argument('--out', default = 'screen.png', help = '.png or .ppm')
+    parser.add_argument('--gram', action = 'store_true', help = 'Save raw GRAM instead of the glass')
+    parser.add_argument('--timeout', type = float, default = 0, help = 'Stop the script after N seconds')
+    parser.add_argument('--realtime', action = 'store_true', help = 'Honour sleep_ms/sleep_us')
+    parser.add_argument('--stats', action = 'store_true', help = 'Print bus counters as JSON')
+    args = parser.parse_args()
+
+    wiring = parse_pins(args.pins) if args.pins else None
+    panel = ili9xxx_emu.install(args.controller, int(args.model, 16), wiring, args.realtime)
+
+    script = os.path.abspath(args.script)
+    os.chdir(ROOT)
+    sys.path.insert(1, ROOT)
+    sys.argv = [script]
+
+    def on_timeout(signum, frame):
+        raise Timeout()
+
+    if args.timeout:
+        signal.signal(signal.SIGALRM, on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, args.timeout)
+
+    status = 0
+    try:
+        runpy.run_path(script, run_name = '__main__')
+    except Timeout:
+        print('Stopped after', args.timeout, 's')
+    except KeyboardInterrupt:
+        print('Interrupted')
+    except SystemExit as e:
+        status = e.code if isinstance(e.code, int) else 0
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        panel.save(args.out, args.gram)
+        print('Saved:', args.out)
+        if args.stats:
+            stats = panel.snapshot_stats()
+            stats['by_command'] = {hex(cmd): n for cmd, n in sorted(stats['by_command'].items())}
+            rp2 = sys.modules.get('rp2')
+            if rp2 is not None and rp2.STATS['cycles']: # Simulated PIO state machines
+                stats['pio'] = dict(rp2.STATS)
+                time_us = rp2.STATS['bus_time_us']
+                stats['pio']['mb_per_s'] = round(rp2.STATS['words'] / time_us, 2) if time_us else 0
+            print(json.dumps(stats, indent = 1))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Emulated `uctypes` module: addressof() gives buffers fake RAM addresses.
+Emulated DMA reads the buffer back by its address (see buffer_at)."""
+
+RAM = 0x20000000 # SRAM of RP2040 / RP2350
+
+_BUFFERS = {}    # id -> (address, buffer), buffers are kept alive like in RAM
+_next = RAM
+
+
+def addressof(obj):
+    global _next
+    entry = _BUFFERS.get(id(obj))
+    if entry is None or entry[1] is not obj:
+        size = memoryview(obj).nbytes
+        entry = (_next, obj)
+        _BUFFERS[id(obj)] = entry
+        _next += (size + 3) & ~3 or 4
+    return entry[0]
+
+
+def buffer_at(address):
+    """ Return (memoryview): Bytes of a buffer from address, None - not an address of addressof() """
+    for base, obj in _BUFFERS.values():
+        view = memoryview(obj).cast('B') if memoryview(obj).format != 'B' else memoryview(obj)
+        if base <= address < base + max(view.nbytes, 1):
+            return view[address - base:]
+    return None